@@ -31,13 +31,25 @@ class AgriculturalPipeline(BasePipeline, SpatialTilingMixin):
     - Growing Season Precipitation: Water availability during growing season
     """
 
-    def __init__(self, n_tiles: int = 4, **kwargs):
+    def __init__(
+        self,
+        n_tiles: int = 4,
+        tile_executor: str = 'threads',
+        in_memory_tiles: bool = False,
+        tile_format: str = 'netcdf',
+        compress_tiles: bool = False,
+        **kwargs
+    ):
         """
         Initialize the pipeline with parallel spatial tiling.
 
         Args:
-            n_tiles: Number of spatial tiles (2, 4, or 8, default: 4 for quadrants)
-            **kwargs: Additional arguments passed to BasePipeline (chunk_years, enable_dashboard)
+            n_tiles: Number of spatial tiles (2, 4, 8, 16, or 32, default: 4 for quadrants)
+            tile_executor: Run tiles on 'threads' (default), 'processes', or 'dask'
+            in_memory_tiles: Merge tiles in memory instead of via tile files
+            tile_format: Intermediate tile file format, 'netcdf' (default) or 'zarr'
+            compress_tiles: Compress intermediate tile files (default: False)
+            **kwargs: Additional arguments passed to BasePipeline (chunk_years, enable_dashboard, output_format, parallel_chunks)
         """
         # Initialize BasePipeline with both temperature and precipitation
         BasePipeline.__init__(
@@ -51,7 +63,14 @@ class AgriculturalPipeline(BasePipeline, SpatialTilingMixin):
         )
 
         # Initialize SpatialTilingMixin
-        SpatialTilingMixin.__init__(self, n_tiles=n_tiles)
+        SpatialTilingMixin.__init__(
+            self,
+            n_tiles=n_tiles,
+            tile_executor=tile_executor,
+            in_memory_merge=in_memory_tiles,
+            tile_format=tile_format,
+            compress_tiles=compress_tiles
+        )
 
     def _preprocess_datasets(self, datasets: Dict[str, xr.Dataset]) -> Dict[str, xr.Dataset]:
         """
@@ -367,7 +386,7 @@ class AgriculturalPipeline(BasePipeline, SpatialTilingMixin):
         logger.info(f"  Processing tile: {tile_name}")
 
         # Select spatial subset
-        tile_ds = ds.isel(lat=lat_slice, lon=lon_slice)
+        tile_ds = self._select_tile(ds, lat_slice, lon_slice)
 
         # Calculate indices for this tile
         # Pass with 'combined' key to match calculate_indices() expectations
@@ -410,7 +429,8 @@ class AgriculturalPipeline(BasePipeline, SpatialTilingMixin):
         all_indices = self.process_with_spatial_tiling(
             ds=combined_ds,
             output_dir=output_dir,
-            expected_dims=expected_dims
+            expected_dims=expected_dims,
+            defer_cleanup=True
         )
 
         return all_indices
@@ -487,8 +507,8 @@ def main():
         '--n-tiles',
         type=int,
         default=4,
-        choices=[2, 4, 8],
-        help='Number of spatial tiles: 2 (east/west), 4 (quadrants), or 8 (octants) (default: 4)'
+        choices=[2, 4, 8, 16, 32],
+        help='Number of spatial tiles: 2 (east/west), 4 (quadrants), 8 (octants), or 16/32 (4x4/4x8 grids) (default: 4)'
     )
 
     args = parser.parse_args()
@@ -502,16 +522,23 @@ def main():
     # Create and run pipeline
     pipeline = AgriculturalPipeline(
         n_tiles=args.n_tiles,
+        tile_executor=args.tile_executor,
+        in_memory_tiles=args.in_memory_tiles,
+        tile_format=args.tile_format,
+        compress_tiles=args.compress_tiles,
         chunk_years=args.chunk_years,
-        enable_dashboard=args.dashboard
+        enable_dashboard=args.dashboard,
+        output_format=args.output_format,
+        parallel_chunks=args.parallel_chunks
     )
 
     try:
-        output_files = pipeline.run(
-            start_year=args.start_year,
-            end_year=args.end_year,
-            output_dir=args.output_dir
-        )
+        with PipelineCLI.profiling(args):
+            output_files = pipeline.run(
+                start_year=args.start_year,
+                end_year=args.end_year,
+                output_dir=args.output_dir
+            )
 
         if output_files:
             print(f"\n✓ Successfully generated {len(output_files)} output files:")
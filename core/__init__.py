@@ -9,6 +9,7 @@ from core.config import PipelineConfig
 from core.baseline_loader import BaselineLoader
 from core.cli_builder import PipelineCLI
 from core.spatial_tiling import SpatialTilingMixin
+from core.memory_monitor import MemorySampler
 
 __all__ = [
     'BasePipeline',
@@ -16,6 +17,7 @@ __all__ = [
     'BaselineLoader',
     'PipelineCLI',
     'SpatialTilingMixin',
+    'MemorySampler',
 ]
 
 __version__ = '1.0.0'
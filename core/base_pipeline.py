@@ -7,19 +7,52 @@ Provides common functionality for all climate index pipelines, eliminating
 """
 
 from abc import ABC, abstractmethod
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import ExitStack, nullcontext
+from functools import partial
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Callable, ContextManager, Dict, List, Mapping, Optional, Sequence, Tuple
 from datetime import datetime
 import logging
+import math
+import multiprocessing
+import shutil
+import tempfile
 import warnings
 
+import numpy as np
+import psutil
 import xarray as xr
 import dask
-import psutil
 import os
 
+from core.config import PipelineConfig
+from core.memory_monitor import MemorySampler
+
 logger = logging.getLogger(__name__)
 
+# Supported formats for the final index files
+OUTPUT_FORMATS = ('netcdf', 'zarr', 'zarr-store')
+
+
+def physical_cpu_count() -> int:
+    """
+    Number of physical CPU cores.
+
+    Hyper-threads share a core's floating point units, so compute-bound
+    NumPy kernels gain nothing from a thread per logical core.
+
+    Returns:
+        Physical core count (logical count if it cannot be determined)
+    """
+    return psutil.cpu_count(logical=False) or os.cpu_count() or 1
+
+
+def _init_chunk_worker(num_threads: int):
+    """Cap the Dask threaded scheduler of a temporal-chunk worker process."""
+    dask.config.set(num_workers=num_threads)
+    PipelineConfig.setup_jit_caching()
+
 
 class BasePipeline(ABC):
     """
@@ -35,14 +68,22 @@ class BasePipeline(ABC):
 
     Subclasses must implement:
     - calculate_indices(): Compute indices specific to the pipeline
+
+    Subclasses may set OUTPUT_PACKING to store indices with a small dynamic
+    range as packed integers in the final output (see _save_result).
     """
 
+    # Per-index packed output encoding (dtype, scale_factor, add_offset, _FillValue)
+    OUTPUT_PACKING: Mapping[str, Mapping] = {}
+
     def __init__(
         self,
         zarr_paths: Dict[str, str],
-        chunk_config: Optional[Dict[str, int]] = None,
+        chunk_config: Optional[Mapping[str, int]] = None,
         chunk_years: int = 1,
-        enable_dashboard: bool = False
+        enable_dashboard: bool = False,
+        output_format: str = 'netcdf',
+        parallel_chunks: int = 1
     ):
         """
         Initialize pipeline with common configuration.
@@ -53,29 +94,124 @@ class BasePipeline(ABC):
             chunk_config: Dask chunk configuration for lat/lon/time
             chunk_years: Number of years to process per temporal chunk
             enable_dashboard: Whether to enable Dask dashboard (unused, threaded only)
+            output_format: Final output format, 'netcdf' (default, zstd),
+                          'zarr' (Blosc/Zstd, written in parallel without HDF5) or
+                          'zarr-store' (every temporal chunk appended to one sharded
+                          Zarr store per run)
+            parallel_chunks: Number of temporal chunks processed concurrently in
+                            separate processes (default: 1, sequential)
         """
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(
+                f"output_format must be one of {OUTPUT_FORMATS}, got {output_format!r}"
+            )
+        if parallel_chunks < 1:
+            raise ValueError(f"parallel_chunks must be at least 1, got {parallel_chunks}")
+        if output_format == 'zarr-store' and parallel_chunks > 1:
+            raise ValueError(
+                "output_format='zarr-store' appends temporal chunks in order and "
+                "cannot be combined with parallel_chunks > 1"
+            )
+
         self.zarr_paths = zarr_paths
         self.chunk_config = chunk_config or self._default_chunk_config()
         self.chunk_years = chunk_years
         self.enable_dashboard = enable_dashboard
+        self.output_format = output_format
+        self.parallel_chunks = parallel_chunks
+        self._memory_sampler = MemorySampler()
+
+        # Single output store of the current run (output_format='zarr-store')
+        self._output_store: Optional[Path] = None
+
+        # Input stores opened during the current run, reused by every temporal
+        # chunk (see _open_run_zarr_store); None outside of run()
+        self._run_zarr_stores: Optional[Dict[Tuple[str, Tuple], xr.Dataset]] = None
+
+        # Background writer of sequential runs: a chunk's output is written
+        # while the next chunk is computed (see _queue_write); None outside of run()
+        self._write_executor: Optional[ThreadPoolExecutor] = None
+        self._pending_write: Optional[Future] = None
+
+    def __getstate__(self):
+        """Make the pipeline picklable for worker processes (read-only chunk mappings become dicts)."""
+        state = dict(super().__getstate__() or self.__dict__)
+        state['chunk_config'] = dict(state['chunk_config'])
+        # Per-run state of the parent process (open stores, background writer)
+        state.update(_run_zarr_stores=None, _write_executor=None, _pending_write=None)
+        return state
 
     @staticmethod
-    def _default_chunk_config() -> Dict[str, int]:
-        """Default chunk configuration optimized for PRISM data."""
-        return {
-            'time': 365,   # One year of daily data
-            'lat': 103,    # 621 / 103 = 6 chunks
-            'lon': 201     # 1405 / 201 = 7 chunks
-        }
+    def _default_chunk_config() -> Mapping[str, int]:
+        """
+        Default chunk configuration optimized for PRISM data.
+
+        Returns the shared read-only PipelineConfig.DEFAULT_CHUNKS
+        (time=365, lat=103, lon=201) rather than building a new dict.
+        """
+        return PipelineConfig.DEFAULT_CHUNKS
+
+    @staticmethod
+    def _encoding_chunksizes(
+        sizes,
+        target_bytes: int = PipelineConfig.ENCODING_TARGET_CHUNK_BYTES,
+        itemsize: int = 4
+    ) -> Dict[str, int]:
+        """
+        Compute NetCDF chunk sizes for every dimension of an output dataset.
+
+        Chunks are filled from the fastest-varying dimension outwards
+        (lon, then lat, then time) until a chunk holds roughly
+        ``target_bytes``, so each compressed block is large enough for the codec
+        to work efficiently. Every chunk is clamped to its dimension size.
 
-    def setup_dask_client(self):
+        Args:
+            sizes: Mapping of dimension name to length (e.g. ``ds.sizes``)
+            target_bytes: Desired uncompressed bytes per chunk
+            itemsize: Assumed bytes per element (float32 by default)
+
+        Returns:
+            Dictionary mapping dimension name to chunk size
+        """
+        remaining = max(target_bytes // itemsize, 1)
+        chunks = {dim: 1 for dim in sizes}
+
+        for dim in ('lon', 'lat', 'time'):
+            if dim not in sizes:
+                continue
+            chunks[dim] = max(min(sizes[dim], remaining), 1)
+            remaining = -(-remaining // chunks[dim])  # ceil division
+
+        return chunks
+
+    def setup_dask_client(self) -> ContextManager:
         """
         Initialize Dask scheduler.
 
         Uses threaded scheduler (no distributed client) for lower memory overhead
-        and better compatibility with xclim operations.
+        and better compatibility with xclim operations. Unless a thread count
+        is already configured, the scheduler gets one thread per physical
+        core instead of Dask's default of one per logical core. xclim's Numba
+        kernels are cached on disk (see PipelineConfig.setup_jit_caching).
+
+        Returns:
+            Context manager holding the thread count; exiting it restores the
+            previous Dask configuration (run() exits it when the run ends)
         """
         logger.info("Using Dask threaded scheduler (no distributed client for memory efficiency)")
+        if self.enable_dashboard:
+            logger.warning("Dask dashboard requested, but the threaded scheduler has no dashboard; ignoring --dashboard")
+
+        dask_config = nullcontext()
+        if dask.config.get('num_workers', None) is None:
+            num_workers = physical_cpu_count()
+            dask_config = dask.config.set(num_workers=num_workers)
+            logger.info(f"  Threads: {num_workers} (one per physical core)")
+
+        # Compiled xclim kernels are reused by later runs and worker processes
+        PipelineConfig.setup_jit_caching()
+
+        return dask_config
 
     @abstractmethod
     def calculate_indices(self, datasets: Dict[str, xr.Dataset]) -> Dict[str, xr.DataArray]:
@@ -112,6 +248,21 @@ class BasePipeline(ABC):
         """
         return self.calculate_indices(datasets)
 
+    def _data_start_year(self, start_year: int) -> int:
+        """
+        First year of input data loaded for a temporal chunk.
+
+        Override in subclasses whose indices need earlier data (e.g. a
+        calibration period); the default loads only the chunk's own years.
+
+        Args:
+            start_year: Start year of the temporal chunk
+
+        Returns:
+            Start year of the data to load
+        """
+        return start_year
+
     def _load_zarr_data(
         self,
         zarr_path: str,
@@ -130,14 +281,148 @@ class BasePipeline(ABC):
             xarray Dataset with selected time range
         """
         logger.debug(f"Loading Zarr data from {zarr_path}")
-        ds = xr.open_zarr(zarr_path, chunks=self.chunk_config)
+        ds = self._open_run_zarr_store(zarr_path, self.chunk_config)
 
-        # Select time range
-        ds_subset = ds.sel(time=slice(f'{start_year}-01-01', f'{end_year}-12-31'))
+        # Select time range, then apply CF masking/scaling to the subset only
+        ds_subset = self._mask_and_scale(ds.sel(time=slice(f'{start_year}-01-01', f'{end_year}-12-31')))
         logger.debug(f"  Loaded {len(ds_subset.time)} time steps")
 
         return ds_subset
 
+    def _open_run_zarr_store(self, zarr_path: str, chunks: Mapping[str, int]) -> xr.Dataset:
+        """
+        Open a Zarr store once per run and reuse it for every temporal chunk.
+
+        Within run(), the lazily opened store is kept per path and chunking,
+        so later chunks only subset it by time instead of reading the store
+        metadata and rebuilding the Dask graph again. Outside of run() (and
+        in worker processes) the store is opened on every call.
+
+        Args:
+            zarr_path: Path to Zarr store
+            chunks: Dask chunk configuration
+
+        Returns:
+            Lazily loaded xarray Dataset
+        """
+        if self._run_zarr_stores is None:
+            return self._open_zarr_store(zarr_path, chunks)
+
+        key = (zarr_path, tuple(sorted(chunks.items())))
+        if key not in self._run_zarr_stores:
+            self._run_zarr_stores[key] = self._open_zarr_store(zarr_path, chunks)
+        return self._run_zarr_stores[key]
+
+    @staticmethod
+    def _open_zarr_store(zarr_path: str, chunks: Mapping[str, int]) -> xr.Dataset:
+        """
+        Open a Zarr store, reading consolidated metadata when available.
+
+        Consolidated metadata is a single read instead of one per array, which
+        matters on network or high-latency filesystems. Stores written without
+        it are still opened, with a warning.
+
+        Times are decoded so the store can be subset by date, but CF masking
+        and scaling are not applied; call _mask_and_scale() on the subset.
+
+        The requested chunks are aligned to the store's own chunks (see
+        _align_chunks()), so no storage chunk is split across Dask chunks.
+
+        Args:
+            zarr_path: Path to Zarr store
+            chunks: Dask chunk configuration
+
+        Returns:
+            Lazily loaded xarray Dataset
+        """
+        try:
+            ds = xr.open_zarr(zarr_path, chunks=None, consolidated=True, mask_and_scale=False)
+        except (KeyError, ValueError):
+            logger.warning(
+                f"No consolidated metadata found in {zarr_path}; "
+                f"run zarr.consolidate_metadata() on the store for faster opens"
+            )
+            ds = xr.open_zarr(zarr_path, chunks=None, consolidated=False, mask_and_scale=False)
+
+        return ds.chunk(BasePipeline._align_chunks(ds, chunks))
+
+    @staticmethod
+    def _align_chunks(ds: xr.Dataset, chunks: Mapping[str, int]) -> Dict[str, int]:
+        """
+        Round requested Dask chunks to whole multiples of the storage chunks.
+
+        A Dask chunk that ends inside a storage chunk makes two tasks decode
+        the same storage chunk (and xarray warns that the specified chunks
+        separate the stored chunks). Each requested size is rounded to the
+        nearest whole multiple (at least one) of the storage chunk along that
+        dimension; -1 (whole dimension) is kept as is. Dimensions without
+        storage chunking, or not requested, are left at their native chunks.
+
+        Args:
+            ds: Dataset opened without Dask chunks (encoding holds the store's chunks)
+            chunks: Requested Dask chunk configuration
+
+        Returns:
+            Chunk configuration aligned to the store
+        """
+        # Storage chunk per dimension; variables chunked differently share the lcm
+        native: Dict[str, int] = {}
+        for var in ds.data_vars.values():
+            for dim, size in zip(var.dims, var.encoding.get('chunks') or ()):
+                native[dim] = math.lcm(native.get(dim, 1), size)
+
+        aligned = {}
+        for dim, size in chunks.items():
+            if dim not in ds.dims:
+                continue
+            if size == -1 or dim not in native:
+                aligned[dim] = size
+            else:
+                aligned[dim] = max(1, round(size / native[dim])) * native[dim]
+        for dim, size in native.items():
+            aligned.setdefault(dim, size)
+
+        if aligned != {dim: size for dim, size in chunks.items() if dim in ds.dims}:
+            logger.debug(f"Aligned chunks {dict(chunks)} to storage chunks: {aligned}")
+        return aligned
+
+    @staticmethod
+    def _mask_and_scale(ds: xr.Dataset) -> xr.Dataset:
+        """
+        Apply CF masking and scaling to variables that need it.
+
+        Float variables whose fill value is NaN (how the PRISM stores are
+        written) are already correctly masked and keep their dtype, so they
+        are passed through without an extra elementwise pass per chunk.
+        Variables with another fill value or packing are decoded lazily.
+
+        Args:
+            ds: Dataset opened by _open_zarr_store() (typically already subset)
+
+        Returns:
+            Dataset with CF masking and scaling applied
+        """
+        cf_attrs = ('_FillValue', 'missing_value', 'scale_factor', 'add_offset')
+        ds = ds.copy(deep=False)
+        to_decode = []
+        for name, var in ds.data_vars.items():
+            if not any(attr in var.attrs for attr in cf_attrs):
+                continue
+            nan_filled = (
+                var.dtype.kind == 'f'
+                and set(var.attrs).isdisjoint(cf_attrs[1:])
+                and np.isnan(var.attrs['_FillValue'])
+            )
+            if nan_filled:
+                # Where decoding would have put it
+                var.encoding['_FillValue'] = var.attrs.pop('_FillValue')
+            else:
+                to_decode.append(name)
+
+        if not to_decode:
+            return ds
+        return ds.assign(xr.decode_cf(ds[to_decode], decode_times=False, decode_timedelta=False))
+
     def _rename_variables(
         self,
         ds: xr.Dataset,
@@ -153,12 +438,19 @@ class BasePipeline(ABC):
         Returns:
             Dataset with renamed variables
         """
-        for old_name, new_name in rename_map.items():
-            if old_name in ds and old_name != new_name:
-                ds = ds.rename({old_name: new_name})
-                logger.debug(f"Renamed {old_name} to {new_name}")
+        # Apply all renames in a single call so the dataset is rebuilt once
+        renames = {
+            old_name: new_name
+            for old_name, new_name in rename_map.items()
+            if old_name in ds and old_name != new_name
+        }
+        if not renames:
+            return ds
 
-        return ds
+        for old_name, new_name in renames.items():
+            logger.debug(f"Renamed {old_name} to {new_name}")
+
+        return ds.rename(renames)
 
     def _fix_units(
         self,
@@ -181,6 +473,43 @@ class BasePipeline(ABC):
 
         return ds
 
+    @staticmethod
+    def _combine_indices(all_indices: Dict[str, xr.DataArray]) -> xr.Dataset:
+        """
+        Combine calculated indices into a single dataset.
+
+        Indices from one pipeline normally share identical time/lat/lon
+        indexes, in which case the alignment done by xr.Dataset() is pure
+        overhead. When every shared index is identical the arrays are merged
+        with join='override'; otherwise (e.g. monthly SPI next to annual
+        indices) the regular aligning constructor is used.
+
+        Args:
+            all_indices: Dictionary mapping index name to DataArray
+
+        Returns:
+            Dataset containing all indices
+        """
+        arrays = list(all_indices.values())
+        reference = arrays[0].indexes
+
+        indexes_identical = all(
+            set(da.indexes) == set(reference)
+            and all(reference[name].equals(index) for name, index in da.indexes.items())
+            for da in arrays[1:]
+        )
+
+        if not indexes_identical:
+            logger.debug("Index coordinates differ between indices; aligning")
+            return xr.Dataset(all_indices)
+
+        return xr.merge(
+            [da.to_dataset(name=name) for name, da in all_indices.items()],
+            join='override',
+            compat='override',
+            combine_attrs='override'
+        )
+
     def _add_global_metadata(
         self,
         result_ds: xr.Dataset,
@@ -218,40 +547,167 @@ class BasePipeline(ABC):
         self,
         result_ds: xr.Dataset,
         output_file: Path,
-        encoding_config: Optional[Dict] = None
+        encoding_config: Optional[Dict] = None,
+        num_workers: Optional[int] = None
     ):
         """
-        Save result dataset to NetCDF with compression.
+        Save result dataset to NetCDF (or Zarr, for a .zarr path) with compression.
+
+        The write is built as a delayed graph (compute=False) and then run on
+        the threaded scheduler, so computing the next chunk of a lazy index
+        overlaps with compressing and writing the previous one.
+
+        Indices listed in OUTPUT_PACKING are stored as packed integers
+        (CF scale_factor/add_offset); readers unpack them transparently.
 
         Args:
             result_ds: Dataset to save
             output_file: Output file path
             encoding_config: Optional custom encoding configuration
+            num_workers: Threads used for the write (default: one per core)
         """
         logger.info(f"Saving to {output_file}...")
 
+        if output_file.suffix == '.zarr':
+            self._save_result_zarr(result_ds, output_file, encoding_config, num_workers)
+            return
+
         with dask.config.set(scheduler='threads'):
             # Default encoding: compression for all variables
             encoding = encoding_config or {}
             if not encoding_config:
-                # Calculate dynamic chunk sizes based on dataset dimensions
-                # Use 1/9 of each spatial dimension for reasonable chunk sizes
-                time_chunk = min(result_ds.sizes.get('time', 1), 1)
-                lat_chunk = max(result_ds.sizes.get('lat', 69) // 9, 1)
-                lon_chunk = max(result_ds.sizes.get('lon', 281) // 9, 1)
-
-                for var_name in result_ds.data_vars:
-                    encoding[var_name] = {
-                        'zlib': True,
-                        'complevel': 4,
-                        'chunksizes': (time_chunk, lat_chunk, lon_chunk)
+                # Chunk sizes depend only on the dataset dimensions, so compute
+                # them once and share them across all variables
+                chunks_by_dim = self._encoding_chunksizes(result_ds.sizes)
+                encoding = {
+                    var_name: {
+                        **PipelineConfig.NETCDF_COMPRESSION,
+                        'chunksizes': tuple(chunks_by_dim[dim] for dim in result_ds[var_name].dims),
+                        **self.OUTPUT_PACKING.get(var_name, {})
                     }
+                    for var_name in result_ds.data_vars
+                }
 
-            result_ds.to_netcdf(
+            delayed_write = result_ds.to_netcdf(
                 output_file,
                 engine='netcdf4',
-                encoding=encoding
+                encoding=encoding,
+                compute=False
+            )
+            delayed_write.compute(scheduler='threads', num_workers=num_workers)
+
+    def _save_result_zarr(
+        self,
+        result_ds: xr.Dataset,
+        output_store: Path,
+        encoding_config: Optional[Dict] = None,
+        num_workers: Optional[int] = None
+    ):
+        """
+        Save result dataset to a Zarr store compressed with Blosc/Zstd.
+
+        Unlike NetCDF, every chunk is compressed and written independently,
+        so the write runs in parallel on the threaded scheduler instead of
+        through HDF5's single writer. Dask chunks are aligned with the store
+        chunks so no two tasks write the same chunk.
+
+        Args:
+            result_ds: Dataset to save
+            output_store: Output Zarr store path
+            encoding_config: Optional custom encoding configuration
+            num_workers: Threads used for the write (default: one per core)
+        """
+        from zarr.codecs import BloscCodec
+
+        chunks_by_dim = self._encoding_chunksizes(result_ds.sizes)
+        encoding = encoding_config or {
+            var_name: {
+                'compressors': BloscCodec(cname='zstd', clevel=3, shuffle='shuffle'),
+                'chunks': tuple(chunks_by_dim[dim] for dim in result_ds[var_name].dims),
+                **self.OUTPUT_PACKING.get(var_name, {})
+            }
+            for var_name in result_ds.data_vars
+        }
+
+        delayed_write = result_ds.chunk(chunks_by_dim).to_zarr(
+            output_store,
+            mode='w',
+            encoding=encoding,
+            consolidated=True,
+            compute=False
+        )
+        delayed_write.compute(scheduler='threads', num_workers=num_workers)
+
+    def _append_result_zarr_store(
+        self,
+        result_ds: xr.Dataset,
+        output_store: Path,
+        num_workers: Optional[int] = None
+    ):
+        """
+        Append a temporal chunk's results to the run's single sharded Zarr store.
+
+        The first chunk creates the store and later chunks are appended
+        along time, so a multi-decade run produces one store instead of one
+        file per chunk. Each time step of a variable is a single Zarr v3
+        shard holding the whole grid, split internally into chunks sized by
+        _encoding_chunksizes(); readers fetch one object per time step
+        instead of one per spatial chunk. Dask chunks match the shards, so
+        no two tasks write into the same shard.
+
+        Args:
+            result_ds: Dataset of one temporal chunk (every variable has a time dimension)
+            output_store: Output Zarr store path (created if missing)
+            num_workers: Threads used for the write (default: one per core)
+        """
+        from zarr.codecs import BloscCodec
+
+        spatial_sizes = {dim: size for dim, size in result_ds.sizes.items() if dim != 'time'}
+        chunks_by_dim = {**self._encoding_chunksizes(spatial_sizes), 'time': 1}
+        # Shards must hold whole chunks; the last one may extend past the grid
+        shards_by_dim = {
+            dim: -(-result_ds.sizes[dim] // chunks_by_dim[dim]) * chunks_by_dim[dim]
+            for dim in spatial_sizes
+        }
+        shards_by_dim['time'] = 1
+
+        if output_store.exists():
+            # Coordinates without time (lat, lon) were written with the first chunk
+            result_ds = result_ds.drop_vars(
+                [name for name, var in result_ds.coords.items() if 'time' not in var.dims]
             )
+            write_kwargs = {'append_dim': 'time'}
+        else:
+            write_kwargs = {
+                'mode': 'w',
+                'encoding': {
+                    var_name: {
+                        'compressors': BloscCodec(cname='zstd', clevel=3, shuffle='shuffle'),
+                        'chunks': tuple(chunks_by_dim[dim] for dim in result_ds[var_name].dims),
+                        'shards': tuple(shards_by_dim[dim] for dim in result_ds[var_name].dims),
+                        **self.OUTPUT_PACKING.get(var_name, {})
+                    }
+                    for var_name in result_ds.data_vars
+                },
+            }
+
+        write_chunks = {'time': 1, **{dim: -1 for dim in spatial_sizes}}
+        delayed_write = result_ds.chunk(write_chunks).to_zarr(
+            output_store,
+            consolidated=True,
+            compute=False,
+            **write_kwargs
+        )
+        delayed_write.compute(scheduler='threads', num_workers=num_workers)
+
+    @staticmethod
+    def _output_size_mb(output_file: Path) -> float:
+        """Size of an output file, or of all files in a Zarr store directory, in MB."""
+        if output_file.is_dir():
+            size = sum(f.stat().st_size for f in output_file.rglob('*') if f.is_file())
+        else:
+            size = output_file.stat().st_size
+        return size / (1024 * 1024)
 
     def process_time_chunk(
         self,
@@ -269,7 +725,8 @@ class BasePipeline(ABC):
         4. Call calculate_indices() (subclass-specific)
         5. Create result dataset
         6. Add metadata
-        7. Save to NetCDF
+        7. Save to NetCDF (or Zarr); within a sequential run() the write runs
+           in the background while the next chunk is computed
         8. Report metrics
 
         Args:
@@ -282,57 +739,127 @@ class BasePipeline(ABC):
         """
         logger.info(f"\nProcessing chunk: {start_year}-{end_year}")
 
-        # Track memory
-        process = psutil.Process(os.getpid())
-        initial_memory = process.memory_info().rss / 1024 / 1024  # MB
+        # Track memory (peak is sampled in the background while run() is active)
+        self._memory_sampler.reset()
+        initial_memory = self._memory_sampler.sample()
         logger.info(f"Initial memory: {initial_memory:.1f} MB")
 
         # Load datasets
         datasets = {}
+        data_start_year = self._data_start_year(start_year)
         for data_type, zarr_path in self.zarr_paths.items():
             logger.info(f"Loading {data_type} data...")
-            datasets[data_type] = self._load_zarr_data(zarr_path, start_year, end_year)
+            datasets[data_type] = self._load_zarr_data(zarr_path, data_start_year, end_year)
 
         # Preprocess datasets (rename, fix units) - call subclass hook if exists
         if hasattr(self, '_preprocess_datasets'):
             datasets = self._preprocess_datasets(datasets)
 
-        # Calculate indices (subclass implementation with optional spatial tiling)
-        logger.info("Calculating indices...")
-        all_indices = self._calculate_all_indices(datasets)
-        logger.info(f"  Calculated {len(all_indices)} indices")
-
-        if not all_indices:
-            logger.warning("No indices calculated")
-            return None
-
-        # Combine indices into dataset
-        logger.info(f"Combining {len(all_indices)} indices into dataset...")
-        result_ds = xr.Dataset(all_indices)
-
-        # Add metadata (call subclass hook if exists)
-        pipeline_name = self.__class__.__name__.replace('Pipeline', '').lower()
-        result_ds = self._add_global_metadata(
-            result_ds,
-            start_year,
-            end_year,
-            pipeline_name,
-            len(all_indices)
-        )
+        try:
+            # Calculate indices (subclass implementation with optional spatial tiling)
+            logger.info("Calculating indices...")
+            all_indices = self._calculate_all_indices(datasets)
+            logger.info(f"  Calculated {len(all_indices)} indices")
+
+            if not all_indices:
+                logger.warning("No indices calculated")
+                return None
+
+            # Combine indices into dataset
+            logger.info(f"Combining {len(all_indices)} indices into dataset...")
+            result_ds = self._combine_indices(all_indices)
+
+            # Add metadata (call subclass hook if exists)
+            pipeline_name = self.__class__.__name__.replace('Pipeline', '').lower()
+            result_ds = self._add_global_metadata(
+                result_ds,
+                start_year,
+                end_year,
+                pipeline_name,
+                len(all_indices)
+            )
 
-        # Save output - sanitize pipeline_name to prevent path traversal
-        safe_pipeline_name = os.path.basename(pipeline_name)
-        output_file = output_dir / f'{safe_pipeline_name}_indices_{start_year}_{end_year}.nc'
-        self._save_result(result_ds, output_file)
+            # Save output - sanitize pipeline_name to prevent path traversal
+            safe_pipeline_name = os.path.basename(pipeline_name)
+            if self._output_store is not None:
+                output_file = self._output_store
+            else:
+                suffix = '.zarr' if self.output_format in ('zarr', 'zarr-store') else '.nc'
+                output_file = output_dir / f'{safe_pipeline_name}_indices_{start_year}_{end_year}{suffix}'
+
+            # Lazily merged spatial tiles are read by the write; it deletes them afterwards
+            tile_dirs = self.take_tile_files() if hasattr(self, 'take_tile_files') else []
+            write = partial(
+                self._write_chunk_output, result_ds, output_file,
+                append=self._output_store is not None, tile_dirs=tile_dirs
+            )
+        finally:
+            # Tile files not handed to the write (e.g. after a failure) are deleted now
+            if hasattr(self, 'release_tile_files'):
+                self.release_tile_files()
+
+        if self._write_executor is not None:
+            self._queue_write(write)
+        else:
+            write()
 
         # Report metrics
-        final_memory = process.memory_info().rss / 1024 / 1024  # MB
+        final_memory = self._memory_sampler.sample()
+        peak_memory = self._memory_sampler.peak_mb()
         logger.info(f"Final memory: {final_memory:.1f} MB (increase: {final_memory - initial_memory:.1f} MB)")
+        logger.info(f"Peak memory: {peak_memory:.1f} MB")
+
+        return output_file
 
-        file_size_mb = output_file.stat().st_size / (1024 * 1024)
+    def _write_chunk_output(
+        self,
+        result_ds: xr.Dataset,
+        output_file: Path,
+        append: bool = False,
+        tile_dirs: Sequence[tempfile.TemporaryDirectory] = ()
+    ):
+        """
+        Write a temporal chunk's results and delete the tile files they read from.
+
+        Args:
+            result_ds: Combined indices of the chunk (possibly lazy)
+            output_file: Output file, or the run's store when appending
+            append: Append to the run's single Zarr store (output_format='zarr-store')
+            tile_dirs: Tile directories backing lazily merged indices
+        """
+        try:
+            if append:
+                logger.info(f"Appending to {output_file}...")
+                self._append_result_zarr_store(result_ds, output_file)
+            else:
+                self._save_result(result_ds, output_file)
+        finally:
+            for tile_dir in tile_dirs:
+                tile_dir.cleanup()
+
+        file_size_mb = self._output_size_mb(output_file)
         logger.info(f"Output file size: {file_size_mb:.2f} MB")
 
-        return output_file
+    def _queue_write(self, write: Callable[[], None]):
+        """
+        Run a chunk's write in the background while the next chunk is computed.
+
+        At most one write is pending: queueing another first waits for (and
+        re-raises any error of) the previous one, so only one finished
+        chunk is held besides the one being computed, and writes (including
+        appends to a single store) happen in chunk order.
+
+        Args:
+            write: Callable writing one chunk's output
+        """
+        self._wait_for_write()
+        self._pending_write = self._write_executor.submit(write)
+
+    def _wait_for_write(self):
+        """Wait for the pending background write, if any, re-raising its error."""
+        pending, self._pending_write = self._pending_write, None
+        if pending is not None:
+            pending.result()
 
     def run(
         self,
@@ -365,27 +892,43 @@ class BasePipeline(ABC):
         logger.info(f"Output: {output_path}")
         logger.info(f"Chunk size: {self.chunk_years} years")
 
-        # Setup Dask
-        self.setup_dask_client()
+        # Temporal chunks (inclusive year ranges)
+        windows = [
+            (year, min(year + self.chunk_years - 1, end_year))
+            for year in range(start_year, end_year + 1, self.chunk_years)
+        ]
 
         output_files = []
 
+        if self.output_format == 'zarr-store':
+            # All temporal chunks are appended to this store (replacing an earlier run's)
+            safe_pipeline_name = os.path.basename(pipeline_name.lower())
+            self._output_store = output_path / f'{safe_pipeline_name}_indices_{start_year}_{end_year}.zarr'
+            if self._output_store.exists():
+                logger.info(f"Replacing existing output store {self._output_store}")
+                shutil.rmtree(self._output_store)
+
+        # Dask settings apply to this run only and are restored in finally
+        dask_config = ExitStack()
+        self._memory_sampler.start()
         try:
-            # Process in temporal chunks
-            current_year = start_year
-            while current_year <= end_year:
-                chunk_end = min(current_year + self.chunk_years - 1, end_year)
-
-                output_file = self.process_time_chunk(
-                    current_year,
-                    chunk_end,
-                    output_path
+            # Setup Dask
+            dask_config.enter_context(self.setup_dask_client())
+
+            if self.parallel_chunks > 1 and len(windows) > 1:
+                chunk_outputs = self._process_chunks_in_processes(windows, output_path)
+            else:
+                self._run_zarr_stores = {}
+                self._write_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='chunk-writer')
+                chunk_outputs = (
+                    self.process_time_chunk(chunk_start, chunk_end, output_path)
+                    for chunk_start, chunk_end in windows
                 )
 
-                if output_file:
+            for output_file in chunk_outputs:
+                if output_file and output_file not in output_files:
                     output_files.append(output_file)
-
-                current_year = chunk_end + 1
+            self._wait_for_write()
 
             logger.info("=" * 60)
             logger.info(f"✓ Pipeline complete! Generated {len(output_files)} files")
@@ -395,4 +938,65 @@ class BasePipeline(ABC):
             logger.error(f"Pipeline failed: {e}")
             raise
 
+        finally:
+            if self._write_executor is not None:
+                # After a failure, let a write still in progress finish before returning
+                self._write_executor.shutdown(wait=True)
+                self._write_executor = None
+                self._pending_write = None
+            self._memory_sampler.stop()
+            self._output_store = None
+            self._run_zarr_stores = None
+            dask_config.close()
+            lifetime_peak = MemorySampler.lifetime_peak_mb()
+            if lifetime_peak is not None:
+                logger.info(f"Process peak memory: {lifetime_peak:.1f} MB")
+
         return output_files
+
+    def _process_chunks_in_processes(
+        self,
+        windows: List[Tuple[int, int]],
+        output_path: Path
+    ) -> List[Optional[Path]]:
+        """
+        Process independent temporal chunks concurrently in worker processes.
+
+        Each chunk reads its own years and writes its own output file, so
+        chunks share nothing but the (pickled) pipeline configuration.
+        Processes sidestep the GIL for the Python-heavy parts of xclim;
+        each worker's threaded scheduler is capped so that workers x threads
+        stays within the physical cores.
+
+        Args:
+            windows: Inclusive (start_year, end_year) of each temporal chunk
+            output_path: Output directory
+
+        Returns:
+            Output file per chunk (None for chunks without indices), in order
+        """
+        num_processes = min(self.parallel_chunks, len(windows))
+        threads_per_process = max(1, physical_cpu_count() // num_processes)
+        logger.info(
+            f"Processing {len(windows)} temporal chunks in {num_processes} processes "
+            f"({threads_per_process} threads each)"
+        )
+
+        # Spawn (not fork): forking a process that holds HDF5/Dask thread state is unsafe
+        with ProcessPoolExecutor(
+            max_workers=num_processes,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_chunk_worker,
+            initargs=(threads_per_process,)
+        ) as executor:
+            futures = [
+                executor.submit(self.process_time_chunk, chunk_start, chunk_end, output_path)
+                for chunk_start, chunk_end in windows
+            ]
+            try:
+                return [future.result() for future in futures]
+            except Exception:
+                # Fail fast: drop chunks that have not started yet
+                for future in futures:
+                    future.cancel()
+                raise
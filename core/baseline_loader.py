@@ -6,9 +6,11 @@ Provides cached loading and validation of baseline percentiles used for
 extreme climate indices.
 """
 
+import functools
 import logging
+import threading
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Hashable, List, Optional, Tuple
 
 import xarray as xr
 
@@ -17,12 +19,32 @@ from core.config import PipelineConfig
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=4)
+def _open_baseline_dataset(path: str, mtime_ns: int) -> xr.Dataset:
+    """
+    Open a baseline percentiles file lazily, once per process.
+
+    Every pipeline builds its own BaselineLoader; sharing the opened
+    dataset avoids reopening and re-decoding the same file for each one.
+
+    Args:
+        path: Resolved path of the baseline file
+        mtime_ns: File modification time, so a rewritten file is reopened
+
+    Returns:
+        Lazily loaded (chunked) baseline Dataset
+    """
+    # Use chunked loading to avoid loading entire 10.7GB file into memory
+    return xr.open_dataset(path, chunks='auto')
+
+
 class BaselineLoader:
     """
     Load and manage baseline percentiles for extreme indices.
 
     Provides:
-    - Cached loading to avoid repeated file reads
+    - Cached loading to avoid repeated file reads (shared by all loaders
+      of the same file in a process)
     - Validation of baseline period and variables
     - Convenient methods for different index types
     """
@@ -38,6 +60,22 @@ class BaselineLoader:
         self.baseline_file = baseline_file or Path(PipelineConfig.BASELINE_FILE)
         self._baseline_cache: Optional[xr.Dataset] = None
 
+        # Tile-level subsets, reused across indices and temporal chunks
+        self._tile_cache: Dict[Tuple[Hashable, ...], Tuple[xr.DataArray, xr.DataArray]] = {}
+        self._tile_cache_lock = threading.Lock()
+
+    def __getstate__(self):
+        """Drop the tile cache and its lock when pickling (rebuilt on demand)."""
+        state = self.__dict__.copy()
+        del state['_tile_cache'], state['_tile_cache_lock']
+        return state
+
+    def __setstate__(self, state):
+        """Restore state with an empty tile cache."""
+        self.__dict__.update(state)
+        self._tile_cache = {}
+        self._tile_cache_lock = threading.Lock()
+
     def _load_baseline_file(self) -> xr.Dataset:
         """
         Load baseline percentiles file with caching.
@@ -67,8 +105,9 @@ The file should contain temperature, precipitation, and multivariate percentiles
 
         try:
             logger.info(f"Loading baseline percentiles from {self.baseline_file}")
-            # Use chunked loading to avoid loading entire 10.7GB file into memory
-            ds = xr.open_dataset(self.baseline_file, chunks='auto')
+            ds = _open_baseline_dataset(
+                str(self.baseline_file.resolve()), self.baseline_file.stat().st_mtime_ns
+            )
 
             # Validate baseline period
             baseline_period = ds.attrs.get('baseline_period')
@@ -181,6 +220,67 @@ The file should contain temperature, precipitation, and multivariate percentiles
         logger.info("Loading multivariate baseline percentiles")
         return self.load_baseline_percentiles(PipelineConfig.MULTIVARIATE_BASELINE_VARS)
 
+    @staticmethod
+    def _slice_key(s: slice) -> Tuple:
+        """Hashable representation of a slice (slices are unhashable before 3.12)."""
+        return (s.start, s.stop, s.step)
+
+    def get_tile_baselines(
+        self,
+        baselines: Dict[str, xr.DataArray],
+        lat_slice: slice,
+        lon_slice: slice,
+        tile_ds: Optional[xr.Dataset] = None
+    ) -> Dict[str, xr.DataArray]:
+        """
+        Subset baseline percentiles to a spatial tile.
+
+        Subsets are cached per (variable, tile, chunking), so every index in a
+        tile and every temporal chunk of a run share one baseline array (and
+        one set of Dask tasks) instead of re-slicing and re-chunking it per
+        call.
+
+        Args:
+            baselines: Dictionary mapping variable name to full-domain DataArray
+            lat_slice: Latitude slice for the tile
+            lon_slice: Longitude slice for the tile
+            tile_ds: Tile dataset; if given, baselines are rechunked to match
+                     its lat/lon chunks with dayofyear kept whole
+
+        Returns:
+            Dictionary mapping variable name to tile-level DataArray
+        """
+        chunk_dict = None
+        if tile_ds is not None:
+            # Rechunk to match tile data structure (prevents implicit dask rechunk operations)
+            chunk_dict = {
+                'lat': tile_ds.chunks['lat'][0] if 'lat' in tile_ds.chunks else -1,
+                'lon': tile_ds.chunks['lon'][0] if 'lon' in tile_ds.chunks else -1,
+                'dayofyear': -1  # Keep temporal dimension together for efficiency
+            }
+
+        tile_key = (
+            self._slice_key(lat_slice),
+            self._slice_key(lon_slice),
+            tuple(sorted(chunk_dict.items())) if chunk_dict else None,
+        )
+
+        tile_baselines = {}
+        with self._tile_cache_lock:
+            for var, baseline in baselines.items():
+                key = (var, id(baseline)) + tile_key
+                cached = self._tile_cache.get(key)
+                # Keep the source array with the subset so a recycled id() can't alias it
+                if cached is None or cached[0] is not baseline:
+                    tile_baseline = baseline.isel(lat=lat_slice, lon=lon_slice)
+                    if chunk_dict is not None:
+                        tile_baseline = tile_baseline.chunk(chunk_dict)
+                    cached = (baseline, tile_baseline)
+                    self._tile_cache[key] = cached
+                tile_baselines[var] = cached[1]
+
+        return tile_baselines
+
     def has_baseline_file(self) -> bool:
         """
         Check if baseline file exists.
@@ -193,4 +293,7 @@ The file should contain temperature, precipitation, and multivariate percentiles
     def clear_cache(self):
         """Clear cached baseline data to free memory."""
         self._baseline_cache = None
+        _open_baseline_dataset.cache_clear()
+        with self._tile_cache_lock:
+            self._tile_cache.clear()
         logger.debug("Baseline cache cleared")
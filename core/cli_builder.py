@@ -8,6 +8,8 @@ Provides consistent command-line interfaces across all pipelines.
 import argparse
 import logging
 import warnings
+from contextlib import contextmanager, ExitStack
+from pathlib import Path
 from typing import Optional
 
 from core.config import PipelineConfig
@@ -108,12 +110,68 @@ Examples:
             help=f'Number of years to process per chunk (default: {PipelineConfig.DEFAULT_CHUNK_YEARS} for memory efficiency)'
         )
 
+        parser.add_argument(
+            '--parallel-chunks',
+            type=int,
+            default=1,
+            help='Number of temporal chunks to process concurrently in separate processes (default: 1)'
+        )
+
         parser.add_argument(
             '--dashboard',
             action='store_true',
             help='Enable Dask dashboard on port 8787 (currently unused, threaded scheduler only)'
         )
 
+        parser.add_argument(
+            '--tile-executor',
+            choices=['threads', 'processes', 'dask'],
+            default='threads',
+            help='Run spatial tiles on a thread pool, in separate processes, or as one Dask graph (default: threads)'
+        )
+
+        parser.add_argument(
+            '--in-memory-tiles',
+            action='store_true',
+            help='Merge computed tiles in memory, spilling to disk only under memory pressure'
+        )
+
+        parser.add_argument(
+            '--tile-format',
+            choices=['netcdf', 'zarr'],
+            default='netcdf',
+            help='Format of intermediate tile files: NetCDF or Zarr (default: netcdf)'
+        )
+
+        parser.add_argument(
+            '--compress-tiles',
+            action='store_true',
+            help='Compress intermediate tile files (off by default; final output is always compressed)'
+        )
+
+        parser.add_argument(
+            '--output-format',
+            choices=['netcdf', 'zarr', 'zarr-store'],
+            default='netcdf',
+            help='Format of final output: NetCDF or Zarr (Blosc/Zstd) per temporal chunk, or one '
+                 'sharded Zarr store for the whole run (zarr-store) (default: netcdf)'
+        )
+
+        parser.add_argument(
+            '--profile-report',
+            type=str,
+            default=None,
+            metavar='PATH',
+            help='Write a Dask resource/cache profile report (HTML) to PATH'
+        )
+
+        parser.add_argument(
+            '--profile-task-stream',
+            action='store_true',
+            help='Include the per-task timeline in the profile report '
+                 '(default path: <output-dir>/dask_profile.html)'
+        )
+
         parser.add_argument(
             '--verbose', '-v',
             action='store_true',
@@ -167,6 +225,50 @@ Examples:
         PipelineCLI.setup_logging(args.verbose)
         PipelineCLI.setup_warnings(args.show_warnings)
 
+    @staticmethod
+    @contextmanager
+    def profiling(args: argparse.Namespace):
+        """
+        Profile Dask execution for the duration of the block.
+
+        Wraps pipeline.run() so users can tell whether a run is bound by
+        scheduler overhead, compute, or I/O. Does nothing unless
+        --profile-report or --profile-task-stream was given.
+
+        Args:
+            args: Parsed command-line arguments
+        """
+        report_path = getattr(args, 'profile_report', None)
+        task_stream = getattr(args, 'profile_task_stream', False)
+
+        if not report_path and not task_stream:
+            yield
+            return
+
+        from dask.diagnostics import CacheProfiler, Profiler, ResourceProfiler, visualize
+
+        if not report_path:
+            report_path = str(Path(args.output_dir) / 'dask_profile.html')
+
+        profilers = [ResourceProfiler(dt=0.25), CacheProfiler()]
+        if task_stream:
+            profilers.insert(0, Profiler())
+
+        try:
+            with ExitStack() as stack:
+                for profiler in profilers:
+                    stack.enter_context(profiler)
+                yield
+        finally:
+            # Profilers must be closed before plotting; a failed report must
+            # not mask the pipeline's own exception
+            try:
+                Path(report_path).parent.mkdir(parents=True, exist_ok=True)
+                visualize(profilers, filename=report_path, show=False, save=True)
+                logger.info(f"Dask profile report written to {report_path}")
+            except Exception as e:
+                logger.warning(f"Could not write Dask profile report: {e}")
+
     @staticmethod
     def validate_years(start_year: int, end_year: int):
         """
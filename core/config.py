@@ -6,7 +6,10 @@ Centralizes all configuration to eliminate duplication across pipelines.
 """
 
 import warnings
-from typing import Dict
+from types import MappingProxyType
+from typing import Any, Dict, Final, List, Mapping
+
+import netCDF4
 
 
 class PipelineConfig:
@@ -22,30 +25,37 @@ class PipelineConfig:
     """
 
     # ==================== Zarr Store Paths ====================
-    TEMP_ZARR = '/media/mihiarc/SSD4TB/data/PRISM/prism.zarr/temperature'
-    PRECIP_ZARR = '/media/mihiarc/SSD4TB/data/PRISM/prism.zarr/precipitation'
-    HUMIDITY_ZARR = '/media/mihiarc/SSD4TB/data/PRISM/prism.zarr/humidity'
+    # Stores are opened with consolidated metadata (one read per store instead
+    # of one per array). Write new stores with consolidated=True or run
+    # zarr.consolidate_metadata() on existing ones; unconsolidated stores still
+    # open, but more slowly. For future stores, Zarr v3 sharding (e.g.
+    # shards=(365, 621, 1405) with chunks=(365, 103, 201)) keeps a full year in
+    # one file, matching the pipelines' one-year-at-a-time access pattern.
+    TEMP_ZARR: Final[str] = '/media/mihiarc/SSD4TB/data/PRISM/prism.zarr/temperature'
+    PRECIP_ZARR: Final[str] = '/media/mihiarc/SSD4TB/data/PRISM/prism.zarr/precipitation'
+    HUMIDITY_ZARR: Final[str] = '/media/mihiarc/SSD4TB/data/PRISM/prism.zarr/humidity'
 
     # ==================== Chunk Configuration ====================
-    DEFAULT_CHUNKS = {
+    # Read-only so it can be shared by reference instead of copied per pipeline
+    DEFAULT_CHUNKS: Final[Mapping[str, int]] = MappingProxyType({
         'time': 365,   # One year of daily data
         'lat': 103,    # 621 / 103 = 6 chunks (memory optimized)
         'lon': 201     # 1405 / 201 = 7 chunks (memory optimized)
-    }
+    })
 
     # ==================== Variable Renaming ====================
     # Maps PRISM variable names to xclim-compatible names
-    TEMP_RENAME_MAP = {
+    TEMP_RENAME_MAP: Final[Dict[str, str]] = {
         'tmean': 'tas',       # Mean temperature
         'tmax': 'tasmax',     # Maximum temperature
         'tmin': 'tasmin'      # Minimum temperature
     }
 
-    PRECIP_RENAME_MAP = {
+    PRECIP_RENAME_MAP: Final[Dict[str, str]] = {
         'ppt': 'pr'           # Precipitation
     }
 
-    HUMIDITY_RENAME_MAP = {
+    HUMIDITY_RENAME_MAP: Final[Dict[str, str]] = {
         'tdmean': 'tdew',     # Dewpoint temperature
         'vpdmax': 'vpdmax',   # Maximum vapor pressure deficit
         'vpdmin': 'vpdmin'    # Minimum vapor pressure deficit
@@ -53,24 +63,24 @@ class PipelineConfig:
 
     # ==================== Unit Fixes ====================
     # CF-compliant unit specifications
-    TEMP_UNIT_FIXES = {
+    TEMP_UNIT_FIXES: Final[Dict[str, str]] = {
         'tas': 'degC',
         'tasmax': 'degC',
         'tasmin': 'degC'
     }
 
-    PRECIP_UNIT_FIXES = {
+    PRECIP_UNIT_FIXES: Final[Dict[str, str]] = {
         'pr': 'mm d-1'  # CF-compliant format
     }
 
-    HUMIDITY_UNIT_FIXES = {
+    HUMIDITY_UNIT_FIXES: Final[Dict[str, str]] = {
         'tdew': 'degC',
         'vpdmax': 'kPa',
         'vpdmin': 'kPa'
     }
 
     # ==================== CF Standard Names ====================
-    CF_STANDARD_NAMES: Dict[str, str] = {
+    CF_STANDARD_NAMES: Final[Dict[str, str]] = {
         # Temperature
         'tas': 'air_temperature',
         'tasmax': 'air_temperature',
@@ -84,17 +94,20 @@ class PipelineConfig:
     }
 
     # ==================== Baseline Configuration ====================
-    BASELINE_FILE = 'data/baselines/baseline_percentiles_1981_2000.nc'
-    BASELINE_PERIOD = '1981-2000'
+    BASELINE_FILE: Final[str] = 'data/baselines/baseline_percentiles_1981_2000.nc'
+    BASELINE_PERIOD: Final[str] = '1981-2000'
+
+    # SPI gamma parameters fitted over the SPI calibration period (1981-2010)
+    SPI_PARAMS_FILE: Final[str] = 'data/baselines/spi_gamma_params_1981_2010.nc'
 
     # Temperature baseline variables
-    TEMP_BASELINE_VARS = ['tx90p_threshold', 'tx10p_threshold', 'tn90p_threshold', 'tn10p_threshold']
+    TEMP_BASELINE_VARS: Final[List[str]] = ['tx90p_threshold', 'tx10p_threshold', 'tn90p_threshold', 'tn10p_threshold']
 
     # Precipitation baseline variables
-    PRECIP_BASELINE_VARS = ['pr95p_threshold', 'pr99p_threshold', 'pr_75p_threshold']
+    PRECIP_BASELINE_VARS: Final[List[str]] = ['pr95p_threshold', 'pr99p_threshold', 'pr_75p_threshold']
 
     # Multivariate baseline variables
-    MULTIVARIATE_BASELINE_VARS = ['tas_25p_threshold', 'tas_75p_threshold', 'pr_25p_threshold', 'pr_75p_threshold']
+    MULTIVARIATE_BASELINE_VARS: Final[List[str]] = ['tas_25p_threshold', 'tas_75p_threshold', 'pr_25p_threshold', 'pr_75p_threshold']
 
     # ==================== Warning Filters ====================
     @staticmethod
@@ -104,25 +117,73 @@ class PipelineConfig:
 
         These warnings are suppressed because they don't affect functionality:
         - Cell methods warnings (xclim metadata)
-        - Chunk specification warnings (expected for large datasets)
         - All-NaN slice warnings (expected for edge cases)
         - Division warnings (handled by xarray)
         - Future warnings about Dataset.dims return type
         """
         warnings.filterwarnings('ignore', category=UserWarning, message='.*cell_methods.*')
-        warnings.filterwarnings('ignore', category=UserWarning, message='.*specified chunks.*')
         warnings.filterwarnings('ignore', category=RuntimeWarning, message='.*All-NaN slice.*')
         warnings.filterwarnings('ignore', category=RuntimeWarning, message='.*divide.*')
         warnings.filterwarnings('ignore', category=RuntimeWarning, message='.*invalid value.*')
         warnings.filterwarnings('ignore', category=FutureWarning, message='.*return type of.*Dataset.dims.*')
 
+    # ==================== JIT Caching ====================
+    @staticmethod
+    def setup_jit_caching():
+        """
+        Cache xclim's Numba kernels on disk.
+
+        xclim compiles its run-length kernels (used by the consecutive-day
+        indices) without caching, which takes ~2.5 s in every new process,
+        i.e. in each temporal-chunk and tile worker process. With caching,
+        only the first process compiles; later ones load the machine code.
+        Numba uses NUMBA_CACHE_DIR if set and falls back to a user-wide
+        cache directory when site-packages is not writable.
+        """
+        import xclim.indices.run_length as run_length
+
+        for name in ('_cumsum_reset_np', '_rle_1d'):
+            kernel = getattr(run_length, name, None)
+            if hasattr(kernel, 'enable_caching'):
+                kernel.enable_caching()
+
     # ==================== Default Processing Options ====================
-    DEFAULT_CHUNK_YEARS = 1  # Process 1 year at a time for memory efficiency
-    DEFAULT_OUTPUT_DIR = './outputs'
-    DEFAULT_START_YEAR = 1981
-    DEFAULT_END_YEAR = 2024
+    DEFAULT_CHUNK_YEARS: Final[int] = 1  # Process 1 year at a time for memory efficiency
+    DEFAULT_OUTPUT_DIR: Final[str] = './outputs'
+    DEFAULT_START_YEAR: Final[int] = 1981
+    DEFAULT_END_YEAR: Final[int] = 2024
 
     # ==================== NetCDF Encoding ====================
+    # Target uncompressed size of each NetCDF chunk. zlib needs blocks well
+    # above its 64 KB window to compress effectively.
+    ENCODING_TARGET_CHUNK_BYTES: Final[int] = 1024 * 1024  # 1 MiB
+
+    # Compression filter for NetCDF output (netCDF4 engine). Zstandard writes
+    # several times faster than zlib (single-threaded DEFLATE) at a similar
+    # ratio; netCDF-C builds without the filter fall back to zlib. Reading
+    # zstd-compressed files needs netCDF-C >= 4.9 with the filter plugin.
+    NETCDF_COMPRESSION: Final[Mapping[str, Any]] = MappingProxyType(
+        {'compression': 'zstd', 'complevel': 4}
+        if getattr(netCDF4, '__has_zstandard_support__', False)
+        else {'zlib': True, 'complevel': 4}
+    )
+
+    # ==================== Spatial Tiling ====================
+    # Tiles in flight are capped so that their estimated working set
+    # (input tile size x inflation factor) fits in this share of available RAM.
+    TILE_MEMORY_INFLATION: Final[float] = 3.0  # Input + intermediates + indices
+    TILE_MEMORY_FRACTION: Final[float] = 0.7
+
+    # ==================== SPI ====================
+    # SPI fits each pixel over the whole record, so precipitation is read for
+    # SPI with time-contiguous chunks of about this size (at least one store
+    # chunk; DEFAULT_CHUNKS stay year-long for the annual indices).
+    SPI_CHUNK_BYTES: Final[int] = 256 * 1024 * 1024  # 256 MiB
+    # A tile's daily precipitation is loaded into memory before the monthly
+    # resample when it fits in this share of available RAM (split between
+    # the tiles in flight); larger tiles are resampled lazily per block.
+    SPI_PRELOAD_MEMORY_FRACTION: Final[float] = 0.6
+
     @staticmethod
     def default_encoding(chunksizes=(1, 69, 281)):
         """
@@ -135,7 +196,6 @@ class PipelineConfig:
             Dictionary with compression settings
         """
         return {
-            'zlib': True,
-            'complevel': 4,
+            **PipelineConfig.NETCDF_COMPRESSION,
             'chunksizes': chunksizes
         }
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Background memory sampling for xclim-timber pipelines.
+
+Start/end RSS snapshots miss the transient peaks that actually trigger
+OOM kills. MemorySampler polls resident memory from a daemon thread so
+each processing step can report its peak RSS.
+"""
+
+from collections import deque
+from typing import Optional
+import logging
+import os
+import sys
+import threading
+
+import psutil
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - resource is POSIX only
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+
+class MemorySampler:
+    """
+    Sample process RSS on a background thread.
+
+    Samples are kept in a bounded deque, so memory use of the sampler itself
+    is constant regardless of how long the pipeline runs. Call reset() at the
+    start of a processing step and peak_mb() at the end to get that step's
+    peak RSS.
+    """
+
+    def __init__(self, interval: float = 2.0, max_samples: int = 3600):
+        """
+        Initialize sampler (not started).
+
+        Args:
+            interval: Seconds between samples
+            max_samples: Maximum number of samples retained
+        """
+        self.interval = interval
+        self._process = psutil.Process(os.getpid())
+        self._samples = deque(maxlen=max_samples)
+        self._samples_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __getstate__(self):
+        """Pickle only the configuration; threads and samples stay behind."""
+        return {'interval': self.interval, 'max_samples': self._samples.maxlen}
+
+    def __setstate__(self, state):
+        """Rebuild a fresh (stopped) sampler in the receiving process."""
+        self.__init__(**state)
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the background sampling thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start the background sampling thread (no-op if already running)."""
+        if self.is_running:
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            name='xclim-timber-memory-sampler',
+            daemon=True
+        )
+        self._thread.start()
+        logger.debug(f"Memory sampler started (interval={self.interval}s)")
+
+    def stop(self):
+        """Stop the background sampling thread and wait for it to exit."""
+        if self._thread is None:
+            return
+
+        self._stop_event.set()
+        self._thread.join(timeout=self.interval + 1)
+        self._thread = None
+        logger.debug("Memory sampler stopped")
+
+    def _run(self):
+        """Sampling loop executed on the background thread."""
+        while not self._stop_event.is_set():
+            self.sample()
+            self._stop_event.wait(self.interval)
+
+    def sample(self) -> float:
+        """
+        Record the current RSS.
+
+        Returns:
+            Current RSS in MB
+        """
+        rss_mb = self._process.memory_info().rss / 1024 / 1024
+        with self._samples_lock:
+            self._samples.append(rss_mb)
+        return rss_mb
+
+    def reset(self):
+        """Discard collected samples (start of a new measurement window)."""
+        with self._samples_lock:
+            self._samples.clear()
+
+    def peak_mb(self) -> float:
+        """
+        Peak RSS observed since the last reset().
+
+        Takes one final sample so the result is never empty.
+
+        Returns:
+            Peak RSS in MB
+        """
+        self.sample()
+        with self._samples_lock:
+            return max(self._samples)
+
+    @staticmethod
+    def lifetime_peak_mb() -> Optional[float]:
+        """
+        Peak RSS of the whole process as reported by the kernel.
+
+        Returns:
+            Peak RSS in MB, or None where getrusage is unavailable
+        """
+        if resource is None:
+            return None
+
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+        if sys.platform == 'darwin':
+            return max_rss / 1024 / 1024
+        return max_rss / 1024
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+        return False
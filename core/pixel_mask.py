@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Valid-pixel compression for per-pixel kernels in xclim-timber.
+
+PRISM covers CONUS on a rectangular grid, so a large share of pixels
+(ocean, outside the border) are NaN for the whole record. Per-pixel
+kernels such as the SPI gamma fit and the NumPy dry/wet-day statistics
+return NaN for those pixels anyway; compressing each block to its valid
+pixels before calling the kernel skips that work entirely.
+"""
+
+from typing import Callable
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def map_valid_pixels(func: Callable[..., np.ndarray], values: np.ndarray, *args, **kwargs) -> np.ndarray:
+    """
+    Apply a per-pixel kernel only to pixels that have any non-NaN value.
+
+    Leading axes are flattened to one pixel axis, the kernel runs on the
+    valid pixels only, and its results are scattered back to the full
+    shape with NaN for pixels that are missing throughout.
+
+    Args:
+        func: Kernel taking (pixels, time) values and returning
+              (pixels, ...) floating point results
+        values: Array with time as the last axis
+        *args: Extra positional arguments for func
+        **kwargs: Extra keyword arguments for func
+
+    Returns:
+        Kernel output shaped values.shape[:-1] + output trailing shape
+    """
+    pixels = values.reshape(-1, values.shape[-1])
+    valid = ~np.isnan(pixels).all(axis=-1)
+
+    if valid.all():
+        result = func(pixels, *args, **kwargs)
+        return result.reshape(values.shape[:-1] + result.shape[1:])
+
+    valid_result = func(pixels[valid], *args, **kwargs)
+    result = np.full((pixels.shape[0],) + valid_result.shape[1:], np.nan, dtype=valid_result.dtype)
+    result[valid] = valid_result
+    return result.reshape(values.shape[:-1] + valid_result.shape[1:])
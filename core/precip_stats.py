@@ -0,0 +1,595 @@
+#!/usr/bin/env python3
+"""
+Fused annual dry/wet-day statistics for xclim-timber.
+
+Maximum consecutive dry days (cdd), dry day count, the simple daily
+intensity index (sdii) and the dry spell frequency and total length all
+classify the same daily values against the same wet-day threshold. xclim
+computes each one with its own traversal of the precipitation array; here
+all five come from one pass over each year block. Results match xclim's
+maximum_consecutive_dry_days, dry_days, daily_pr_intensity and
+dry_spell_frequency / dry_spell_total_length with op='max' (runs do not
+cross year boundaries, and a year with any missing value is NaN). A dry
+spell spanning a new year is split there; xclim's rolling window can
+instead count a short piece of it in the next year. A partial year is
+computed from the days present, where xclim's missing-value check returns
+NaN; the pipelines always process whole years.
+
+When Numba is installed, the statistics come from a compiled kernel that
+reads each block once in its stored (time-major) order; otherwise a
+vectorized NumPy version with the same results is used.
+
+The annual maximum multi-day precipitation sum is also computed here, from
+one cumulative sum per pixel instead of xarray's rolling window, and so is
+the fraction of precipitation from days above a percentile.
+"""
+
+from typing import Callable, Dict, Optional, Tuple
+import logging
+
+import numpy as np
+import xarray as xr
+from dask.array.overlap import overlap as dask_overlap
+from xclim.core.calendar import resample_doy
+from xclim.core.units import convert_units_to
+
+from core.pixel_mask import map_valid_pixels
+
+try:
+    import numba  # optional: compiled dry/wet-day kernel
+except ImportError:
+    numba = None
+
+logger = logging.getLogger(__name__)
+
+# Order of the statistics along the last axis of dry_wet_stats() output
+DRY_WET_STATS = ('cdd', 'dry_days', 'sdii', 'dry_spell_frequency', 'dry_spell_total_length')
+
+
+def dry_wet_stats(values: np.ndarray, thresh: float, min_spell: int = 3) -> np.ndarray:
+    """
+    Dry run, dry day, wet-day mean and dry spell statistics along the last axis.
+
+    Args:
+        values: Daily precipitation with time as the last axis
+        thresh: Wet-day threshold in the units of values (dry is < thresh)
+        min_spell: Minimum length of a dry run counted as a dry spell
+
+    Returns:
+        float64 array shaped values.shape[:-1] + (5,) ordered as DRY_WET_STATS;
+        NaN wherever the series has a missing value (sdii is also NaN
+        without wet days)
+    """
+    if _dry_wet_stats_compiled is not None:
+        # Time-major series: for blocks stored as (time, lat, lon) and viewed
+        # with time last, this is their own memory layout (no copy)
+        series = np.moveaxis(values, -1, 0).reshape(values.shape[-1], -1)
+        stats = _dry_wet_stats_compiled(series, float(thresh), int(min_spell))
+        return stats.reshape(values.shape[:-1] + (len(DRY_WET_STATS),))
+    return _dry_wet_stats_numpy(values, thresh, min_spell)
+
+
+def _dry_wet_stats_numpy(values: np.ndarray, thresh: float, min_spell: int) -> np.ndarray:
+    """Vectorized NumPy version of dry_wet_stats (used without Numba)."""
+    missing = np.isnan(values).any(axis=-1)
+    dry = values < thresh
+    wet = values >= thresh
+
+    cdd, spells, spell_days = _dry_runs(dry, min_spell)
+    dry_days = dry.sum(axis=-1)
+
+    wet_days = wet.sum(axis=-1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sdii = np.where(wet, values, 0).sum(axis=-1, dtype=np.float64) / wet_days
+
+    stats = np.stack([cdd, dry_days, sdii, spells, spell_days], axis=-1).astype(np.float64)
+    stats[missing] = np.nan
+    return stats
+
+
+def _dry_wet_stats_kernel(series: np.ndarray, thresh: float, min_spell: int) -> np.ndarray:
+    """
+    dry_wet_stats for (time, pixels) values in a single pass.
+
+    Written as plain loops for Numba. Each time step updates scalar
+    counters per pixel; pixels are independent, so the inner loop over
+    them pipelines well, and the series is read in its stored order
+    without a transposed copy. Pixels with a missing value are NaN.
+    """
+    n_time, n_pixels = series.shape
+    current = np.zeros(n_pixels, dtype=np.int64)
+    longest = np.zeros(n_pixels, dtype=np.int64)
+    spells = np.zeros(n_pixels, dtype=np.int64)
+    spell_days = np.zeros(n_pixels, dtype=np.int64)
+    dry_days = np.zeros(n_pixels, dtype=np.int64)
+    wet_days = np.zeros(n_pixels, dtype=np.int64)
+    wet_total = np.zeros(n_pixels)
+    missing = np.zeros(n_pixels, dtype=np.bool_)
+    for step in range(n_time):
+        for pixel in range(n_pixels):
+            value = series[step, pixel]
+            if np.isnan(value):
+                missing[pixel] = True
+            elif value < thresh:
+                dry_days[pixel] += 1
+                current[pixel] += 1
+                longest[pixel] = max(longest[pixel], current[pixel])
+            else:
+                if current[pixel] >= min_spell:
+                    spells[pixel] += 1
+                    spell_days[pixel] += current[pixel]
+                current[pixel] = 0
+                wet_days[pixel] += 1
+                wet_total[pixel] += value
+
+    stats = np.full((n_pixels, 5), np.nan)
+    for pixel in range(n_pixels):
+        if missing[pixel]:
+            continue
+        # Spells still running at the end of the series
+        if current[pixel] >= min_spell:
+            spells[pixel] += 1
+            spell_days[pixel] += current[pixel]
+
+        stats[pixel, 0] = longest[pixel]
+        stats[pixel, 1] = dry_days[pixel]
+        if wet_days[pixel] > 0:
+            stats[pixel, 2] = wet_total[pixel] / wet_days[pixel]
+        stats[pixel, 3] = spells[pixel]
+        stats[pixel, 4] = spell_days[pixel]
+    return stats
+
+
+# nogil: Dask's threads run the kernel on several blocks at once
+_dry_wet_stats_compiled = (
+    numba.njit(nogil=True, cache=True)(_dry_wet_stats_kernel) if numba is not None else None
+)
+
+
+def _dry_runs(mask: np.ndarray, min_length: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Longest run, and number and total length of runs of at least min_length.
+
+    Pixels are laid out as contiguous uint8 lanes per time step and a narrow
+    per-lane run counter is updated branchlessly (cur = (cur + 1) * dry,
+    best = max(best, cur)), so each step is a few vector operations over all
+    pixels with O(pixels) state instead of cumulative (pixel, time) arrays.
+    A run is tallied when it ends, i.e. at the first False step after it
+    (or at the end of the series) while the counter is >= min_length.
+
+    The lanes are the boolean mask viewed as uint8 (no conversion pass).
+    The steps are bound by per-operation overhead on L2-resident lanes,
+    not by reading the mask, so narrower (bit-packed) masks would not help;
+    the compiled kernel avoids the mask altogether.
+
+    Args:
+        mask: Boolean array with time as the last axis
+        min_length: Minimum run length counted as a spell
+
+    Returns:
+        Tuple of (longest run, number of spells, days in spells) per series,
+        each shaped mask.shape[:-1]
+    """
+    n_time = mask.shape[-1]
+    lanes = np.ascontiguousarray(mask.reshape(-1, n_time).T).view(np.uint8)
+
+    counter_dtype = np.min_scalar_type(n_time)
+    current = np.zeros(lanes.shape[1], dtype=counter_dtype)
+    longest = np.zeros_like(current)
+    spells = np.zeros_like(current)
+    spell_days = np.zeros_like(current)
+    ended = np.zeros(lanes.shape[1], dtype=bool)
+    for step in lanes:
+        # A spell ends where this step is wet and the run so far is long enough
+        np.greater_equal(current, min_length, out=ended)
+        ended &= step == 0
+        spells += ended
+        spell_days += current * ended
+
+        current += 1
+        np.multiply(current, step, out=current)
+        np.maximum(longest, current, out=longest)
+
+    # Spells still running at the end of the series
+    ended = current >= min_length
+    spells += ended
+    spell_days += current * ended
+
+    shape = mask.shape[:-1]
+    return longest.reshape(shape), spells.reshape(shape), spell_days.reshape(shape)
+
+
+def trailing_sums(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Trailing window sums along the last axis from one cumulative sum.
+
+    Each sum is a single subtraction of the running total instead of adding
+    window values, and the running total is kept in float64 so it does not
+    drift over multi-decade series. A sum is NaN until the window fills or
+    if any value in the window is NaN (xarray's rolling with
+    min_periods=window).
+
+    Args:
+        values: Values with time as the last axis
+        window: Window length in time steps
+
+    Returns:
+        Window sums shaped and typed like values, labelled at the window's last step
+    """
+    sums = np.full_like(values, np.nan)
+    if values.shape[-1] < window:
+        return sums
+
+    missing = np.isnan(values)
+    has_missing = missing.any()
+    cumsum = np.zeros(values.shape[:-1] + (values.shape[-1] + 1,))
+    np.cumsum(np.where(missing, 0.0, values) if has_missing else values, axis=-1, out=cumsum[..., 1:])
+    np.subtract(cumsum[..., window:], cumsum[..., :-window], out=sums[..., window - 1:], casting='same_kind')
+
+    # Series without gaps (the usual case) skip the missing-value bookkeeping
+    if has_missing:
+        cum_missing = np.zeros(cumsum.shape, dtype=np.int32)
+        np.cumsum(missing, axis=-1, out=cum_missing[..., 1:])
+        sums[..., window - 1:][cum_missing[..., window:] != cum_missing[..., :-window]] = np.nan
+    return sums
+
+
+def annual_max_window_sum(pr: xr.DataArray, window: int = 7) -> xr.DataArray:
+    """
+    Annual maximum of trailing multi-day precipitation sums.
+
+    Equivalent to pr.rolling(time=window, min_periods=window).sum() followed
+    by .resample(time='YS').max(), but the sums come from trailing_sums()
+    (one cumulative sum per pixel) instead of xarray's windowed view. A
+    window is assigned to the year of its last day, so windows starting in
+    late December count towards the next year. Each year block is read
+    with the previous year's last window - 1 days (see _map_years), so the
+    year-long chunks are kept instead of merging the record into one.
+
+    Args:
+        pr: Daily precipitation (time, lat, lon)
+        window: Number of days summed
+
+    Returns:
+        Annual maxima on a yearly ('YS') time axis, without attributes
+    """
+    year_time = pr.time.resample(time='YS').first().dropna('time').time
+    maxima = _map_years(_block_max_window_sum, pr, lead=window - 1, dtype=pr.dtype, window=window)
+    return maxima.rename(year='time').assign_coords(time=year_time).transpose(*pr.dims)
+
+
+def _block_max_window_sum(block: np.ndarray, window: int) -> np.ndarray:
+    """
+    Maximum trailing window sum of one year-long block, shaped block.shape[:-1] + (1,).
+
+    Sums ending in the prepended lead days are incomplete (NaN), so only
+    windows ending in the block's year count, with or without a lead.
+    """
+    if _max_window_sum_compiled is not None:
+        # One pass without the intermediate sums (time-major, as dry_wet_stats)
+        series = np.moveaxis(block, -1, 0).reshape(block.shape[-1], -1)
+        maxima = _max_window_sum_compiled(series, int(window))
+        return maxima.astype(block.dtype, copy=False).reshape(block.shape[:-1] + (1,))
+
+    # Pixels without any data (ocean, outside CONUS) are skipped
+    sums = map_valid_pixels(trailing_sums, block, window=window)
+    # fmax ignores NaN (like resample's max) and stays NaN only without any full window
+    return np.fmax.reduce(sums, axis=-1)[..., np.newaxis]
+
+
+def _block_dry_wet_stats(block: np.ndarray, thresh: float, min_spell: int) -> np.ndarray:
+    """dry_wet_stats of one year-long block, shaped block.shape[:-1] + (1, stats)."""
+    if _dry_wet_stats_compiled is not None:
+        # The compiled kernel reads the block in place; a pixel without any
+        # data only costs one NaN check per day, less than compressing the block
+        stats = dry_wet_stats(block, thresh=thresh, min_spell=min_spell)
+    else:
+        # Pixels without any data (ocean, outside CONUS) are skipped
+        stats = map_valid_pixels(dry_wet_stats, block, thresh=thresh, min_spell=min_spell)
+    return stats[..., np.newaxis, :]
+
+
+def _max_window_sum_kernel(series: np.ndarray, window: int) -> np.ndarray:
+    """
+    Maximum trailing window sum per pixel of (time, pixels) values in a single pass.
+
+    Each pixel keeps a running float64 sum (the value entering the window
+    is added, the one leaving it subtracted) and a count of missing values
+    in the window, so the window sums are never stored. Windows with a
+    missing value are skipped; NaN without any complete window. Compiled
+    with Numba when available (see _max_window_sum_compiled).
+    """
+    n_time, n_pixels = series.shape
+    sums = np.zeros(n_pixels)
+    missing = np.zeros(n_pixels, dtype=np.int64)
+    maxima = np.full(n_pixels, np.nan)
+
+    for t in range(n_time):
+        for p in range(n_pixels):
+            value = series[t, p]
+            if np.isnan(value):
+                missing[p] += 1
+            else:
+                sums[p] += value
+            if t >= window:
+                leaving = series[t - window, p]
+                if np.isnan(leaving):
+                    missing[p] -= 1
+                else:
+                    sums[p] -= leaving
+            if t >= window - 1 and missing[p] == 0 and not sums[p] <= maxima[p]:
+                maxima[p] = sums[p]
+    return maxima
+
+
+_max_window_sum_compiled = (
+    numba.njit(nogil=True, cache=True)(_max_window_sum_kernel) if numba is not None else None
+)
+
+
+def _map_years(
+    block_func: Callable[..., np.ndarray],
+    pr: xr.DataArray,
+    *aligned: xr.DataArray,
+    trailing_dims: Optional[Dict[str, int]] = None,
+    lead: int = 0,
+    dtype: np.dtype = np.float64,
+    **kwargs
+) -> xr.DataArray:
+    """
+    Apply a per-year block function, with years split by index instead of resampling.
+
+    Dask input is rechunked so every time chunk is exactly one year (a small
+    shuffle from year-long store chunks, none if they already match) and
+    each block maps to its year's result: one task per block, without
+    resample's per-year groups, apply_ufunc calls and concatenation.
+    Functions that look back across the year boundary (window sums) get
+    the last lead days of the previous year prepended to each block, read
+    from the neighbouring chunk instead of merging all years into one.
+
+    Args:
+        block_func: Function of one year's values (time as the last axis),
+                    the matching blocks of aligned and kwargs, returning
+                    block.shape[:-1] + (1,) + trailing shape
+        pr: Daily values (time, ...)
+        *aligned: Arrays with the same dims and time axis as pr, split alongside it
+        trailing_dims: Sizes of extra output dims after 'year'
+        lead: Number of preceding days prepended to each block (none for the first year)
+        dtype: Data type returned by block_func
+        **kwargs: Extra keyword arguments for block_func
+
+    Returns:
+        Result with dims (..., 'year', *trailing_dims), one entry per calendar year in pr
+    """
+    trailing_dims = trailing_dims or {}
+    years = pr.time.dt.year.values
+    year_bounds = np.concatenate([[0], np.flatnonzero(np.diff(years)) + 1, [len(years)]])
+    values = pr.transpose(..., 'time')
+    aligned = [da.transpose(*values.dims) for da in aligned]
+
+    def apply_years(series: np.ndarray, *aligned_series: np.ndarray) -> np.ndarray:
+        return np.concatenate(
+            [
+                block_func(
+                    series[..., max(0, start - lead):end],
+                    *(a[..., max(0, start - lead):end] for a in aligned_series),
+                    **kwargs
+                )
+                for start, end in zip(year_bounds[:-1], year_bounds[1:])
+            ],
+            axis=series.ndim - 1
+        )
+
+    if values.chunks is None:
+        data = apply_years(values.values, *(np.asarray(da) for da in aligned))
+    else:
+        year_lengths = tuple(np.diff(year_bounds))
+        # Leads are read from the neighbouring blocks, which must hold that many
+        # days; otherwise (a short partial year) all years are mapped in one block
+        by_year = min(year_lengths) >= lead
+        blocks = values.chunk({'time': year_lengths if by_year else -1}).data
+        aligned_blocks = [da.chunk(dict(zip(values.dims, blocks.chunks))).data for da in aligned]
+        if by_year and lead:
+            depth = {blocks.ndim - 1: (lead, 0)}
+            blocks, *aligned_blocks = (
+                dask_overlap(block_array, depth=depth, boundary='none')
+                for block_array in (blocks, *aligned_blocks)
+            )
+        data = blocks.map_blocks(
+            block_func if by_year else apply_years,
+            *aligned_blocks,
+            **(kwargs if by_year else {}),
+            chunks=(
+                blocks.chunks[:-1]
+                + (((1,) * len(year_lengths)) if by_year else (len(year_lengths),),)
+                + tuple((n,) for n in trailing_dims.values())
+            ),
+            new_axis=list(range(blocks.ndim, blocks.ndim + len(trailing_dims))),
+            dtype=dtype,
+        )
+
+    coords = values.isel(time=0, drop=True).coords
+    return xr.DataArray(data, dims=values.dims[:-1] + ('year', *trailing_dims), coords=coords)
+
+
+def _yearly_dry_wet_stats(pr: xr.DataArray, thresh: float, min_spell: int) -> xr.DataArray:
+    """
+    dry_wet_stats per year (see _map_years).
+
+    Args:
+        pr: Daily values (time, ...)
+        thresh: Wet-day threshold in the units of pr
+        min_spell: Minimum length of a dry run counted as a dry spell
+
+    Returns:
+        Statistics with dims (..., 'year', 'stat'), one entry per calendar year in pr
+    """
+    return _map_years(
+        _block_dry_wet_stats, pr,
+        trailing_dims={'stat': len(DRY_WET_STATS)}, thresh=thresh, min_spell=min_spell
+    )
+
+
+def _fraction_over_kernel(series: np.ndarray, over_thresh: np.ndarray, thresh: float) -> np.ndarray:
+    """
+    Share of the wet-day total from days above over_thresh, for (time, pixels) values in one pass.
+
+    Both sums are accumulated per pixel while the values are read, without
+    the masked copies of the NumPy version; NaN if a value is missing or
+    there is no wet-day precipitation. Compiled with Numba when available
+    (see _fraction_over_compiled).
+    """
+    n_time, n_pixels = series.shape
+    total = np.zeros(n_pixels)
+    over = np.zeros(n_pixels)
+    missing = np.zeros(n_pixels, dtype=np.bool_)
+
+    for t in range(n_time):
+        for p in range(n_pixels):
+            value = series[t, p]
+            if np.isnan(value):
+                missing[p] = True
+                continue
+            if value > thresh:
+                total[p] += value
+            if value > over_thresh[t, p]:
+                over[p] += value
+
+    fraction = np.full(n_pixels, np.nan)
+    for p in range(n_pixels):
+        if not missing[p] and total[p] > 0:
+            fraction[p] = over[p] / total[p]
+    return fraction
+
+
+_fraction_over_compiled = (
+    numba.njit(nogil=True, cache=True)(_fraction_over_kernel) if numba is not None else None
+)
+
+
+def _block_fraction_over(block: np.ndarray, over_thresh: np.ndarray, thresh: float) -> np.ndarray:
+    """Share of one year-long block's wet-day total from days above over_thresh, shaped block.shape[:-1] + (1,)."""
+    if _fraction_over_compiled is not None:
+        # Time-major, as dry_wet_stats
+        series = np.moveaxis(block, -1, 0).reshape(block.shape[-1], -1)
+        over_series = np.moveaxis(over_thresh, -1, 0).reshape(block.shape[-1], -1)
+        fraction = _fraction_over_compiled(series, over_series, float(thresh))
+        return fraction.reshape(block.shape[:-1] + (1,))
+
+    total = np.where(block > thresh, block, 0).sum(axis=-1, dtype=np.float64)
+    over = np.where(block > over_thresh, block, 0).sum(axis=-1, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fraction = over / total
+    fraction[np.isnan(block).any(axis=-1)] = np.nan
+    return fraction[..., np.newaxis]
+
+
+def annual_fraction_over_thresh(
+    pr: xr.DataArray,
+    pr_per: xr.DataArray,
+    thresh: str = '1 mm/day'
+) -> xr.DataArray:
+    """
+    Annual fraction of wet-day precipitation falling on days above a percentile.
+
+    Same result as xclim's fraction_over_precip_thresh (op='>'), whose
+    indicator builds a where() and resample().sum() graph for the total and
+    again for the heavy days, plus its missing-value checks; here both sums
+    come from one pass over each year block. Days count as heavy above both
+    the percentile and the wet-day threshold. As with the indicator, a year
+    with any missing value is NaN.
+
+    Args:
+        pr: Daily precipitation with a units attribute (time, lat, lon)
+        pr_per: Percentile threshold per pixel, optionally per 'dayofyear'
+        thresh: Wet-day threshold as a quantity string
+
+    Returns:
+        Fraction on a yearly ('YS') time axis, without attributes (NaN
+        without wet-day precipitation)
+    """
+    pr_per = convert_units_to(pr_per, pr, context='hydro')
+    thresh_value = convert_units_to(thresh, pr, context='hydro')
+
+    over_thresh = pr_per.where(pr_per > thresh_value, thresh_value)
+    if 'dayofyear' in over_thresh.coords:
+        over_thresh = resample_doy(over_thresh, pr)
+    over_thresh = over_thresh.broadcast_like(pr)
+
+    year_time = pr.time.resample(time='YS').first().dropna('time').time
+    fraction = _map_years(_block_fraction_over, pr, over_thresh, thresh=thresh_value)
+    return fraction.rename(year='time').assign_coords(time=year_time).transpose(*pr.dims)
+
+
+def annual_dry_wet_indices(
+    pr: xr.DataArray,
+    thresh: str = '1.0 mm/day',
+    min_spell: int = 3
+) -> Dict[str, xr.DataArray]:
+    """
+    Compute annual cdd, dry_days, sdii and dry spell indices from daily precipitation in one pass.
+
+    Args:
+        pr: Daily precipitation with a units attribute (time, lat, lon)
+        thresh: Wet-day threshold as a quantity string
+        min_spell: Minimum number of consecutive dry days in a dry spell
+
+    Returns:
+        Dictionary with 'cdd', 'dry_days', 'sdii', 'dry_spell_frequency' and
+        'dry_spell_total_length' on a yearly ('YS') time axis, with CF
+        attributes equivalent to xclim's indicators
+    """
+    thresh_value = convert_units_to(thresh, pr, context='hydro')
+
+    # 'YS' labels of the years present (a gap year would be an empty resample group)
+    year_time = pr.time.resample(time='YS').first().dropna('time').time
+
+    stats = _yearly_dry_wet_stats(pr, thresh_value, min_spell)
+    stats = stats.rename(year='time').assign_coords(time=year_time, stat=list(DRY_WET_STATS))
+    stats = stats.transpose('stat', 'time', ...)
+
+    attrs = {
+        'cdd': {
+            'units': 'days',
+            'standard_name': 'number_of_days_with_lwe_thickness_of_precipitation_amount_below_threshold',
+            'cell_methods': 'time: sum over days',
+            'long_name': f'Maximum consecutive days with daily precipitation < {thresh}',
+            'description': f'Annual maximum number of consecutive days with daily precipitation < {thresh}.',
+        },
+        'dry_days': {
+            'units': 'days',
+            'standard_name': 'number_of_days_with_lwe_thickness_of_precipitation_amount_below_threshold',
+            'cell_methods': 'time: sum over days',
+            'long_name': 'Number of dry days',
+            'description': f'Annual number of days with daily precipitation under {thresh}.',
+        },
+        'sdii': {
+            'units': pr.attrs['units'],
+            'standard_name': 'lwe_thickness_of_precipitation_amount',
+            'long_name': f'Average precipitation during days with daily precipitation over {thresh} '
+                         '(simple daily intensity index: sdii)',
+            'description': f'Annual simple daily intensity index (sdii) or annual average precipitation '
+                           f'for days with daily precipitation over {thresh}.',
+        },
+        'dry_spell_frequency': {
+            'units': '1',
+            'long_name': f'Number of dry periods of {min_spell} day(s) or more, with daily precipitation '
+                         f'below {thresh}',
+            'description': f'The annual number of dry periods of {min_spell} day(s) or more, during which '
+                           f'daily precipitation is below {thresh}.',
+        },
+        'dry_spell_total_length': {
+            'units': 'days',
+            'long_name': f'Number of days in dry periods of {min_spell} day(s) or more, with daily '
+                         f'precipitation below {thresh}',
+            'description': f'The annual number of days in dry periods of {min_spell} day(s) or more, during '
+                           f'which daily precipitation is below {thresh}.',
+        },
+    }
+
+    indices = {}
+    for name in DRY_WET_STATS:
+        indices[name] = stats.sel(stat=name, drop=True)
+        indices[name].attrs = attrs[name]
+
+    return indices
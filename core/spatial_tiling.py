@@ -7,13 +7,27 @@ climate pipeline to reduce memory footprint through parallel tile processing.
 """
 
 import logging
+import math
+import shutil
+import tempfile
+import multiprocessing
 import threading
 from pathlib import Path
-from typing import Dict, List, Tuple
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional, Tuple, Union
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from itertools import product
 
+import numpy as np
 import xarray as xr
 import dask
+import psutil
+
+from core.config import PipelineConfig
+
+try:
+    import h5py  # backend of the h5netcdf engine
+except ImportError:
+    h5py = None
 
 logger = logging.getLogger(__name__)
 
@@ -21,13 +35,75 @@ logger = logging.getLogger(__name__)
 # HDF5/NetCDF4 backend is not fully thread-safe for concurrent writes
 netcdf_write_lock = threading.Lock()
 
+# NetCDF engine for tile files. h5netcdf releases the GIL during HDF5 I/O,
+# so other tiles keep computing while one is being written; netCDF4 is the
+# fallback where h5py is not installed.
+TILE_NETCDF_ENGINE = 'h5netcdf' if h5py is not None else 'netcdf4'
+
+# Supported executors for running tiles in parallel
+TILE_EXECUTORS = ('threads', 'processes', 'dask')
+
+# (lat_splits, lon_splits) grid for the named tile counts; larger powers of
+# two follow the same pattern (see tile_grid())
+TILE_SPLITS = {1: (1, 1), 2: (1, 2), 4: (2, 2), 8: (2, 4)}
+
+# Tile names in row-major (lat, lon) order for the named tile counts
+TILE_NAMES = {
+    1: ('full',),
+    2: ('west', 'east'),
+    4: ('northwest', 'northeast', 'southwest', 'southeast'),
+    8: ('nw1', 'nw2', 'ne1', 'ne2', 'sw1', 'sw2', 'se1', 'se2'),
+}
+
+# Supported on-disk formats for intermediate tile files
+TILE_FORMATS = ('netcdf', 'zarr')
+
+# Read each tile file back as a single chunk so chunk boundaries coincide
+# with tile boundaries and the merge concat needs no rechunking
+TILE_READ_CHUNKS = {'time': -1, 'lat': -1, 'lon': -1}
+
+# Lock types dropped on pickling and recreated in worker processes
+_LOCK_KINDS = {
+    type(threading.Lock()): 'lock',
+    type(threading.RLock()): 'rlock',
+}
+
+
+def tile_grid(n_tiles: int) -> Tuple[Tuple[int, int], Tuple[str, ...]]:
+    """
+    Tile grid shape and tile names for a power-of-two tile count.
+
+    Longitude gets the extra split when n_tiles is an odd power of two
+    (2 -> 1x2, 8 -> 2x4, 32 -> 4x8). Counts beyond 8 use row/column names
+    such as 'r0c3'.
+
+    Args:
+        n_tiles: Number of tiles (power of two)
+
+    Returns:
+        Tuple of ((lat_splits, lon_splits), tile names in row-major order)
+
+    Raises:
+        ValueError: If n_tiles is not a power of two
+    """
+    if n_tiles < 1 or n_tiles & (n_tiles - 1):
+        raise ValueError(f"n_tiles must be a power of two (1, 2, 4, 8, 16, ...), got {n_tiles}")
+
+    if n_tiles in TILE_SPLITS:
+        return TILE_SPLITS[n_tiles], TILE_NAMES[n_tiles]
+
+    exponent = n_tiles.bit_length() - 1
+    lat_splits, lon_splits = 2 ** (exponent // 2), 2 ** (exponent - exponent // 2)
+    names = tuple(f'r{i}c{j}' for i, j in product(range(lat_splits), range(lon_splits)))
+    return (lat_splits, lon_splits), names
+
 
 class SpatialTilingMixin:
     """
     Mixin to add spatial tiling capabilities to climate pipelines.
 
     Provides memory-efficient parallel processing by:
-    - Splitting spatial domain into tiles (2, 4, or 8 tiles)
+    - Splitting spatial domain into tiles (2, 4, 8, or any power of two)
     - Processing each tile independently in parallel
     - Merging results with proper coordinate handling
 
@@ -35,6 +111,26 @@ class SpatialTilingMixin:
     - 2 tiles: 50% memory reduction (east/west split)
     - 4 tiles: 75% memory reduction (2x2 quadrants)
     - 8 tiles: 87.5% memory reduction (2x4 or 4x2 grid)
+    - 16+ tiles: square-ish grids (4x4, 4x8, ...) for many-core nodes
+
+    Tiles run on a thread pool by default. With tile_executor='processes'
+    each tile runs in its own spawned process, so Python-level xclim work
+    and HDF5 writes are not serialized by the GIL or netcdf_write_lock;
+    the pipeline and dataset must then be picklable (locks are recreated
+    in the worker). With tile_executor='dask' all tile writes are built
+    lazily and submitted as one Dask graph, letting the scheduler share
+    reads and balance memory across tiles.
+
+    With in_memory_merge=True, pool-executed tiles are computed and merged
+    in memory instead of being written to and re-read from NetCDF; a tile
+    is spilled to disk only when available memory would not hold it.
+
+    Tile files only live until the merge, so they are written uncompressed
+    unless compress_tiles=True (compression there is wasted CPU). With
+    tile_format='zarr' tiles are written as Zarr stores, which need neither
+    HDF5 nor netcdf_write_lock. Combined
+    with tile_executor='dask', every tile writes its own region of a single
+    full-domain store, so no separate merge step is needed.
 
     Usage:
         class MyPipeline(BasePipeline, SpatialTilingMixin):
@@ -43,34 +139,85 @@ class SpatialTilingMixin:
                 SpatialTilingMixin.__init__(self, n_tiles=4)
     """
 
-    def __init__(self, n_tiles: int = 4):
+    def __init__(
+        self,
+        n_tiles: int = 4,
+        tile_executor: str = 'threads',
+        in_memory_merge: bool = False,
+        tile_format: str = 'netcdf',
+        compress_tiles: bool = False
+    ):
         """
         Initialize spatial tiling configuration.
 
         Args:
-            n_tiles: Number of spatial tiles (1, 2, 4, or 8)
+            n_tiles: Number of spatial tiles (a power of two)
                     1 = no tiling (process full domain, no parallelism)
                     2 = east/west split (2x1 grid)
                     4 = quadrants (2x2 grid)
                     8 = octants (2x4 or 4x2 grid)
+                    16, 32, ... = 4x4, 4x8, ... grids
+            tile_executor: 'threads' (default), 'processes', or 'dask'
+            in_memory_merge: Merge computed tiles in memory, spilling to
+                    NetCDF only under memory pressure (thread/process pools)
+            tile_format: Intermediate tile file format, 'netcdf' (default) or 'zarr'
+            compress_tiles: Compress intermediate tile files (off by default;
+                    only the final output needs compression)
         """
-        if n_tiles not in [1, 2, 4, 8]:
-            raise ValueError(f"n_tiles must be 1, 2, 4, or 8, got {n_tiles}")
+        split_shape, tile_order = tile_grid(n_tiles)
+        if tile_executor not in TILE_EXECUTORS:
+            raise ValueError(
+                f"tile_executor must be one of {TILE_EXECUTORS}, got {tile_executor!r}"
+            )
+        if tile_format not in TILE_FORMATS:
+            raise ValueError(
+                f"tile_format must be one of {TILE_FORMATS}, got {tile_format!r}"
+            )
 
         self.n_tiles = n_tiles
+        # Tile grid and concatenation order are fixed per instance
+        self._split_shape: Tuple[int, int] = split_shape
+        self._tile_order: Tuple[str, ...] = tile_order
+        self.tile_executor = tile_executor
+        self.in_memory_merge = in_memory_merge
+        self.tile_format = tile_format
+        self.compress_tiles = compress_tiles
         self.use_spatial_tiling = True
 
-        # Generate unique tile ID to prevent file collisions when multiple pipelines run concurrently
-        import os
-        import uuid
-        self._tile_id = f"{os.getpid()}_{uuid.uuid4().hex[:8]}"
+        # Set only in worker processes that receive an already-selected tile
+        self._presubset_tile = False
+
+        # Tile directories backing lazily merged results, removed by release_tile_files()
+        self._deferred_tile_dirs: List[tempfile.TemporaryDirectory] = []
+
+    def __getstate__(self):
+        """Drop thread locks so the pipeline can be sent to tile worker processes."""
+        state = self.__dict__.copy()
+        lock_attrs = {
+            name: _LOCK_KINDS[type(value)] for name, value in state.items()
+            if type(value) in _LOCK_KINDS
+        }
+        for name in lock_attrs:
+            state[name] = None
+        # Temporary tile directories stay owned by the parent process
+        state['_deferred_tile_dirs'] = []
+        state['_pickled_lock_attrs'] = lock_attrs
+        return state
+
+    def __setstate__(self, state):
+        """Recreate thread locks dropped by __getstate__."""
+        lock_attrs = state.pop('_pickled_lock_attrs', {})
+        self.__dict__.update(state)
+        for name, lock_kind in lock_attrs.items():
+            setattr(self, name, threading.RLock() if lock_kind == 'rlock' else threading.Lock())
 
     def _get_spatial_tiles(self, ds: xr.Dataset) -> List[Tuple[slice, slice, str]]:
         """
         Calculate spatial tile boundaries.
 
-        Splits the spatial domain into tiles with proper alignment.
-        Uses simple midpoint splitting to ensure equal-sized tiles.
+        Splits the spatial domain into a lat x lon grid (see tile_grid())
+        of near equal-sized tiles, aligned to Dask chunk edges when the
+        dataset is chunked.
 
         Args:
             ds: Dataset to tile
@@ -103,47 +250,136 @@ class SpatialTilingMixin:
         if len(lon_vals) == 0:
             raise ValueError("lon dimension is empty (size=0)")
 
-        lat_mid = len(lat_vals) // 2
-        lon_mid = len(lon_vals) // 2
+        lat_splits, lon_splits = self._split_shape
+        if lat_splits > len(lat_vals) or lon_splits > len(lon_vals):
+            raise ValueError(
+                f"Cannot split {len(lat_vals)}x{len(lon_vals)} lat/lon grid into "
+                f"{lat_splits}x{lon_splits} tiles"
+            )
 
-        if self.n_tiles == 1:
-            # No tiling - process full domain (no parallelism)
-            tiles = [
-                (slice(None), slice(None), "full")
-            ]
-        elif self.n_tiles == 2:
-            # Split east-west (2x1 grid)
-            tiles = [
-                (slice(None), slice(0, lon_mid), "west"),
-                (slice(None), slice(lon_mid, None), "east")
-            ]
-        elif self.n_tiles == 4:
-            # Split into quadrants (2x2 grid)
-            tiles = [
-                (slice(0, lat_mid), slice(0, lon_mid), "northwest"),
-                (slice(0, lat_mid), slice(lon_mid, None), "northeast"),
-                (slice(lat_mid, None), slice(0, lon_mid), "southwest"),
-                (slice(lat_mid, None), slice(lon_mid, None), "southeast")
-            ]
-        elif self.n_tiles == 8:
-            # Split into octants (2x4 grid - longitude heavy)
-            lon_quarter = len(lon_vals) // 4
-            tiles = [
-                (slice(0, lat_mid), slice(0, lon_quarter), "nw1"),
-                (slice(0, lat_mid), slice(lon_quarter, 2*lon_quarter), "nw2"),
-                (slice(0, lat_mid), slice(2*lon_quarter, 3*lon_quarter), "ne1"),
-                (slice(0, lat_mid), slice(3*lon_quarter, None), "ne2"),
-                (slice(lat_mid, None), slice(0, lon_quarter), "sw1"),
-                (slice(lat_mid, None), slice(lon_quarter, 2*lon_quarter), "sw2"),
-                (slice(lat_mid, None), slice(2*lon_quarter, 3*lon_quarter), "se1"),
-                (slice(lat_mid, None), slice(3*lon_quarter, None), "se2")
-            ]
-        else:
-            raise ValueError(f"Unsupported n_tiles: {self.n_tiles}")
+        try:
+            dim_chunks = ds.chunks
+        except ValueError:
+            # Variables chunked inconsistently - fall back to plain splits
+            dim_chunks = {}
+
+        lat_ranges = self._split_dimension(len(lat_vals), lat_splits, dim_chunks.get('lat'))
+        lon_ranges = self._split_dimension(len(lon_vals), lon_splits, dim_chunks.get('lon'))
+
+        tiles = [
+            (lat_slice, lon_slice, tile_name)
+            for (lat_slice, lon_slice), tile_name in zip(
+                product(lat_ranges, lon_ranges), self._tile_order
+            )
+        ]
 
         logger.info(f"Created {len(tiles)} spatial tiles")
         return tiles
 
+    @staticmethod
+    def _split_dimension(
+        size: int,
+        n_splits: int,
+        chunks: Optional[Tuple[int, ...]] = None
+    ) -> List[slice]:
+        """
+        Split a dimension into contiguous slices.
+
+        Split points are multiples of size // n_splits. When the dimension is
+        Dask-chunked, each split point is snapped to the nearest chunk edge so
+        every tile reads whole chunks; snapping is skipped if it would merge
+        two tiles.
+
+        Args:
+            size: Length of the dimension
+            n_splits: Number of slices
+            chunks: Dask chunk sizes along the dimension, if any
+
+        Returns:
+            List of n_splits slices covering the dimension
+        """
+        if n_splits == 1:
+            return [slice(None)]
+
+        points = np.arange(1, n_splits) * (size // n_splits)
+
+        if chunks is not None and len(chunks) > 1:
+            edges = np.cumsum(chunks)[:-1]
+            snapped = edges[np.abs(edges[None, :] - points[:, None]).argmin(axis=1)]
+            if np.all(np.diff(snapped) > 0):
+                points = snapped
+
+        bounds = [0, *points.tolist(), None]
+        return [slice(start, stop) for start, stop in zip(bounds[:-1], bounds[1:])]
+
+    def _select_tile(self, ds: xr.Dataset, lat_slice: slice, lon_slice: slice) -> xr.Dataset:
+        """
+        Select a tile's spatial subset.
+
+        In tile worker processes the dataset already is the tile (see
+        _tile_worker_input), so it is returned unchanged.
+
+        Args:
+            ds: Full dataset, or the pre-selected tile in a worker process
+            lat_slice: Latitude slice for this tile
+            lon_slice: Longitude slice for this tile
+
+        Returns:
+            Tile dataset
+        """
+        if self._presubset_tile:
+            return ds
+        return ds.isel(lat=lat_slice, lon=lon_slice)
+
+    @staticmethod
+    def _tile_worker_input(ds: xr.Dataset, lat_slice: slice, lon_slice: slice) -> xr.Dataset:
+        """
+        Subset a dataset for a tile worker process.
+
+        The Dask graph is culled to the tile's chunks, so each process is sent
+        (and reads) only its own part of the domain instead of the full dataset.
+
+        Args:
+            ds: Full dataset
+            lat_slice: Latitude slice for this tile
+            lon_slice: Longitude slice for this tile
+
+        Returns:
+            Tile dataset with an optimized graph
+        """
+        (tile_ds,) = dask.optimize(ds.isel(lat=lat_slice, lon=lon_slice))
+        return tile_ds
+
+    def _run_presubset_tile(
+        self,
+        process_tile_name: str,
+        tile_ds: xr.Dataset,
+        lat_slice: slice,
+        lon_slice: slice,
+        tile_name: str,
+        output_dir: Path
+    ) -> Union[Path, xr.Dataset]:
+        """
+        Process a tile that was subset before being sent to a worker process.
+
+        Runs on this process's private copy of the pipeline, so marking it
+        as pre-subset does not affect the parent.
+
+        Args:
+            process_tile_name: '_process_and_save_tile' or '_process_and_keep_tile'
+            tile_ds: Tile dataset from _tile_worker_input()
+            lat_slice: Latitude slice for this tile (for baseline subsetting)
+            lon_slice: Longitude slice for this tile (for baseline subsetting)
+            tile_name: Name of this tile
+            output_dir: Directory to save tile files
+
+        Returns:
+            Result of the tile processing method
+        """
+        self._presubset_tile = True
+        process_tile = getattr(self, process_tile_name)
+        return process_tile(tile_ds, lat_slice, lon_slice, tile_name, output_dir)
+
     def _process_single_tile(
         self,
         ds: xr.Dataset,
@@ -174,7 +410,7 @@ class SpatialTilingMixin:
         logger.info(f"  Processing tile: {tile_name}")
 
         # Select spatial subset
-        tile_ds = ds.isel(lat=lat_slice, lon=lon_slice)
+        tile_ds = self._select_tile(ds, lat_slice, lon_slice)
 
         # Calculate indices for this tile
         # Subclasses should override this method if they need to pass
@@ -183,6 +419,68 @@ class SpatialTilingMixin:
 
         return tile_indices
 
+    def _prepare_tile_dataset(self, tile_indices: Dict[str, xr.DataArray]) -> xr.Dataset:
+        """
+        Combine a tile's indices into a dataset ready to be written.
+
+        xclim often returns float64 even for float32 inputs; index values
+        carry far less precision than that, so float64 indices are
+        downcast to float32 to halve tile memory, disk and I/O.
+
+        Index-specific fixes (fix_count_indices) are metadata-only and are
+        applied once to the merged dataset in _finalize_merge, not per tile.
+
+        Args:
+            tile_indices: Dictionary of calculated indices
+
+        Returns:
+            Tile dataset with float64 indices stored as float32
+        """
+        tile_ds = xr.Dataset(tile_indices)
+
+        for var_name, da in tile_ds.data_vars.items():
+            if da.dtype == np.float64:
+                tile_ds[var_name] = da.astype(np.float32)
+
+        return tile_ds
+
+    def _tile_file_path(self, tile_name: str, output_dir: Path) -> Path:
+        """Tile file path (output_dir is the run's private tile directory)."""
+        suffix = '.zarr' if self.tile_format == 'zarr' else '.nc'
+        return output_dir / f'tile_{tile_name}{suffix}'
+
+    def _tile_encoding(self, tile_ds: xr.Dataset) -> Dict[str, Dict]:
+        """Compression settings for every variable in a NetCDF tile file."""
+        if not self.compress_tiles:
+            compression = {'zlib': False}
+        elif TILE_NETCDF_ENGINE == 'netcdf4':
+            compression = PipelineConfig.NETCDF_COMPRESSION
+        else:
+            # h5netcdf only knows HDF5's built-in filters
+            compression = {'zlib': True, 'complevel': 4}
+        return {var_name: dict(compression) for var_name in tile_ds.data_vars}
+
+    def _zarr_compression(self) -> Dict:
+        """Zarr encoding entry for tile compression (Zarr's default codec, or none)."""
+        return {} if self.compress_tiles else {'compressors': None}
+
+    def _write_tile_zarr(self, tile_ds: xr.Dataset, tile_file: Path, compute: bool = True):
+        """
+        Write a tile to a Zarr store (uncompressed unless compress_tiles).
+
+        Args:
+            tile_ds: Tile dataset (lazy or computed)
+            tile_file: Path of the Zarr store directory
+            compute: Write immediately, or return a delayed write
+
+        Returns:
+            Delayed write when compute is False, otherwise None
+        """
+        encoding = {var_name: self._zarr_compression() for var_name in tile_ds.data_vars}
+        return tile_ds.to_zarr(
+            tile_file, mode='w', consolidated=False, encoding=encoding, compute=compute
+        )
+
     def _save_tile(
         self,
         tile_indices: Dict[str, xr.DataArray],
@@ -190,7 +488,7 @@ class SpatialTilingMixin:
         output_dir: Path
     ) -> Path:
         """
-        Save a tile to NetCDF with thread-safe file writing.
+        Save a tile to NetCDF (serialized by netcdf_write_lock) or Zarr.
 
         Args:
             tile_indices: Dictionary of calculated indices
@@ -200,44 +498,62 @@ class SpatialTilingMixin:
         Returns:
             Path to saved tile file
         """
-        tile_ds = xr.Dataset(tile_indices)
-
-        # Apply any index-specific fixes (e.g., count indices for temperature)
-        if hasattr(self, 'fix_count_indices'):
-            tile_ds = self.fix_count_indices(tile_ds)
-
-        # Use unique tile ID to prevent file collisions between concurrent pipeline runs
-        tile_file = output_dir / f'tile_{self._tile_id}_{tile_name}.nc'
+        tile_ds = self._prepare_tile_dataset(tile_indices)
+        tile_file = self._tile_file_path(tile_name, output_dir)
         logger.info(f"  Saving tile {tile_name} to {tile_file}...")
 
-        # Compute dataset before NetCDF write to avoid Dask scheduler thread safety issues
-        # dask.config.set() is not thread-safe in parallel contexts
-        tile_ds_computed = tile_ds.compute()
-
-        # Thread-safe NetCDF write (HDF5 library limitation)
-        with netcdf_write_lock:
-            encoding = {}
-            for var_name in tile_ds_computed.data_vars:
-                encoding[var_name] = {
-                    'zlib': True,
-                    'complevel': 4
-                }
+        if self.tile_format == 'zarr':
+            # Zarr writes chunks independently, so no global write lock is needed
             try:
-                tile_ds_computed.to_netcdf(tile_file, engine='netcdf4', encoding=encoding)
+                self._write_tile_zarr(tile_ds, tile_file)
             except OSError as e:
                 logger.error(f"Failed to write tile {tile_name}: {e}")
-                # Clean up partial file
-                if tile_file.exists():
-                    tile_file.unlink()
+                shutil.rmtree(tile_file, ignore_errors=True)
                 raise RuntimeError(f"Disk space exhaustion or I/O error writing {tile_file}: {e}") from e
+            del tile_indices, tile_ds
+            return tile_file
+
+        try:
+            if TILE_NETCDF_ENGINE == 'netcdf4':
+                # netCDF4 file creation and sync run outside xarray's HDF5 lock, so
+                # they must not overlap another tile's chunk writes (the netCDF-C
+                # library is not thread-safe): compute the tile concurrently, then
+                # create and write the file entirely under the global lock
+                tile_ds = tile_ds.compute()
+                with netcdf_write_lock:
+                    tile_ds.to_netcdf(
+                        tile_file,
+                        engine=TILE_NETCDF_ENGINE,
+                        encoding=self._tile_encoding(tile_ds)
+                    )
+            else:
+                # Create the file under the global lock, but defer the data: the
+                # delayed write streams computed chunks straight to disk instead
+                # of materializing the whole tile first. h5py serializes all HDF5
+                # calls, and xarray's HDF5 lock the chunk writes themselves.
+                with netcdf_write_lock:
+                    delayed_write = tile_ds.to_netcdf(
+                        tile_file,
+                        engine=TILE_NETCDF_ENGINE,
+                        encoding=self._tile_encoding(tile_ds),
+                        compute=False
+                    )
+                delayed_write.compute()
+                del delayed_write
+        except OSError as e:
+            logger.error(f"Failed to write tile {tile_name}: {e}")
+            # Clean up partial file
+            if tile_file.exists():
+                tile_file.unlink()
+            raise RuntimeError(f"Disk space exhaustion or I/O error writing {tile_file}: {e}") from e
 
         # Free memory
-        del tile_indices, tile_ds, tile_ds_computed
+        del tile_indices, tile_ds
         return tile_file
 
     def _merge_tiles(
         self,
-        tile_files: List[Path],
+        tile_files: List[Union[Path, xr.Dataset]],
         expected_dims: Dict[str, int]
     ) -> xr.Dataset:
         """
@@ -247,7 +563,8 @@ class SpatialTilingMixin:
         Uses lazy loading to avoid loading all tiles into memory at once.
 
         Args:
-            tile_files: List of tile file paths (in correct order for concatenation)
+            tile_files: List of tile file paths or in-memory tile datasets
+                        (in correct order for concatenation)
             expected_dims: Expected final dimensions (for validation)
 
         Returns:
@@ -258,35 +575,82 @@ class SpatialTilingMixin:
         """
         logger.info(f"Merging {len(tile_files)} tile files...")
 
-        # Load tile datasets lazily
-        tile_datasets = [xr.open_dataset(f, chunks='auto') for f in tile_files]
-
-        # Concatenate based on number of tiles
-        if self.n_tiles == 1:
-            # Single tile - no merging needed
-            merged_ds = tile_datasets[0]
-        elif self.n_tiles == 2:
-            # West + East (lon concatenation)
-            merged_ds = xr.concat(tile_datasets, dim='lon')
-
-        elif self.n_tiles == 4:
-            # Quadrants: (NW + NE = North), (SW + SE = South), then North + South
-            north = xr.concat([tile_datasets[0], tile_datasets[1]], dim='lon')
-            south = xr.concat([tile_datasets[2], tile_datasets[3]], dim='lon')
-            merged_ds = xr.concat([north, south], dim='lat')
-
-        elif self.n_tiles == 8:
-            # Octants: 4 pairs in lon direction, then 2 pairs in lat direction
-            north1 = xr.concat([tile_datasets[0], tile_datasets[1]], dim='lon')
-            north2 = xr.concat([tile_datasets[2], tile_datasets[3]], dim='lon')
-            south1 = xr.concat([tile_datasets[4], tile_datasets[5]], dim='lon')
-            south2 = xr.concat([tile_datasets[6], tile_datasets[7]], dim='lon')
-            north = xr.concat([north1, north2], dim='lon')
-            south = xr.concat([south1, south2], dim='lon')
-            merged_ds = xr.concat([north, south], dim='lat')
+        if all(isinstance(f, Path) and f.suffix != '.zarr' for f in tile_files):
+            # All tiles spilled to NetCDF: open them concurrently as one graph
+            combined = xr.open_mfdataset(
+                self._tile_grid(tile_files),
+                combine='nested',
+                concat_dim=['lat', 'lon'],
+                combine_attrs='override',
+                parallel=True,
+                engine=TILE_NETCDF_ENGINE,
+                chunks=TILE_READ_CHUNKS,
+                decode_timedelta=False
+            )
+            tile_datasets = [combined]
         else:
-            raise ValueError(f"Unsupported n_tiles: {self.n_tiles}")
+            # Load spilled tile datasets lazily; in-memory tiles are used as-is
+            tile_datasets = [
+                f if isinstance(f, xr.Dataset) else self._open_tile_file(f)
+                for f in tile_files
+            ]
+            combined = self._concat_tiles(tile_datasets)
+
+        merged_ds = self._finalize_merge(combined, expected_dims)
+
+        # Clean up tile datasets
+        for tile_ds in tile_datasets:
+            try:
+                tile_ds.close()
+            except Exception as e:
+                logger.warning(f"Failed to close tile dataset: {e}")
+
+        return merged_ds
+
+    def _concat_tiles(self, tiles: List[xr.Dataset]) -> xr.Dataset:
+        """
+        Concatenate tile datasets (in _get_ordered_tile_files order) into one.
 
+        Args:
+            tiles: Tile datasets in concatenation order
+
+        Returns:
+            Concatenated dataset
+        """
+        # Arrange tiles as a (lat, lon) grid and combine in one pass
+        merged_ds = xr.combine_nested(
+            self._tile_grid(tiles), concat_dim=['lat', 'lon'], combine_attrs='override'
+        )
+
+        return merged_ds
+
+    def _tile_grid(self, tiles: list) -> List[list]:
+        """
+        Arrange tiles (in _get_ordered_tile_files order) as nested lat rows.
+
+        Args:
+            tiles: Tile datasets or file paths in concatenation order
+
+        Returns:
+            List of rows, one per latitude band, each ordered west to east
+        """
+        lat_splits, lon_splits = self._split_shape
+        return [tiles[i * lon_splits:(i + 1) * lon_splits] for i in range(lat_splits)]
+
+    def _finalize_merge(self, merged_ds: xr.Dataset, expected_dims: Dict[str, int]) -> xr.Dataset:
+        """
+        Validate merged dimensions and apply final fixes.
+
+        Args:
+            merged_ds: Merged dataset
+            expected_dims: Expected final dimensions (for validation)
+
+        Returns:
+            Validated merged dataset
+
+        Raises:
+            ValueError: If dimensions don't match expected values
+        """
         # Validate dimensions after merge
         actual_dims = dict(merged_ds.dims)
         if actual_dims != expected_dims:
@@ -299,53 +663,151 @@ class SpatialTilingMixin:
 
         logger.info(f"  Successfully merged to dimensions: {actual_dims}")
 
-        # Apply any final fixes
+        # Apply index-specific fixes (e.g., count indices for temperature)
+        # once, on the merged result
         if hasattr(self, 'fix_count_indices'):
             merged_ds = self.fix_count_indices(merged_ds)
 
-        # Clean up tile datasets
-        for tile_ds in tile_datasets:
-            try:
-                tile_ds.close()
-            except Exception as e:
-                logger.warning(f"Failed to close tile dataset: {e}")
-
         return merged_ds
 
+    @staticmethod
+    def _open_tile_file(tile_file: Path, chunks: Optional[dict] = None) -> xr.Dataset:
+        """
+        Open a NetCDF or Zarr tile file lazily.
+
+        Args:
+            tile_file: Tile file path or Zarr store directory
+            chunks: Dask chunks to open with (default: one chunk per tile)
+
+        Returns:
+            Lazily loaded tile dataset (count indices with units='days' stay
+            numeric; they are fixed after the merge)
+        """
+        if chunks is None:
+            chunks = TILE_READ_CHUNKS
+        if tile_file.suffix == '.zarr':
+            return xr.open_zarr(tile_file, chunks=chunks, consolidated=False, decode_timedelta=False)
+        return xr.open_dataset(
+            tile_file, chunks=chunks, engine=TILE_NETCDF_ENGINE, decode_timedelta=False
+        )
+
     def _cleanup_tile_files(self, tile_files: List[Path]):
         """
         Delete temporary tile files.
 
         Args:
-            tile_files: List of tile file paths to delete
+            tile_files: List of tile file paths (or Zarr store directories) to delete
         """
         for tile_file in tile_files:
             try:
-                tile_file.unlink()
+                if tile_file.is_dir():
+                    shutil.rmtree(tile_file)
+                else:
+                    tile_file.unlink()
                 logger.debug(f"  Cleaned up {tile_file}")
             except Exception as e:
                 logger.warning(f"Failed to delete tile file {tile_file}: {e}")
 
+    def _should_spill_tile(self, tile_ds: xr.Dataset) -> bool:
+        """
+        Decide whether a tile must be written to disk instead of kept in memory.
+
+        Available memory must hold this tile plus the merged result
+        (roughly n_tiles tiles) before the tile is kept in memory.
+
+        Args:
+            tile_ds: Lazy tile dataset
+
+        Returns:
+            True if the tile should be spilled to NetCDF
+        """
+        required = tile_ds.nbytes * (self.n_tiles + 1)
+        return psutil.virtual_memory().available < required
+
+    def _process_and_keep_tile(
+        self,
+        ds: xr.Dataset,
+        lat_slice: slice,
+        lon_slice: slice,
+        tile_name: str,
+        output_dir: Path
+    ) -> Union[Path, xr.Dataset]:
+        """
+        Process a tile and keep the computed result in memory.
+
+        Falls back to _save_tile when memory is too low to hold the tile.
+
+        Args:
+            ds: Full dataset
+            lat_slice: Latitude slice for this tile
+            lon_slice: Longitude slice for this tile
+            tile_name: Name of this tile
+            output_dir: Directory to save the tile if it has to be spilled
+
+        Returns:
+            Computed tile dataset, or path to the spilled tile file
+        """
+        tile_indices = self._process_single_tile(ds, lat_slice, lon_slice, tile_name)
+        tile_ds = self._prepare_tile_dataset(tile_indices)
+
+        if self._should_spill_tile(tile_ds):
+            logger.warning(f"  Low memory: spilling tile {tile_name} to disk")
+            return self._save_tile(tile_indices, tile_name, output_dir)
+
+        return tile_ds.compute()
+
+    def _process_and_save_tile(
+        self,
+        ds: xr.Dataset,
+        lat_slice: slice,
+        lon_slice: slice,
+        tile_name: str,
+        output_dir: Path
+    ) -> Path:
+        """
+        Process a single tile and save it to disk.
+
+        Runs inside a tile worker thread or process.
+
+        Args:
+            ds: Full dataset
+            lat_slice: Latitude slice for this tile
+            lon_slice: Longitude slice for this tile
+            tile_name: Name of this tile
+            output_dir: Directory to save tile files
+
+        Returns:
+            Path to saved tile file
+        """
+        tile_indices = self._process_single_tile(ds, lat_slice, lon_slice, tile_name)
+        return self._save_tile(tile_indices, tile_name, output_dir)
+
     def process_with_spatial_tiling(
         self,
         ds: xr.Dataset,
         output_dir: Path,
-        expected_dims: Dict[str, int]
+        expected_dims: Dict[str, int],
+        defer_cleanup: bool = False
     ) -> Dict[str, xr.DataArray]:
         """
         Process dataset using spatial tiling.
 
         Main workflow:
         1. Split dataset into spatial tiles
-        2. Process each tile in parallel using ThreadPoolExecutor
-        3. Save each tile immediately (memory efficient)
+        2. Process each tile in parallel (thread pool, process pool, or one Dask graph)
+        3. Save each tile immediately (memory efficient) to a temporary
+           directory private to this call
         4. Merge tiles back together
-        5. Clean up temporary tile files
+        5. Remove the temporary tile directory
 
         Args:
             ds: Dataset to process
-            output_dir: Directory for temporary tile files
+            output_dir: Directory in which the temporary tile directory is created
             expected_dims: Expected final dimensions for validation
+            defer_cleanup: Return lazy Dask-backed indices that still read from
+                    the tile files instead of computing the merged dataset.
+                    The caller must call release_tile_files() once the
+                    indices have been written.
 
         Returns:
             Dictionary of calculated indices (merged from all tiles)
@@ -355,54 +817,48 @@ class SpatialTilingMixin:
         # Calculate tile boundaries
         tiles = self._get_spatial_tiles(ds)
 
-        # Process and save tiles in parallel
-        tile_files_dict = {}
-        tile_files_lock = threading.Lock()
-
-        def process_and_save_tile_wrapper(tile_info):
-            """Process and save a single tile (thread-safe)."""
-            lat_slice, lon_slice, tile_name = tile_info
-
-            # Process tile
-            tile_indices = self._process_single_tile(ds, lat_slice, lon_slice, tile_name)
-
-            # Save tile
-            tile_file = self._save_tile(tile_indices, tile_name, output_dir)
-
-            # Store result in dict (thread-safe)
-            with tile_files_lock:
-                tile_files_dict[tile_name] = tile_file
-
-            return tile_file
+        # A private directory per call keeps concurrent runs apart, and is removed
+        # by TemporaryDirectory's finalizer even if cleanup is never reached
+        tile_tmpdir = tempfile.TemporaryDirectory(prefix='tiles_', dir=output_dir)
+        tile_dir = Path(tile_tmpdir.name)
 
-        # Execute in parallel
-        with ThreadPoolExecutor(max_workers=self.n_tiles) as executor:
-            future_to_tile = {
-                executor.submit(process_and_save_tile_wrapper, tile): tile
-                for tile in tiles
-            }
-
-            for future in as_completed(future_to_tile):
-                tile_info = future_to_tile[future]
-                tile_name = tile_info[2]
-                try:
-                    future.result()
-                    logger.info(f"  ✓ Tile {tile_name} completed successfully")
-                except Exception as e:
-                    logger.error(f"  ✗ Tile {tile_name} failed: {e}")
-                    raise
-
-        # Verify we have all tiles
-        if len(tile_files_dict) != self.n_tiles:
-            raise ValueError(
-                f"Expected {self.n_tiles} tile files, but got {len(tile_files_dict)}"
-            )
-
-        # Build tile_files list in correct order for concatenation
-        tile_files = self._get_ordered_tile_files(tile_files_dict)
-
-        # Merge tiles
-        merged_ds = self._merge_tiles(tile_files, expected_dims)
+        try:
+            if self.tile_executor == 'dask' and self.tile_format == 'zarr':
+                # Tiles are written straight into one store, so there is nothing to merge
+                merged_store = self._write_tiles_to_shared_zarr(ds, tiles, tile_dir)
+                tile_files = [merged_store]
+                merged_ds = self._finalize_merge(
+                    # Store chunks already follow the tile boundaries
+                    self._open_tile_file(merged_store, chunks={}), expected_dims
+                )
+            else:
+                # Process and save tiles in parallel
+                if self.tile_executor == 'dask':
+                    tile_files_dict = self._write_tiles_as_dask_graph(ds, tiles, tile_dir)
+                else:
+                    tile_files_dict = self._write_tiles_with_executor(ds, tiles, tile_dir)
+
+                # Verify we have all tiles
+                missing = [name for name in self._tile_order if tile_files_dict.get(name) is None]
+                if missing:
+                    raise ValueError(
+                        f"Expected {self.n_tiles} tile files, but {len(missing)} are missing: {missing}"
+                    )
+
+                # Build tile_files list in correct order for concatenation
+                # (entries are file paths, or datasets for tiles merged in memory)
+                tile_files = self._get_ordered_tile_files(tile_files_dict)
+
+                # Merge tiles
+                merged_ds = self._merge_tiles(tile_files, expected_dims)
+        except BaseException:
+            tile_tmpdir.cleanup()
+            raise
+
+        if defer_cleanup:
+            # Keep the merged result lazy; tiles are deleted after the caller writes it
+            self._deferred_tile_dirs.append(tile_tmpdir)
+            return {var: merged_ds[var] for var in merged_ds.data_vars}
 
         # Compute merged dataset to materialize data before tile cleanup
         # Without this, lazy-loaded arrays will be inaccessible after tile deletion
@@ -410,7 +866,7 @@ class SpatialTilingMixin:
         merged_ds_computed = merged_ds.compute()
 
         # Clean up tile files (safe now that data is materialized)
-        self._cleanup_tile_files(tile_files)
+        tile_tmpdir.cleanup()
 
         # Extract indices as dictionary
         all_indices = {var: merged_ds_computed[var] for var in merged_ds_computed.data_vars}
@@ -425,33 +881,296 @@ class SpatialTilingMixin:
 
         return all_indices
 
-    def _get_ordered_tile_files(self, tile_files_dict: Dict[str, Path]) -> List[Path]:
+    def release_tile_files(self):
+        """
+        Delete tile files kept alive by process_with_spatial_tiling(defer_cleanup=True).
+
+        Safe to call when nothing is pending.
+        """
+        for tile_tmpdir in self.take_tile_files():
+            tile_tmpdir.cleanup()
+
+    def take_tile_files(self) -> List[tempfile.TemporaryDirectory]:
+        """
+        Take over the tile files kept alive by process_with_spatial_tiling(defer_cleanup=True).
+
+        The caller deletes them (cleanup()) once the lazily merged indices
+        are written, e.g. in a background write while the next temporal
+        chunk already creates its own tiles.
+
+        Returns:
+            Pending tile directories (no longer tracked by the mixin)
+        """
+        tile_dirs, self._deferred_tile_dirs = self._deferred_tile_dirs, []
+        return tile_dirs
+
+    def _max_inflight_tiles(self, ds: xr.Dataset) -> int:
+        """
+        Number of tiles that can be processed at once within available memory.
+
+        Each tile's working set is estimated as its share of the input times
+        PipelineConfig.TILE_MEMORY_INFLATION; tiles beyond the limit wait in
+        the executor queue, so peak memory does not grow with n_tiles.
+
+        Args:
+            ds: Full dataset
+
+        Returns:
+            Maximum number of concurrent tiles (1 to n_tiles)
+        """
+        tile_bytes = ds.nbytes / self.n_tiles * PipelineConfig.TILE_MEMORY_INFLATION
+        if tile_bytes <= 0:
+            return self.n_tiles
+
+        budget = psutil.virtual_memory().available * PipelineConfig.TILE_MEMORY_FRACTION
+        return max(1, min(self.n_tiles, int(budget // tile_bytes)))
+
+    def _log_completed_rows(
+        self,
+        tile_files_dict: Dict[str, Optional[Union[Path, xr.Dataset]]],
+        just_done: set,
+        future_to_tile: Dict
+    ):
+        """Log each lat row of tiles whose last tile has just completed."""
+        _, lon_splits = self._split_shape
+        just_done_names = {future_to_tile[future] for future in just_done}
+        for row_start in range(0, self.n_tiles, lon_splits):
+            row = self._tile_order[row_start:row_start + lon_splits]
+            if just_done_names.intersection(row) and all(tile_files_dict[name] is not None for name in row):
+                logger.info(f"  Tile row {row_start // lon_splits} complete ({', '.join(row)})")
+
+    def _write_tiles_with_executor(
+        self,
+        ds: xr.Dataset,
+        tiles: List[Tuple[slice, slice, str]],
+        output_dir: Path
+    ) -> Dict[str, Union[Path, xr.Dataset]]:
+        """
+        Process and save tiles in parallel on a thread or process pool.
+
+        Args:
+            ds: Full dataset
+            tiles: Tile definitions from _get_spatial_tiles()
+            output_dir: Directory to save tile files
+
+        Returns:
+            Dictionary mapping tile name to tile file path (or to the computed
+            tile dataset when in_memory_merge is enabled)
+        """
+        # Pre-sized in concatenation order; each tile fills only its own slot
+        tile_files_dict = dict.fromkeys(self._tile_order)
+
+        # All tiles are submitted; those beyond max_inflight queue in the executor
+        max_inflight = self._max_inflight_tiles(ds)
+        logger.info(
+            f"  Running up to {max_inflight} of {self.n_tiles} tiles concurrently "
+            f"(~{ds.nbytes / self.n_tiles / 1024**2:.0f} MB input per tile)"
+        )
+
+        if self.tile_executor == 'processes':
+            # Spawn (not fork): forking a process that holds HDF5/Dask thread state is unsafe
+            executor = ProcessPoolExecutor(
+                max_workers=max_inflight,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=PipelineConfig.setup_jit_caching
+            )
+        else:
+            executor = ThreadPoolExecutor(max_workers=max_inflight)
+
+        process_tile_name = '_process_and_keep_tile' if self.in_memory_merge else '_process_and_save_tile'
+
+        def submit_tile(lat_slice, lon_slice, tile_name):
+            if self.tile_executor == 'processes':
+                # Send each process only its own tile rather than the full dataset
+                return executor.submit(
+                    self._run_presubset_tile, process_tile_name,
+                    self._tile_worker_input(ds, lat_slice, lon_slice),
+                    lat_slice, lon_slice, tile_name, output_dir
+                )
+            return executor.submit(
+                getattr(self, process_tile_name), ds, lat_slice, lon_slice, tile_name, output_dir
+            )
+
+        # Execute in parallel
+        with executor:
+            future_to_tile = {
+                submit_tile(lat_slice, lon_slice, tile_name): tile_name
+                for lat_slice, lon_slice, tile_name in tiles
+            }
+            pending = set(future_to_tile)
+            try:
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    failure = None
+                    for future in done:
+                        tile_name = future_to_tile[future]
+                        error = future.exception()
+                        if error is None:
+                            tile_files_dict[tile_name] = future.result()
+                            logger.info(f"  ✓ Tile {tile_name} completed successfully")
+                        else:
+                            logger.error(f"  ✗ Tile {tile_name} failed: {error}")
+                            failure = failure or error
+                    if failure is not None:
+                        raise failure
+                    self._log_completed_rows(tile_files_dict, done, future_to_tile)
+            except Exception:
+                # Fail fast: drop queued tiles, let running ones finish, then
+                # remove every tile file written so far
+                for future in pending:
+                    future.cancel()
+                wait(pending)
+                for future in pending:
+                    if not future.cancelled() and future.exception() is None:
+                        tile_files_dict[future_to_tile[future]] = future.result()
+                self._cleanup_tile_files([
+                    f for f in tile_files_dict.values() if isinstance(f, Path) and f.exists()
+                ])
+                raise
+
+        return tile_files_dict
+
+    def _write_tiles_as_dask_graph(
+        self,
+        ds: xr.Dataset,
+        tiles: List[Tuple[slice, slice, str]],
+        output_dir: Path
+    ) -> Dict[str, Path]:
+        """
+        Compute and write all tiles as a single Dask graph.
+
+        Each tile's indices are built lazily and turned into a delayed NetCDF
+        write; one dask.compute() call then runs every write, so the
+        scheduler can co-schedule tiles, share reads of the input, and apply
+        any user-configured scheduler. xarray serializes the HDF5 writes
+        internally, so netcdf_write_lock is not needed here.
+
+        Args:
+            ds: Full dataset
+            tiles: Tile definitions from _get_spatial_tiles()
+            output_dir: Directory to save tile files
+
+        Returns:
+            Dictionary mapping tile name to tile file path
+        """
+        tile_files_dict = {}
+        delayed_writes = []
+
+        for lat_slice, lon_slice, tile_name in tiles:
+            tile_indices = self._process_single_tile(ds, lat_slice, lon_slice, tile_name)
+            tile_ds = self._prepare_tile_dataset(tile_indices)
+            tile_file = self._tile_file_path(tile_name, output_dir)
+
+            delayed_writes.append(tile_ds.to_netcdf(
+                tile_file,
+                engine=TILE_NETCDF_ENGINE,
+                encoding=self._tile_encoding(tile_ds),
+                compute=False
+            ))
+            tile_files_dict[tile_name] = tile_file
+
+        logger.info(f"  Computing {len(delayed_writes)} tiles as one Dask graph...")
+        try:
+            dask.compute(*delayed_writes)
+        except OSError as e:
+            logger.error(f"Failed to write tiles: {e}")
+            self._cleanup_tile_files([f for f in tile_files_dict.values() if f.exists()])
+            raise RuntimeError(
+                f"Disk space exhaustion or I/O error writing tiles to {output_dir}: {e}"
+            ) from e
+
+        return tile_files_dict
+
+    @staticmethod
+    def _tile_region(tile_slice: slice, size: int) -> slice:
+        """Explicit start/stop slice for a tile along a dimension of the given size."""
+        start, stop, _ = tile_slice.indices(size)
+        return slice(start, stop)
+
+    def _write_tiles_to_shared_zarr(
+        self,
+        ds: xr.Dataset,
+        tiles: List[Tuple[slice, slice, str]],
+        output_dir: Path
+    ) -> Path:
+        """
+        Write every tile directly into its region of one full-domain Zarr store.
+
+        The store is created from the lazily combined tiles (metadata and
+        coordinates only), then each tile writes its own lat/lon region. Zarr
+        chunks are sized so that no chunk spans two tiles, letting all region
+        writes run concurrently in one dask.compute() without locks, and the
+        result needs no separate merge step.
+
+        Args:
+            ds: Full dataset
+            tiles: Tile definitions from _get_spatial_tiles()
+            output_dir: Directory for the shared store
+
+        Returns:
+            Path to the assembled Zarr store
+        """
+        sizes = {'lat': ds.sizes['lat'], 'lon': ds.sizes['lon']}
+        tile_datasets = {}
+        regions = {}
+        for lat_slice, lon_slice, tile_name in tiles:
+            tile_indices = self._process_single_tile(ds, lat_slice, lon_slice, tile_name)
+            tile_datasets[tile_name] = self._prepare_tile_dataset(tile_indices)
+            regions[tile_name] = {
+                'lat': self._tile_region(lat_slice, sizes['lat']),
+                'lon': self._tile_region(lon_slice, sizes['lon']),
+            }
+
+        # Largest chunk size that puts every tile boundary on a chunk edge
+        chunk_sizes = {
+            dim: math.gcd(*(region[dim].start for region in regions.values())) or sizes[dim]
+            for dim in sizes
+        }
+
+        template = self._concat_tiles(self._get_ordered_tile_files(tile_datasets))
+        encoding = {
+            var_name: {
+                'chunks': tuple(chunk_sizes.get(dim, template.sizes[dim]) for dim in template[var_name].dims),
+                **self._zarr_compression()
+            }
+            for var_name in template.data_vars
+        }
+
+        store = self._tile_file_path('merged', output_dir)
+        logger.info(f"  Writing {len(tiles)} tiles into {store} as one Dask graph...")
+        try:
+            template.to_zarr(store, mode='w', consolidated=False, encoding=encoding, compute=False)
+            region_writes = []
+            for tile_name, tile_ds in tile_datasets.items():
+                region_ds = tile_ds.drop_vars(
+                    [name for name, var in tile_ds.variables.items()
+                     if not set(var.dims) & set(sizes)]
+                ).chunk(chunk_sizes)
+                region_writes.append(region_ds.to_zarr(
+                    store, region=regions[tile_name], consolidated=False, compute=False
+                ))
+            dask.compute(*region_writes)
+        except OSError as e:
+            logger.error(f"Failed to write tiles: {e}")
+            shutil.rmtree(store, ignore_errors=True)
+            raise RuntimeError(
+                f"Disk space exhaustion or I/O error writing tiles to {store}: {e}"
+            ) from e
+
+        return store
+
+    def _get_ordered_tile_files(
+        self,
+        tile_files_dict: Dict[str, Union[Path, xr.Dataset]]
+    ) -> List[Union[Path, xr.Dataset]]:
         """
         Get tile files in correct order for concatenation.
 
         Args:
             tile_files_dict: Dictionary mapping tile name to file path
+                             (or in-memory tile dataset)
 
         Returns:
             List of tile files in concatenation order
         """
-        if self.n_tiles == 1:
-            return [tile_files_dict['full']]
-        elif self.n_tiles == 2:
-            return [tile_files_dict['west'], tile_files_dict['east']]
-        elif self.n_tiles == 4:
-            return [
-                tile_files_dict['northwest'],
-                tile_files_dict['northeast'],
-                tile_files_dict['southwest'],
-                tile_files_dict['southeast']
-            ]
-        elif self.n_tiles == 8:
-            return [
-                tile_files_dict['nw1'], tile_files_dict['nw2'],
-                tile_files_dict['ne1'], tile_files_dict['ne2'],
-                tile_files_dict['sw1'], tile_files_dict['sw2'],
-                tile_files_dict['se1'], tile_files_dict['se2']
-            ]
-        else:
-            raise ValueError(f"Unsupported n_tiles: {self.n_tiles}")
+        return [tile_files_dict[tile_name] for tile_name in self._tile_order]
@@ -0,0 +1,544 @@
+#!/usr/bin/env python3
+"""
+Vectorized Standardized Precipitation Index (SPI) for xclim-timber.
+
+xclim fits the SPI gamma distribution pixel by pixel through scipy, once per
+window, which dominates drought pipeline run time. This module fits every
+pixel of a block at once with array operations and shares the monthly
+resample across all SPI windows. The fitted parameters depend only on the
+calibration period and can be saved and reused (fit_spi_params,
+spi_from_params), so later runs only apply the gamma CDF transform.
+
+The method follows McKee et al. (1993): a two-parameter gamma distribution
+(loc=0) fitted by maximum likelihood per calendar month over the calibration
+period, with zeros handled by a mixed distribution
+(p0 + (1 - p0) * G(x), the same convention as xclim's default).
+"""
+
+from functools import partial
+from typing import Iterator, Optional, Sequence, Tuple
+import logging
+
+import numpy as np
+import xarray as xr
+from scipy.special import digamma, gammainc, ndtri
+from xclim.core.units import convert_units_to
+
+from core.pixel_mask import map_valid_pixels
+
+logger = logging.getLogger(__name__)
+
+# Largest |SPI| representable from a float64 probability (xclim uses the same bound)
+SPI_BOUND = 8.21
+
+# Newton refinements (in log-shape) of Minka's shape estimate. Minka is within
+# about 1.5% of the maximum likelihood solution for any shape, so three
+# steps reach double precision even for very skewed samples (shape << 1)
+GAMMA_NEWTON_STEPS = 3
+
+# Fitted parameters per SPI window and calendar month (see spi_gamma_params)
+GAMMA_PARAMS = ('shape', 'scale', 'prob_zero')
+
+# Recurrence steps before trigamma's asymptotic series (accurate for x >= 6)
+TRIGAMMA_SHIFT = 6
+
+
+def _trigamma(x: np.ndarray) -> np.ndarray:
+    """
+    Trigamma function for positive arguments.
+
+    Shifts x up by the recurrence psi'(x) = psi'(x + 1) + 1 / x**2, then
+    evaluates the asymptotic (Bernoulli) series; relative error is below
+    1e-10. This is several times faster than scipy's polygamma(1, x), which
+    goes through the Hurwitz zeta function.
+
+    Args:
+        x: Positive values
+
+    Returns:
+        psi'(x) with the shape of x
+    """
+    result = np.zeros_like(x)
+    for i in range(TRIGAMMA_SHIFT):
+        result += 1 / (x + i) ** 2
+
+    inv = 1 / (x + TRIGAMMA_SHIFT)
+    inv2 = inv * inv
+    result += inv + inv2 * (1 / 2 + inv * (1 / 6 + inv2 * (-1 / 30 + inv2 * (1 / 42 - inv2 / 30))))
+    return result
+
+
+def fit_gamma(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Fit a zero-inflated two-parameter gamma distribution along the last axis.
+
+    The shape starts from Minka's (2002) approximation and is refined with
+    Newton steps in ln(k) on the maximum likelihood equation
+    ln(k) - digamma(k) = s, where s = ln(mean(x)) - mean(ln(x)) over the
+    positive values. This is the estimate scipy's gamma.fit(x, floc=0) returns.
+
+    Args:
+        values: Samples with the sample axis last (NaN = missing)
+
+    Returns:
+        Tuple of (shape, scale, probability of zero), each with the sample
+        axis removed. Shape and scale are NaN where fewer than two positive
+        values (or identical values) are available.
+    """
+    positive = values > 0
+    n_positive = positive.sum(axis=-1)
+    n_notnull = (~np.isnan(values)).sum(axis=-1)
+    n_zero = (values == 0).sum(axis=-1)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = np.where(positive, values, 0.0).sum(axis=-1) / n_positive
+        mean_log = np.log(np.where(positive, values, 1.0)).sum(axis=-1) / n_positive
+        s = np.log(mean) - mean_log
+
+        # Minka's approximation, then Newton steps towards the ML solution
+        shape = (3 - s + np.sqrt((s - 3) ** 2 + 24 * s)) / (12 * s)
+        for _ in range(GAMMA_NEWTON_STEPS):
+            log_shape = np.log(shape)
+            log_shape -= (log_shape - digamma(shape) - s) / (1 - shape * _trigamma(shape))
+            shape = np.exp(log_shape)
+
+        invalid = (n_positive <= 1) | ~(s > 0)
+        shape = np.where(invalid, np.nan, shape)
+        scale = mean / shape
+        prob_zero = n_zero / n_notnull
+
+    return shape, scale, prob_zero
+
+
+def _rolling_means(values: np.ndarray, windows: Sequence[int]) -> Iterator[np.ndarray]:
+    """
+    Trailing rolling means along the last axis, one array per window.
+
+    All windows share one cumulative sum, so each window costs a single
+    subtraction per step instead of summing its values. A mean is NaN until
+    the window fills or if any value in the window is NaN. Windows of zeros
+    give exactly 0 (the cumulative sum does not change).
+
+    Args:
+        values: Values with time as the last axis
+        windows: Window lengths in time steps
+
+    Yields:
+        Rolling mean per window, shaped like values
+    """
+    missing = np.isnan(values)
+    cumsum = np.zeros(values.shape[:-1] + (values.shape[-1] + 1,))
+    np.cumsum(np.where(missing, 0.0, values), axis=-1, out=cumsum[..., 1:])
+    cum_missing = np.zeros(cumsum.shape, dtype=np.int32)
+    np.cumsum(missing, axis=-1, out=cum_missing[..., 1:])
+
+    for window in windows:
+        if window == 1:
+            yield values
+            continue
+
+        rolled = np.full_like(values, np.nan)
+        if values.shape[-1] >= window:
+            sums = cumsum[..., window:] - cumsum[..., :-window]
+            window_missing = cum_missing[..., window:] != cum_missing[..., :-window]
+            rolled[..., window - 1:] = np.where(window_missing, np.nan, sums / window)
+        yield rolled
+
+
+def _fit_months(rolled: np.ndarray, months: np.ndarray, cal_mask: np.ndarray) -> np.ndarray:
+    """Gamma parameters of one window per calendar month, shaped rolled.shape[:-1] + (3, 12)."""
+    params = np.full(rolled.shape[:-1] + (len(GAMMA_PARAMS), 12), np.nan)
+    for month in range(1, 13):
+        in_month = months == month
+        if in_month.any():
+            params[..., month - 1] = np.stack(fit_gamma(rolled[..., in_month & cal_mask]), axis=-1)
+    return params
+
+
+def _transform_months(rolled: np.ndarray, params: np.ndarray, months: np.ndarray) -> np.ndarray:
+    """SPI of one window from its (..., 3, 12) gamma parameters, as float32 along time."""
+    out = np.full(rolled.shape, np.nan, dtype=np.float32)
+    for month in range(1, 13):
+        in_month = months == month
+        if not in_month.any():
+            continue
+
+        shape, scale, prob_zero = (params[..., p_idx, month - 1, None] for p_idx in range(len(GAMMA_PARAMS)))
+        x = rolled[..., in_month]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            probs = np.where(
+                x == 0,
+                prob_zero,
+                prob_zero + (1 - prob_zero) * gammainc(shape, x / scale)
+            )
+            out[..., in_month] = np.clip(ndtri(probs), -SPI_BOUND, SPI_BOUND)
+    return out
+
+
+def spi_gamma_params(
+    monthly: np.ndarray,
+    months: np.ndarray,
+    cal_mask: np.ndarray,
+    windows: Sequence[int]
+) -> np.ndarray:
+    """
+    Fit the SPI gamma distributions for several windows from monthly precipitation.
+
+    Args:
+        monthly: Monthly mean precipitation with time as the last axis
+        months: Calendar month (1-12) of each time step
+        cal_mask: Boolean mask of time steps inside the calibration period
+        windows: SPI windows in months
+
+    Returns:
+        float64 array shaped monthly.shape[:-1] + (3, len(windows), 12) holding
+        the GAMMA_PARAMS (shape, scale, probability of zero) per window and
+        calendar month; NaN for months without data
+    """
+    values = monthly.astype(np.float64)
+    params = np.full(values.shape[:-1] + (len(GAMMA_PARAMS), len(windows), 12), np.nan)
+
+    for w_idx, rolled in enumerate(_rolling_means(values, windows)):
+        params[..., w_idx, :] = _fit_months(rolled, months, cal_mask)
+
+    return params
+
+
+def spi_gamma_transform(
+    monthly: np.ndarray,
+    params: np.ndarray,
+    months: np.ndarray,
+    windows: Sequence[int],
+    first: int = 0
+) -> np.ndarray:
+    """
+    Transform monthly precipitation to SPI with fitted gamma distributions.
+
+    Args:
+        monthly: Monthly mean precipitation with time as the last axis
+        params: Gamma parameters from spi_gamma_params() for the same windows
+        months: Calendar month (1-12) of each time step
+        windows: SPI windows in months
+        first: Index of the first time step to transform; earlier steps only
+               feed the rolling windows
+
+    Returns:
+        float32 array shaped monthly.shape[:-1] + (len(windows), n_time - first)
+    """
+    values = monthly.astype(np.float64)
+    out = np.empty(values.shape[:-1] + (len(windows), values.shape[-1] - first), dtype=np.float32)
+
+    for w_idx, rolled in enumerate(_rolling_means(values, windows)):
+        out[..., w_idx, :] = _transform_months(rolled[..., first:], params[..., w_idx, :], months[first:])
+
+    return out
+
+
+def spi_gamma(
+    monthly: np.ndarray,
+    months: np.ndarray,
+    cal_mask: np.ndarray,
+    windows: Sequence[int]
+) -> np.ndarray:
+    """
+    Compute SPI for several windows from monthly precipitation.
+
+    Parameters are fitted per calendar month over the calibration period
+    (as in spi_gamma_params), then every month is transformed (as in
+    spi_gamma_transform); each window's rolling mean is computed once and
+    used for both.
+
+    Args:
+        monthly: Monthly mean precipitation with time as the last axis
+        months: Calendar month (1-12) of each time step
+        cal_mask: Boolean mask of time steps inside the calibration period
+        windows: SPI windows in months
+
+    Returns:
+        float32 array shaped monthly.shape[:-1] + (len(windows), n_time)
+    """
+    values = monthly.astype(np.float64)
+    out = np.empty(values.shape[:-1] + (len(windows), values.shape[-1]), dtype=np.float32)
+
+    for w_idx, rolled in enumerate(_rolling_means(values, windows)):
+        out[..., w_idx, :] = _transform_months(rolled, _fit_months(rolled, months, cal_mask), months)
+
+    return out
+
+
+def _monthly_means(values: np.ndarray, month_starts: np.ndarray, axis: int) -> np.ndarray:
+    """
+    Means of consecutive months along axis, skipping NaN like resample's mean.
+
+    Each month is one contiguous sum over its days (for time-major blocks);
+    only months whose sum is NaN repeat it with missing days masked out.
+
+    Args:
+        values: Daily values
+        month_starts: Index of the first day of each month along axis
+        axis: Time axis
+
+    Returns:
+        Monthly means typed like values; NaN for months without data
+    """
+    series = np.moveaxis(values, axis, 0)
+    bounds = np.append(month_starts, series.shape[0])
+    means = np.empty((len(month_starts),) + series.shape[1:], dtype=values.dtype)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for month, (start, stop) in enumerate(zip(bounds[:-1], bounds[1:])):
+            days = series[start:stop]
+            total = np.add.reduce(days, axis=0)
+            if np.isnan(total).any():
+                # Missing days (or pixels without data, e.g. ocean) in this month
+                missing = np.isnan(days)
+                total = np.where(missing, 0, days).sum(axis=0)
+                means[month] = total / (stop - start - missing.sum(axis=0))
+            else:
+                means[month] = total / (stop - start)
+    return np.moveaxis(means, 0, axis)
+
+
+def _block_monthly_means(block: np.ndarray, month_starts: np.ndarray, axis: int, block_info=None) -> np.ndarray:
+    """_monthly_means of one month-aligned Dask block (month_starts index the full array)."""
+    start, stop = block_info[0]['array-location'][axis]
+    local_starts = month_starts[(month_starts >= start) & (month_starts < stop)] - start
+    return _monthly_means(block, local_starts, axis)
+
+
+def monthly_precipitation(pr: xr.DataArray) -> xr.DataArray:
+    """
+    Resample daily precipitation to the monthly means SPI is fitted on.
+
+    Same result as pr.resample(time='MS').mean(), but each block is reduced
+    month by month in one task (see _monthly_means) instead of a groupby
+    with per-month tasks. Dask blocks are split at
+    year boundaries first unless they already end on month boundaries.
+    Series with a gap month, or without a datetime64 time axis, fall back
+    to resample.
+
+    Args:
+        pr: Daily precipitation (time, lat, lon)
+
+    Returns:
+        Monthly ('MS') mean precipitation, chunked along full time if lazy
+    """
+    times = pr.time.values
+    month_index = None
+    if np.issubdtype(times.dtype, np.datetime64) and len(times):
+        month_index = times.astype('datetime64[M]').astype(np.int64)
+    if month_index is None or month_index[-1] - month_index[0] + 1 != len(np.unique(month_index)):
+        monthly = pr.resample(time='MS').mean()
+    else:
+        month_starts = np.flatnonzero(np.diff(month_index, prepend=month_index[0] - 1))
+        axis = pr.get_axis_num('time')
+        if pr.chunks is None:
+            data = _monthly_means(pr.values, month_starts, axis)
+        else:
+            if not np.isin(np.cumsum(pr.chunks[axis])[:-1], month_starts).all():
+                # Year-long blocks, as stored (see _map_years in core.precip_stats)
+                year_starts = np.flatnonzero(np.diff(times.astype('datetime64[Y]').astype(np.int64))) + 1
+                pr = pr.chunk({'time': tuple(np.diff(np.concatenate([[0], year_starts, [len(times)]])))})
+            # Months per block, from the month starts before each block boundary
+            time_bounds = np.concatenate([[0], np.cumsum(pr.chunks[axis])])
+            time_chunks = tuple(int(n) for n in np.diff(np.searchsorted(month_starts, time_bounds)))
+            data = pr.data.map_blocks(
+                _block_monthly_means, month_starts, axis,
+                chunks=pr.chunks[:axis] + (time_chunks,) + pr.chunks[axis + 1:],
+                dtype=pr.dtype,
+            )
+        month_time = times[month_starts].astype('datetime64[M]').astype(times.dtype)
+        coords = {**pr.isel(time=0, drop=True).coords, 'time': month_time}
+        monthly = xr.DataArray(data, dims=pr.dims, coords=coords, attrs=pr.attrs)
+    if monthly.chunks is not None:
+        # The fit needs every month of a pixel in one block
+        monthly = monthly.chunk({'time': -1})
+    return monthly
+
+
+def spi_from_monthly(
+    monthly: xr.DataArray,
+    windows: Sequence[int],
+    cal_start: str,
+    cal_end: str
+) -> xr.DataArray:
+    """
+    Lazily compute SPI for several windows from monthly precipitation.
+
+    Every window is computed from the same monthly series in a single pass
+    per spatial block.
+
+    Args:
+        monthly: Monthly mean precipitation from monthly_precipitation()
+        windows: SPI windows in months
+        cal_start: Start date of the calibration period ('YYYY-MM-DD')
+        cal_end: End date of the calibration period ('YYYY-MM-DD')
+
+    Returns:
+        SPI with dims (window, time, lat, lon) on the monthly time axis
+
+    Raises:
+        ValueError: If the calibration period contains no data
+    """
+    cal_times = _calibration_times(monthly, cal_start, cal_end)
+
+    spi = xr.apply_ufunc(
+        # Pixels without any data (ocean, outside CONUS) are skipped
+        partial(map_valid_pixels, spi_gamma),
+        monthly,
+        input_core_dims=[['time']],
+        output_core_dims=[['window', 'time']],
+        kwargs={
+            'months': monthly.time.dt.month.values,
+            'cal_mask': monthly.time.isin(cal_times).values,
+            'windows': tuple(windows),
+        },
+        dask='parallelized',
+        output_dtypes=[np.float32],
+        dask_gufunc_kwargs={'output_sizes': {'window': len(windows)}},
+        keep_attrs=False,
+    )
+
+    return spi.assign_coords(window=list(windows)).transpose('window', 'time', ...)
+
+
+def _calibration_times(monthly: xr.DataArray, cal_start: str, cal_end: str) -> xr.DataArray:
+    """Monthly time steps inside the calibration period (ValueError if there are none)."""
+    cal_times = monthly.time.sel(time=slice(cal_start, cal_end))
+    if cal_times.size == 0:
+        raise ValueError(
+            f"SPI calibration period {cal_start} to {cal_end} is outside the data "
+            f"({monthly.time.values[0]} to {monthly.time.values[-1]})"
+        )
+    return cal_times
+
+
+def fit_spi_params(
+    monthly: xr.DataArray,
+    windows: Sequence[int],
+    cal_start: str,
+    cal_end: str
+) -> xr.Dataset:
+    """
+    Lazily fit the SPI gamma distributions, to be reused with spi_from_params().
+
+    The parameters depend only on the calibration period, so they can be
+    fitted once, saved, and applied to any later period without refitting.
+
+    Args:
+        monthly: Monthly mean precipitation from monthly_precipitation()
+        windows: SPI windows in months
+        cal_start: Start date of the calibration period ('YYYY-MM-DD')
+        cal_end: End date of the calibration period ('YYYY-MM-DD')
+
+    Returns:
+        Dataset with GAMMA_PARAMS variables of dims (window, month, lat, lon),
+        in the units of monthly
+
+    Raises:
+        ValueError: If the calibration period contains no data
+    """
+    cal_monthly = monthly.sel(time=_calibration_times(monthly, cal_start, cal_end))
+
+    params = xr.apply_ufunc(
+        # Pixels without any data (ocean, outside CONUS) are skipped
+        partial(map_valid_pixels, spi_gamma_params),
+        cal_monthly,
+        input_core_dims=[['time']],
+        output_core_dims=[['gamma_param', 'window', 'month']],
+        kwargs={
+            'months': cal_monthly.time.dt.month.values,
+            'cal_mask': np.ones(cal_monthly.sizes['time'], dtype=bool),
+            'windows': tuple(windows),
+        },
+        dask='parallelized',
+        output_dtypes=[np.float64],
+        dask_gufunc_kwargs={
+            'output_sizes': {'gamma_param': len(GAMMA_PARAMS), 'window': len(windows), 'month': 12}
+        },
+        keep_attrs=False,
+    )
+    params = params.assign_coords(
+        gamma_param=list(GAMMA_PARAMS), window=list(windows), month=np.arange(1, 13)
+    ).transpose('gamma_param', 'window', 'month', ...)
+
+    return params.to_dataset(dim='gamma_param').assign_attrs({
+        'calibration_period': f'{cal_start} to {cal_end}',
+        'units': monthly.attrs.get('units', ''),
+    })
+
+
+def spi_from_params(
+    monthly: xr.DataArray,
+    params: xr.Dataset,
+    windows: Sequence[int],
+    start: Optional[str] = None
+) -> xr.DataArray:
+    """
+    Lazily compute SPI for several windows from previously fitted parameters.
+
+    Only the gamma CDF transform runs; no calibration data is needed, only
+    the window - 1 months before the first SPI value of the longest window.
+    With start, those lead months feed the rolling windows but are neither
+    transformed nor returned.
+
+    Args:
+        monthly: Monthly mean precipitation from monthly_precipitation()
+        params: Parameters from fit_spi_params() on the same grid, covering windows
+        windows: SPI windows in months
+        start: First date of the SPI to return (default: the first month)
+
+    Returns:
+        SPI with dims (window, time, lat, lon) on the monthly time axis from start
+    """
+    if params.attrs.get('units') and monthly.attrs.get('units') not in (None, params.attrs['units']):
+        # The gamma scale is in the units the parameters were fitted in
+        monthly = convert_units_to(monthly, params.attrs['units'], context='hydro')
+
+    params = params.sel(window=list(windows)).to_dataarray(dim='gamma_param').sel(gamma_param=list(GAMMA_PARAMS))
+    if params.chunks is not None:
+        params = params.chunk({'gamma_param': -1, 'window': -1, 'month': -1})
+
+    first = 0 if start is None else int(monthly.get_index('time').searchsorted(start))
+    spi = xr.apply_ufunc(
+        spi_gamma_transform,
+        monthly,
+        params,
+        input_core_dims=[['time'], ['gamma_param', 'window', 'month']],
+        output_core_dims=[['window', 'time']],
+        exclude_dims={'time'},
+        kwargs={'months': monthly.time.dt.month.values, 'windows': tuple(windows), 'first': first},
+        dask='parallelized',
+        dask_gufunc_kwargs={'output_sizes': {'time': monthly.sizes['time'] - first}},
+        output_dtypes=[np.float32],
+        keep_attrs=False,
+    )
+
+    return spi.assign_coords(time=monthly.time[first:]).transpose('window', 'time', ...)
+
+
+def standardized_precipitation_index(
+    pr: xr.DataArray,
+    windows: Sequence[int],
+    cal_start: str,
+    cal_end: str
+) -> xr.DataArray:
+    """
+    Lazily compute SPI for several windows from daily precipitation.
+
+    Daily values are resampled to monthly means once and shared by every
+    window (see monthly_precipitation and spi_from_monthly).
+
+    Args:
+        pr: Daily precipitation (time, lat, lon)
+        windows: SPI windows in months
+        cal_start: Start date of the calibration period ('YYYY-MM-DD')
+        cal_end: End date of the calibration period ('YYYY-MM-DD')
+
+    Returns:
+        SPI with dims (window, time, lat, lon) on a monthly ('MS') time axis
+
+    Raises:
+        ValueError: If the calibration period contains no data
+    """
+    return spi_from_monthly(monthly_precipitation(pr), windows, cal_start, cal_end)
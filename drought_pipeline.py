@@ -6,16 +6,20 @@ Calculates 12 drought indices (Phase 10).
 """
 
 import logging
+import math
 import sys
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Hashable, Optional
 import threading
 
+import pandas as pd
 import xarray as xr
 import dask
-import xclim.indicators.atmos as atmos
+import psutil
 
 from core import BasePipeline, PipelineConfig, BaselineLoader, PipelineCLI, SpatialTilingMixin
+from core.precip_stats import annual_dry_wet_indices, annual_fraction_over_thresh, annual_max_window_sum
+from core.spi import fit_spi_params, monthly_precipitation, spi_from_monthly, spi_from_params
 
 logger = logging.getLogger(__name__)
 
@@ -33,13 +37,54 @@ class DroughtPipeline(BasePipeline, SpatialTilingMixin):
                                           heavy precipitation fraction
     """
 
-    def __init__(self, n_tiles: int = 4, **kwargs):
+    # Packed output encodings for indices with a small dynamic range (halves the
+    # written volume versus float32). Quantization: SPI 0.001 (bounded at ±8.21),
+    # daily intensity 0.01 mm/day, 7-day totals 0.1 mm (up to 6553 mm), fractions
+    # 1e-4; day and spell counts are exact integers.
+    _SPI_PACKING = {'dtype': 'int16', 'scale_factor': 0.001, 'add_offset': 0.0, '_FillValue': -32768}
+    # scale_factor=1 keeps day counts (units 'days') decoding to floats with NaN
+    # instead of timedelta-style integers
+    _DAY_COUNT_PACKING = {'dtype': 'uint16', 'scale_factor': 1.0, 'add_offset': 0.0, '_FillValue': 65535}
+    _INTENSITY_PACKING = {'dtype': 'int16', 'scale_factor': 0.01, 'add_offset': 0.0, '_FillValue': -32768}
+    OUTPUT_PACKING = {
+        **dict.fromkeys(['spi_1month', 'spi_3month', 'spi_6month', 'spi_12month', 'spi_24month'], _SPI_PACKING),
+        'cdd': _DAY_COUNT_PACKING,
+        'dry_days': _DAY_COUNT_PACKING,
+        'dry_spell_frequency': _DAY_COUNT_PACKING,
+        'dry_spell_total_length': _DAY_COUNT_PACKING,
+        'sdii': _INTENSITY_PACKING,
+        'max_7day_pr_intensity': {'dtype': 'uint16', 'scale_factor': 0.1, 'add_offset': 0.0, '_FillValue': 65535},
+        'fraction_heavy_precip': {'dtype': 'int16', 'scale_factor': 1e-4, 'add_offset': 0.0, '_FillValue': -32768},
+    }
+
+    # SPI windows (in months) and their index names
+    SPI_WINDOWS = {
+        1: 'spi_1month',
+        3: 'spi_3month',
+        6: 'spi_6month',
+        12: 'spi_12month',
+        24: 'spi_24month'
+    }
+
+    def __init__(
+        self,
+        n_tiles: int = 4,
+        tile_executor: str = 'threads',
+        in_memory_tiles: bool = False,
+        tile_format: str = 'netcdf',
+        compress_tiles: bool = False,
+        **kwargs
+    ):
         """
         Initialize the pipeline with parallel spatial tiling.
 
         Args:
-            n_tiles: Number of spatial tiles (1, 2, 4, or 8, default: 4 for quadrants)
-            **kwargs: Additional arguments passed to BasePipeline (chunk_years, enable_dashboard)
+            n_tiles: Number of spatial tiles (1, 2, 4, 8, 16, or 32, default: 4 for quadrants)
+            tile_executor: Run tiles on 'threads' (default), 'processes', or 'dask'
+            in_memory_tiles: Merge tiles in memory instead of via tile files
+            tile_format: Intermediate tile file format, 'netcdf' (default) or 'zarr'
+            compress_tiles: Compress intermediate tile files (default: False)
+            **kwargs: Additional arguments passed to BasePipeline (chunk_years, enable_dashboard, output_format, parallel_chunks)
         """
         # Initialize BasePipeline
         BasePipeline.__init__(
@@ -50,7 +95,14 @@ class DroughtPipeline(BasePipeline, SpatialTilingMixin):
         )
 
         # Initialize SpatialTilingMixin
-        SpatialTilingMixin.__init__(self, n_tiles=n_tiles)
+        SpatialTilingMixin.__init__(
+            self,
+            n_tiles=n_tiles,
+            tile_executor=tile_executor,
+            in_memory_merge=in_memory_tiles,
+            tile_format=tile_format,
+            compress_tiles=compress_tiles
+        )
 
         # Load baseline percentiles
         self.baseline_loader = BaselineLoader()
@@ -63,6 +115,17 @@ class DroughtPipeline(BasePipeline, SpatialTilingMixin):
         self.spi_cal_start = '1981-01-01'
         self.spi_cal_end = '2010-12-31'
 
+        # Saved SPI gamma parameters for the calibration period (None: fit per chunk)
+        self.spi_params = self._load_spi_params()
+
+        # Without saved parameters, each tile's fit from the first temporal chunk
+        # is kept (in memory) and reused by the following chunks
+        self._fitted_spi_params: Dict[Hashable, xr.Dataset] = {}
+        self._fitted_spi_params_lock = threading.Lock()
+
+        # Time-contiguous precipitation for SPI, opened once per temporal chunk
+        self._spi_precip: Optional[xr.Dataset] = None
+
         # Target years for SPI filtering (set during _calculate_all_indices)
         self.target_start_year = None
         self.target_end_year = None
@@ -124,14 +187,116 @@ class DroughtPipeline(BasePipeline, SpatialTilingMixin):
         all_indices = {**spi_indices, **dry_spell_indices, **intensity_indices}
         return all_indices
 
-    def calculate_spi_indices(self, precip_ds: xr.Dataset) -> dict:
+    def _load_spi_params(self) -> Optional[xr.Dataset]:
+        """
+        Load saved SPI gamma parameters (see save_spi_params), if available.
+
+        Returns:
+            Lazily loaded parameters, or None if the file is missing or was fitted
+            for another calibration period or windows (SPI is then fitted from
+            the calibration period in every chunk)
+        """
+        params_file = Path(PipelineConfig.SPI_PARAMS_FILE)
+        if not params_file.exists():
+            logger.info(
+                f"No SPI parameter file at {params_file}; SPI is fitted per chunk "
+                f"(save the parameters once with --refit-spi-params)"
+            )
+            return None
+
+        params = xr.open_dataset(params_file, chunks={})
+        cal_period = f'{self.spi_cal_start} to {self.spi_cal_end}'
+        if params.attrs.get('calibration_period') != cal_period or not set(self.SPI_WINDOWS) <= set(params.window.values):
+            logger.warning(
+                f"SPI parameter file {params_file} does not match calibration period {cal_period} "
+                f"and windows {list(self.SPI_WINDOWS)}; ignoring it (refit with --refit-spi-params)"
+            )
+            params.close()
+            return None
+
+        logger.info(f"Loaded SPI gamma parameters ({cal_period}) from {params_file}")
+        return params
+
+    def save_spi_params(self) -> Path:
+        """
+        Fit the SPI gamma parameters over the calibration period and save them.
+
+        A one-time step (repeat if the calibration data changes): later runs
+        load the file and only transform their own years, without reading and
+        refitting the 30-year calibration period in every chunk.
+
+        Returns:
+            Path to the saved parameter file
+        """
+        params_file = Path(PipelineConfig.SPI_PARAMS_FILE)
+        logger.info(f"Fitting SPI gamma parameters over {self.spi_cal_start} to {self.spi_cal_end}...")
+
+        n_time = len(pd.date_range(self.spi_cal_start, self.spi_cal_end, freq='D'))
+        ds = self._open_zarr_store(PipelineConfig.PRECIP_ZARR, self._spi_chunks(n_time))
+        ds = self._mask_and_scale(ds.sel(time=slice(self.spi_cal_start, self.spi_cal_end)))
+        precip_ds = self._preprocess_datasets({'precipitation': ds})['precipitation']
+
+        params = fit_spi_params(
+            monthly_precipitation(precip_ds.pr),
+            windows=tuple(self.SPI_WINDOWS),
+            cal_start=self.spi_cal_start,
+            cal_end=self.spi_cal_end
+        )
+
+        if self.spi_params is not None:
+            # Release the previous file before overwriting it
+            self.spi_params.close()
+            self.spi_params = None
+        params_file.parent.mkdir(parents=True, exist_ok=True)
+        # Kept as float64: SPI from the saved parameters matches fitting in every chunk
+        encoding = {var_name: dict(PipelineConfig.NETCDF_COMPRESSION) for var_name in params.data_vars}
+        params.to_netcdf(params_file, engine='netcdf4', encoding=encoding)
+        logger.info(f"Saved SPI gamma parameters to {params_file}")
+
+        self.spi_params = self._load_spi_params()
+        return params_file
+
+    @staticmethod
+    def _require_precipitation(precip_ds: xr.Dataset):
+        """
+        Check that a dataset has the precipitation variable all drought indices use.
+
+        Args:
+            precip_ds: Dataset passed to a calculate_*_indices method
+
+        Raises:
+            ValueError: If 'pr' variable not found
+        """
+        if 'pr' not in precip_ds:
+            raise ValueError(
+                "Precipitation variable 'pr' not found in dataset. "
+                f"Available variables: {list(precip_ds.data_vars)}. "
+                "Check preprocessing in _preprocess_datasets()."
+            )
+
+    def calculate_spi_indices(
+        self,
+        precip_ds: xr.Dataset,
+        spi_params: Optional[xr.Dataset] = None,
+        fit_key: Optional[Hashable] = None,
+        start: Optional[str] = None
+    ) -> dict:
         """
         Calculate Standardized Precipitation Index (SPI) at multiple time windows.
 
-        Implements McKee et al. (1993) standard methodology using gamma distribution fitting.
+        Implements McKee et al. (1993) standard methodology using gamma distribution fitting
+        (two-parameter gamma, maximum likelihood, zero-inflated), vectorized over pixels.
 
         Args:
             precip_ds: Dataset with precipitation variable (pr)
+            spi_params: Saved gamma parameters on the same grid; if given, SPI is
+                        transformed with them instead of fitting the calibration period
+            fit_key: If given (and spi_params is not), the parameters fitted here
+                     are kept under this key for later temporal chunks, provided
+                     precip_ds spans the whole calibration period
+            start: First date of the SPI to return (e.g. the target years);
+                   earlier data (calibration period, window lead months) is
+                   only used for fitting and the rolling windows
 
         Returns:
             Dictionary of calculated SPI indices (5 windows)
@@ -143,91 +308,121 @@ class DroughtPipeline(BasePipeline, SpatialTilingMixin):
         indices = {}
         errors = []
 
-        if 'pr' not in precip_ds:
-            raise ValueError(
-                "Precipitation variable 'pr' not found in dataset. "
-                f"Available variables: {list(precip_ds.data_vars)}. "
-                "Check preprocessing in _preprocess_datasets()."
-            )
+        self._require_precipitation(precip_ds)
 
-        # Define SPI windows (in months)
-        spi_windows = {
-            1: 'spi_1month',
-            3: 'spi_3month',
-            6: 'spi_6month',
-            12: 'spi_12month',
-            24: 'spi_24month'
-        }
+        spi_windows = self.SPI_WINDOWS
 
-        for window, var_name in spi_windows.items():
-            try:
-                logger.info(f"  - Calculating {var_name} (SPI-{window})...")
-
-                # Calculate SPI using gamma distribution (McKee et al. 1993)
-                # Note: xclim automatically handles zero-inflation (zero_inflated=True is hardcoded)
-                # Results are bounded at ±8.21 as per xclim implementation
-                spi = atmos.standardized_precipitation_index(
-                    pr=precip_ds.pr,
-                    freq='MS',              # Monthly frequency (required for SPI)
-                    window=window,          # N-month window
-                    dist='gamma',           # Gamma distribution (standard)
-                    method='ML',            # Maximum likelihood fitting
+        # All windows share one monthly resample and are fitted in one
+        # vectorized pass per spatial block (see core.spi)
+        try:
+            logger.info(f"  - Calculating SPI for windows {list(spi_windows)} (gamma, McKee et al. 1993)...")
+            # The monthly series is ~30x smaller than the daily input. Persisting it
+            # lets the validation pass and the tile write below share one daily
+            # read and resample instead of repeating it
+            scheduler = self._spi_scheduler()
+            pr = precip_ds.pr
+            if pr.chunks is not None and self._spi_fits_in_memory(pr):
+                # Resampling dask blocks builds tasks per month and block; the same
+                # resample on the loaded tile is several times faster, and the fit
+                # and transform below then run on NumPy without a task graph
+                pr = pr.load(scheduler=scheduler)
+            monthly_pr = monthly_precipitation(pr)
+            if monthly_pr.chunks is not None:
+                monthly_pr = monthly_pr.persist(scheduler=scheduler)
+            if spi_params is None and fit_key is not None and self._covers_spi_calibration(pr):
+                # Fit once (the parameters are ~20x smaller than the monthly series).
+                # Only a chunk holding the whole calibration period is cached;
+                # earlier chunks (e.g. 1981 alone) are fitted per chunk below
+                spi_params = fit_spi_params(
+                    monthly_pr,
+                    windows=tuple(spi_windows),
+                    cal_start=self.spi_cal_start,
+                    cal_end=self.spi_cal_end
+                ).compute(scheduler=scheduler)
+                with self._fitted_spi_params_lock:
+                    self._fitted_spi_params[fit_key] = spi_params
+            if spi_params is not None:
+                # Parameters fitted once over the calibration period: transform only,
+                # and only the months from start on
+                spi_all = spi_from_params(monthly_pr, spi_params, windows=tuple(spi_windows), start=start)
+            else:
+                spi_all = spi_from_monthly(
+                    monthly_pr,
+                    windows=tuple(spi_windows),
                     cal_start=self.spi_cal_start,    # 30-year calibration period
                     cal_end=self.spi_cal_end
-                )
+                ).sel(time=slice(start, None))
+            if spi_all.sizes['time'] == 0:
+                raise ValueError(f"No SPI months from {start} in the precipitation data")
+
+            # All windows and their quality counts are computed in one pass, so the
+            # gamma transform runs once per tile instead of once for validation and
+            # again for the tile write (which materializes the tile anyway; see
+            # SpatialTilingMixin._save_tile). The result is ~5x the persisted
+            # monthly series.
+            # Tiles running in parallel threads compute synchronously, which keeps
+            # the working set bounded: each tile runs its blocks one after another,
+            # and the tiles themselves are capped to what fits in memory
+            # (SpatialTilingMixin._max_inflight_tiles). See _spi_scheduler()
+            logger.info("  - Computing SPI and validating quality...")
+            spatial_time_dims = [dim for dim in spi_all.dims if dim != 'window']
+            spi_all, nan_counts, extreme_counts = dask.compute(
+                spi_all,
+                spi_all.isnull().sum(spatial_time_dims),
+                ((spi_all < -5) | (spi_all > 5)).sum(spatial_time_dims),
+                scheduler=scheduler
+            )
+        except Exception as e:
+            logger.error(f"Failed to calculate SPI: {e}")
+            raise RuntimeError(
+                f"All SPI calculations failed! No SPI indices were computed.\n"
+                f"This indicates a fundamental data or calibration problem.\n"
+                f"Error: {e}\n"
+                f"Check data quality, calibration period (1981-2010), and ensure precipitation data is valid."
+            ) from e
 
-                # Compute immediately to avoid task graph accumulation
-                # Use synchronous scheduler to avoid threading conflicts with parallel tiles
-                # FIX: Use compute() parameter instead of dask.config.set() for thread safety
-                logger.info(f"  - Computing {var_name}...")
-                spi = spi.compute(scheduler='synchronous')
+        for window, var_name in spi_windows.items():
+            try:
+                spi = spi_all.sel(window=window, drop=True)
 
                 # FIX: Validate SPI calculation quality (gamma fit may fail in arid regions)
-                logger.info(f"  - Validating {var_name} quality...")
-                nan_fraction = float(spi.isnull().sum() / spi.size)
+                nan_fraction = float(nan_counts.sel(window=window)) / spi.size
 
                 if nan_fraction > 0.1:  # More than 10% NaN
                     logger.warning(
                         f"{var_name}: {nan_fraction*100:.1f}% of values are NaN. "
                         f"This may indicate insufficient precipitation data for gamma distribution fitting "
-                        f"in arid regions. Consider using 'gamma-lmoments' method for robustness."
+                        f"in arid regions."
                     )
                 elif nan_fraction > 0:
                     logger.info(f"{var_name}: {nan_fraction*100:.2f}% NaN values (expected in arid areas)")
 
                 # Check for unrealistic extreme values
-                # xclim bounds SPI at ±8.21, but most values should be in [-3, 3] range
+                # SPI is bounded at ±8.21, but most values should be in [-3, 3] range
                 # Values beyond ±5 are extremely rare and may indicate fitting issues
-                extreme_vals = (spi < -5) | (spi > 5)
-                extreme_count = int(extreme_vals.sum())
+                extreme_count = int(extreme_counts.sel(window=window))
                 if extreme_count > 0:
                     extreme_pct = (extreme_count / spi.size) * 100
                     if extreme_pct > 1.0:  # More than 1% extreme
                         logger.warning(
                             f"{var_name}: {extreme_count} extreme values detected ({extreme_pct:.2f}% beyond ±5). "
-                            f"This may indicate gamma fit issues. xclim bounds values at ±8.21."
+                            f"This may indicate gamma fit issues. SPI is bounded at ±8.21."
                         )
                     else:
-                        logger.debug(f"{var_name}: {extreme_count} extreme values (within acceptable range, xclim bounds at ±8.21)")
-
-                # Drop prob_of_zero coordinate to avoid merge conflicts across tiles
-                # This is SPI internal metadata not needed in final output
-                if 'prob_of_zero' in spi.coords:
-                    logger.info(f"  - Dropping prob_of_zero coordinate from {var_name}...")
-                    spi = spi.drop_vars('prob_of_zero')
-
-                indices[var_name] = spi
-
-                # Enhance metadata for CF-compliance and xclim documentation
-                indices[var_name].attrs['units'] = '1'  # Dimensionless
-                indices[var_name].attrs['long_name'] = f'{window}-Month Standardized Precipitation Index'
-                indices[var_name].attrs['description'] = f'Standardized precipitation index over {window}-month window using gamma distribution (McKee et al. 1993). Calculated via xclim v0.56+ with automatic zero-inflation handling.'
-                indices[var_name].attrs['calibration_period'] = f'{self.spi_cal_start} to {self.spi_cal_end}'
-                indices[var_name].attrs['distribution'] = 'gamma'
-                indices[var_name].attrs['method'] = 'ML'
-                indices[var_name].attrs['zero_inflated'] = 'True (automatic)'
-                indices[var_name].attrs['value_bounds'] = '±8.21 (xclim implementation)'
-                indices[var_name].attrs['interpretation'] = 'SPI < -2.0: Extreme drought, -1.5 to -1.0: Moderate drought, -1.0 to 1.0: Near normal, > 2.0: Extremely wet'
+                        logger.debug(f"{var_name}: {extreme_count} extreme values (within acceptable range, bounded at ±8.21)")
+
+                # Enhance metadata for CF-compliance and xclim documentation (set in one batch)
+                indices[var_name] = spi.assign_attrs({
+                    'units': '1',  # Dimensionless
+                    'long_name': f'{window}-Month Standardized Precipitation Index',
+                    'description': f'Standardized precipitation index over {window}-month window using gamma distribution (McKee et al. 1993). Two-parameter gamma (loc=0) fitted per calendar month, with zero-inflation handling.',
+                    'calibration_period': f'{self.spi_cal_start} to {self.spi_cal_end}',
+                    'distribution': 'gamma',
+                    'method': 'ML',
+                    'zero_inflated': 'True',
+                    'value_bounds': '±8.21',
+                    'interpretation': 'SPI < -2.0: Extreme drought, -1.5 to -1.0: Moderate drought, -1.0 to 1.0: Near normal, > 2.0: Extremely wet'
+                })
 
             except Exception as e:
                 logger.error(f"Failed to calculate {var_name}: {e}")
@@ -253,111 +448,188 @@ class DroughtPipeline(BasePipeline, SpatialTilingMixin):
 
         return indices
 
+    def _spi_chunks(self, n_time: int, itemsize: int = 4) -> Dict[str, int]:
+        """
+        Time-contiguous read chunks for SPI, aligned to the store's spatial chunks.
+
+        Annual indices read one year at a time, so the default chunks
+        (self.chunk_config) hold a single year. SPI reads each pixel over the
+        whole record instead; on year-long chunks that is one read per year
+        per pixel block plus a fan-in graph to reassemble the series. Here the
+        full time axis is one chunk, and the spatial chunk is a whole
+        multiple of the store's chunk (so no store chunk is read twice),
+        grown up to about PipelineConfig.SPI_CHUNK_BYTES. The size is planned
+        from self.chunk_config; _open_zarr_store() then rounds it to the
+        chunks actually stored, should the store differ.
+
+        Args:
+            n_time: Number of daily time steps read for SPI
+            itemsize: Bytes per element (float32 by default)
+
+        Returns:
+            Chunk configuration with time=-1
+        """
+        lat_store, lon_store = self.chunk_config['lat'], self.chunk_config['lon']
+        store_chunks = max(1, PipelineConfig.SPI_CHUNK_BYTES // (n_time * itemsize * lat_store * lon_store))
+
+        # Square-ish groups of store chunks, at least one
+        lat_mult = max(1, math.isqrt(store_chunks))
+        lon_mult = max(1, store_chunks // lat_mult)
+        return {'time': -1, 'lat': lat_mult * lat_store, 'lon': lon_mult * lon_store}
+
+    def _covers_spi_calibration(self, pr: xr.DataArray) -> bool:
+        """
+        Check that the precipitation data spans the whole SPI calibration period.
+
+        Args:
+            pr: Daily precipitation with a time coordinate
+
+        Returns:
+            True if the data starts by spi_cal_start and ends no earlier than spi_cal_end
+        """
+        if pr.sizes['time'] == 0:
+            return False
+        first = pd.Timestamp(pr.time.values[0])
+        last = pd.Timestamp(pr.time.values[-1])
+        return first <= pd.Timestamp(self.spi_cal_start) and last >= pd.Timestamp(self.spi_cal_end)
+
+    def _spi_fits_in_memory(self, pr: xr.DataArray) -> bool:
+        """
+        Check whether a tile's daily precipitation can be loaded for SPI.
+
+        Args:
+            pr: Lazy daily precipitation for one tile
+
+        Returns:
+            True if pr fits in this tile's share of available memory
+        """
+        budget = psutil.virtual_memory().available * PipelineConfig.SPI_PRELOAD_MEMORY_FRACTION
+        return pr.nbytes < budget / max(1, self.n_tiles)
+
+    @staticmethod
+    def _spi_scheduler() -> str:
+        """
+        Dask scheduler for a tile's SPI computations.
+
+        Tiles on a thread pool already run concurrently, so each keeps its
+        SPI graph on the synchronous scheduler (nested thread pools would
+        oversubscribe the cores and multiply the working set). A tile on the
+        main thread (serial runs, process-pool workers) has no outer
+        parallelism and uses the threaded scheduler instead.
+
+        Returns:
+            'threads' on the main thread, 'synchronous' otherwise
+        """
+        if threading.current_thread() is threading.main_thread():
+            return 'threads'
+        return 'synchronous'
+
+    def _open_spi_precip(self, ds: xr.Dataset) -> xr.Dataset:
+        """
+        Open the precipitation store with time-contiguous chunks for SPI.
+
+        The store is reopened with _spi_chunks() instead of rechunking the
+        year-long chunks of ds, so each SPI block is read directly as one
+        sequential series per pixel group. Annual indices keep using ds.
+
+        Args:
+            ds: Loaded dataset (defines the time range, incl. calibration period)
+
+        Returns:
+            Preprocessed dataset with 'pr' over the full domain
+        """
+        spi_chunks = self._spi_chunks(ds.sizes['time'])
+        logger.info(f"  - Reading pr for SPI with time-contiguous chunks {spi_chunks}...")
+
+        spi_ds = self._open_run_zarr_store(PipelineConfig.PRECIP_ZARR, spi_chunks)
+        spi_ds = self._mask_and_scale(spi_ds.sel(time=slice(ds.time.values[0], ds.time.values[-1])))
+
+        return self._preprocess_datasets({'precipitation': spi_ds})['precipitation']
+
+    def _load_spi_precip(self, tile_ds: xr.Dataset, lat_slice: slice, lon_slice: slice) -> xr.Dataset:
+        """
+        Select a tile's precipitation with time-contiguous chunks for SPI.
+
+        Tiles share the dataset opened once per temporal chunk by
+        _calculate_all_indices(); outside of it the store is opened here.
+
+        Args:
+            tile_ds: Tile dataset (defines the time range, incl. calibration period)
+            lat_slice: Latitude slice for this tile
+            lon_slice: Longitude slice for this tile
+
+        Returns:
+            Preprocessed dataset with 'pr' for the tile
+        """
+        spi_ds = self._spi_precip if self._spi_precip is not None else self._open_spi_precip(tile_ds)
+        return spi_ds.isel(lat=lat_slice, lon=lon_slice)
+
     def calculate_dry_spell_indices(self, precip_ds: xr.Dataset) -> dict:
         """
         Calculate dry spell and consecutive dry days indices.
 
+        cdd, dry_days, dry spell frequency / total length and sdii share one
+        wet/dry classification of the daily values, so all five are computed
+        here in a single pass over each year (see core.precip_stats); sdii is
+        returned alongside the dry spell indices.
+
         Args:
             precip_ds: Dataset with precipitation variable (pr)
 
         Returns:
-            Dictionary of calculated dry spell indices (2 indices: cdd, dry_days)
+            Dictionary of calculated indices (5 indices: cdd, dry_days,
+            dry_spell_frequency, dry_spell_total_length, sdii)
 
         Raises:
             ValueError: If 'pr' variable not found
         """
         indices = {}
 
-        if 'pr' not in precip_ds:
-            raise ValueError(
-                "Precipitation variable 'pr' not found in dataset. "
-                f"Available variables: {list(precip_ds.data_vars)}. "
-                "Check preprocessing in _preprocess_datasets()."
-            )
+        self._require_precipitation(precip_ds)
 
-        # 1. Maximum Consecutive Dry Days (ETCCDI standard)
-        try:
-            logger.info("  - Calculating maximum consecutive dry days (CDD)...")
-            indices['cdd'] = atmos.maximum_consecutive_dry_days(
-                pr=precip_ds.pr,
-                thresh='1.0 mm/day',
-                freq='YS'
-            )
-        except Exception as e:
-            logger.error(f"Failed to calculate cdd: {e}")
-            raise RuntimeError(f"Critical failure in CDD calculation: {e}") from e
-
-        # 2. Dry Spell Frequency - SIMPLIFIED FOR PERFORMANCE
-        # Note: Custom implementation removed due to performance issues
-        # Using CDD (consecutive dry days) as proxy for now
-        # Full implementation requires optimized algorithm
-        logger.info("  - Skipping dry spell frequency (performance optimization)...")
-        # Placeholder - will implement optimized version in future
-
-        # 3. Dry Spell Total Length - SIMPLIFIED FOR PERFORMANCE
-        # Note: Custom implementation removed due to performance issues
-        # Using dry_days count as approximation for now
-        # Full implementation requires optimized algorithm
-        logger.info("  - Skipping dry spell total length (performance optimization)...")
-        # Placeholder - will implement optimized version in future
-
-        # 4. Dry Days (simple count)
+        # 1. Maximum Consecutive Dry Days (ETCCDI standard), 2. Dry Spell Frequency and
+        # 3. Dry Spell Total Length (spells of >= 3 days below 1 mm), 4. Dry Days (simple
+        # count) and Simple Daily Intensity Index (ETCCDI standard), fused into one pass
         try:
-            logger.info("  - Calculating dry days...")
-            indices['dry_days'] = atmos.dry_days(
-                pr=precip_ds.pr,
-                thresh='1.0 mm d-1',
-                freq='YS'
-            )
+            logger.info("  - Calculating CDD, dry spell frequency/total length, dry days and SDII...")
+            indices.update(annual_dry_wet_indices(precip_ds.pr, thresh='1.0 mm/day', min_spell=3))
         except Exception as e:
-            logger.error(f"Failed to calculate dry_days: {e}")
-            raise RuntimeError(f"Critical failure in dry_days calculation: {e}") from e
+            logger.error(f"Failed to calculate dry spell indices/sdii: {e}")
+            raise RuntimeError(f"Critical failure in dry spell/SDII calculation: {e}") from e
 
         return indices
 
-    def calculate_precip_intensity_indices(self, precip_ds: xr.Dataset) -> dict:
+    def calculate_precip_intensity_indices(
+        self,
+        precip_ds: xr.Dataset,
+        baselines: Optional[Dict[str, xr.DataArray]] = None
+    ) -> dict:
         """
         Calculate precipitation intensity and distribution indices.
 
+        SDII is computed with the dry spell indices (calculate_dry_spell_indices).
+
         Args:
             precip_ds: Dataset with precipitation variable (pr)
+            baselines: Optional baseline percentiles dict. If None, uses self.baselines
 
         Returns:
-            Dictionary of calculated precipitation intensity indices (3 indices)
+            Dictionary of calculated precipitation intensity indices (2 indices)
 
         Raises:
             ValueError: If 'pr' variable or required baseline not found
         """
         indices = {}
 
-        if 'pr' not in precip_ds:
-            raise ValueError(
-                "Precipitation variable 'pr' not found in dataset. "
-                f"Available variables: {list(precip_ds.data_vars)}. "
-                "Check preprocessing in _preprocess_datasets()."
-            )
-
-        # 1. Simple Daily Intensity Index (ETCCDI standard)
-        try:
-            logger.info("  - Calculating simple daily intensity index (SDII)...")
-            indices['sdii'] = atmos.daily_pr_intensity(
-                pr=precip_ds.pr,
-                thresh='1.0 mm d-1',
-                freq='YS'
-            )
-        except Exception as e:
-            logger.error(f"Failed to calculate sdii: {e}")
-            raise RuntimeError(f"Critical failure in SDII calculation: {e}") from e
+        self._require_precipitation(precip_ds)
 
-        # 2. Maximum 7-Day Precipitation (manual implementation)
+        # 1. Maximum 7-Day Precipitation (manual implementation)
         try:
             logger.info("  - Calculating maximum 7-day precipitation intensity...")
             window_size = 7
-            pr_7day_rolling = precip_ds.pr.rolling(time=window_size, min_periods=window_size).sum()
-            max_7day = pr_7day_rolling.resample(time='YS').max()
+            max_7day = annual_max_window_sum(precip_ds.pr, window=window_size)
 
-            indices['max_7day_pr_intensity'] = max_7day
-            indices['max_7day_pr_intensity'].attrs.update({
+            indices['max_7day_pr_intensity'] = max_7day.assign_attrs({
                 'units': 'mm',
                 'long_name': 'Maximum 7-Day Precipitation Intensity',
                 'description': f'Maximum {window_size}-day rolling sum of precipitation',
@@ -369,8 +641,12 @@ class DroughtPipeline(BasePipeline, SpatialTilingMixin):
             logger.error(f"Failed to calculate max_7day_pr_intensity: {e}")
             raise RuntimeError(f"Critical failure in max_7day_pr_intensity calculation: {e}") from e
 
-        # 3. Fraction of Heavy Precipitation (requires baseline percentiles)
-        if 'pr_75p_threshold' not in self.baselines:
+        # 2. Fraction of Heavy Precipitation (requires baseline percentiles)
+        # Use provided baselines or fall back to instance baselines
+        if baselines is None:
+            baselines = self.baselines
+
+        if 'pr_75p_threshold' not in baselines:
             raise ValueError(
                 "Required baseline variable 'pr_75p_threshold' not found. "
                 "Please regenerate baseline percentiles with all required variables."
@@ -380,14 +656,14 @@ class DroughtPipeline(BasePipeline, SpatialTilingMixin):
             logger.info("  - Calculating fraction of heavy precipitation...")
 
             # Align baseline coordinates with precipitation data to avoid dimension mismatch
-            pr_75p_aligned = self.baselines['pr_75p_threshold'].reindex_like(
+            pr_75p_aligned = baselines['pr_75p_threshold'].reindex_like(
                 precip_ds.pr,
                 method='nearest',
                 tolerance=0.01
             )
 
             # Validate alignment didn't introduce excessive NaNs
-            original_nans = self.baselines['pr_75p_threshold'].isnull().sum().item()
+            original_nans = baselines['pr_75p_threshold'].isnull().sum().item()
             aligned_nans = pr_75p_aligned.isnull().sum().item()
 
             if aligned_nans > original_nans * 1.1:  # More than 10% increase
@@ -396,14 +672,17 @@ class DroughtPipeline(BasePipeline, SpatialTilingMixin):
                     f"Coordinate mismatch may affect fraction_heavy_precip accuracy."
                 )
 
-            indices['fraction_heavy_precip'] = atmos.fraction_over_precip_thresh(
-                pr=precip_ds.pr,
-                pr_per=pr_75p_aligned,
-                freq='YS'
-            )
-            indices['fraction_heavy_precip'].attrs['long_name'] = 'Fraction of Heavy Precipitation'
-            indices['fraction_heavy_precip'].attrs['description'] = 'Fraction of annual precipitation from heavy events (>75th percentile)'
-            indices['fraction_heavy_precip'].attrs['baseline_period'] = '1981-2000'
+            # Wet-day total and heavy-day sum in one pass per year (see core.precip_stats)
+            indices['fraction_heavy_precip'] = annual_fraction_over_thresh(
+                precip_ds.pr,
+                pr_75p_aligned,
+                thresh='1 mm/day'
+            ).assign_attrs({
+                'units': '1',
+                'long_name': 'Fraction of Heavy Precipitation',
+                'description': 'Fraction of annual precipitation from heavy events (>75th percentile)',
+                'baseline_period': '1981-2000'
+            })
         except Exception as e:
             logger.error(f"Failed to calculate fraction_heavy_precip: {e}")
             import traceback
@@ -426,6 +705,7 @@ class DroughtPipeline(BasePipeline, SpatialTilingMixin):
         1. Baseline percentiles subsetting
         2. SPI calibration period handling
         3. Filtering results to target years
+        4. Reading the tile once for SPI and the annual indices when it fits in memory
 
         Args:
             ds: Full dataset (includes calibration period 1981-2010 + target years)
@@ -439,117 +719,106 @@ class DroughtPipeline(BasePipeline, SpatialTilingMixin):
         logger.info(f"  Processing tile: {tile_name}")
 
         # Select spatial subset
-        tile_ds = ds.isel(lat=lat_slice, lon=lon_slice)
+        tile_ds = self._select_tile(ds, lat_slice, lon_slice)
 
-        # Subset baseline percentiles to match tile (thread-safe)
-        # FIX: Keep entire operation inside lock to prevent race conditions
+        # Subset baseline percentiles to match tile
+        # Use lock to prevent concurrent access to shared baseline data
         with self.baseline_lock:
-            tile_baselines_temp = {}
-            for key, baseline in self.baselines.items():
-                # Slice spatial dimensions first
-                tile_baseline = baseline.isel(lat=lat_slice, lon=lon_slice)
-
-                # Rechunk to match tile data structure (prevents implicit dask rechunk operations)
-                # This eliminates 2-3x hidden memory overhead during percentile-based index calculations
-                if hasattr(tile_ds, 'chunks') and hasattr(tile_baseline, 'chunk'):
-                    chunk_dict = {
-                        'lat': tile_ds.chunks.get('lat', (-1,))[0] if 'lat' in tile_ds.chunks else -1,
-                        'lon': tile_ds.chunks.get('lon', (-1,))[0] if 'lon' in tile_ds.chunks else -1,
-                        'dayofyear': -1  # Keep temporal dimension together for efficiency
-                    }
-                    tile_baseline = tile_baseline.chunk(chunk_dict)
-
-                tile_baselines_temp[key] = tile_baseline
-
-            # Temporarily replace baselines with tile-specific versions
-            # NOTE: This is inside the lock to prevent race conditions during parallel tile processing
-            original_baselines = self.baselines
-            self.baselines = tile_baselines_temp
+            # Rechunked to match the tile (prevents implicit dask rechunk operations);
+            # subsets are cached by the loader and reused across temporal chunks
+            tile_baselines = self.baseline_loader.get_tile_baselines(
+                self.baselines, lat_slice, lon_slice, tile_ds=tile_ds
+            )
 
-            try:
-                # Calculate SPI indices (uses full calibration period)
-                # Note: SPI indices are now computed immediately inside calculate_spi_indices()
-                spi_indices = self.calculate_spi_indices(tile_ds)
-
-                # Filter SPI results to target years (if we loaded extended calibration period)
-                if self.target_start_year and self.target_end_year:
-                    # Check if we need to filter (extended dataset starts before target)
-                    time_vals = tile_ds.time.values
-                    if len(time_vals) > 0:
-                        import pandas as pd
-                        data_start_year = pd.to_datetime(time_vals[0]).year
-                        if data_start_year < self.target_start_year:
-                            logger.info(f"    Filtering SPI to {self.target_start_year}-{self.target_end_year}...")
-                            for key in list(spi_indices.keys()):
-                                # SPI has monthly frequency, filter carefully
-                                try:
-                                    filtered = spi_indices[key].sel(
-                                        time=slice(f'{self.target_start_year}-01-01', f'{self.target_end_year}-12-31')
-                                    )
-                                    # Validate filtering didn't produce empty dataset
-                                    if len(filtered.time) == 0:
-                                        raise ValueError(f"Time filtering resulted in empty dataset for {key}")
-                                    spi_indices[key] = filtered
-                                except Exception as e:
-                                    logger.error(f"Could not filter {key}: {e}")
-                                    raise
-
-                # Calculate other indices (dry spell, intensity) - these use target years only
-                dry_spell_indices = self.calculate_dry_spell_indices(tile_ds)
-                intensity_indices = self.calculate_precip_intensity_indices(tile_ds)
-
-                all_indices = {**spi_indices, **dry_spell_indices, **intensity_indices}
-
-            finally:
-                # Restore original baselines (still inside lock)
-                self.baselines = original_baselines
+        # Calculate SPI indices (uses full calibration period) from a
+        # time-contiguous read; annual indices below keep the original chunks
+        fit_key = (lat_slice.start, lat_slice.stop, lon_slice.start, lon_slice.stop)
+        if self.spi_params is not None:
+            tile_spi_params = self.spi_params.isel(lat=lat_slice, lon=lon_slice)
+        else:
+            tile_spi_params = self._fitted_spi_params.get(fit_key)
+        # SPI is returned for the target years only; the extended period
+        # (calibration, window lead months) just feeds the fit and windows.
+        # The data ends with the target years, so no end bound is needed
+        spi_start = f'{self.target_start_year}-01-01' if self.target_start_year else None
+        spi_ds = self._load_spi_precip(tile_ds, lat_slice, lon_slice)
+        if spi_ds.pr.chunks is not None and self._spi_fits_in_memory(spi_ds.pr):
+            # Read the tile once: SPI and the annual indices below share the
+            # loaded values instead of each reading (and decompressing) the store
+            spi_ds = spi_ds.load(scheduler=self._spi_scheduler())
+            tile_ds = spi_ds
+        spi_indices = self.calculate_spi_indices(spi_ds, tile_spi_params, fit_key, start=spi_start)
+
+        # Calculate other indices (dry spell, intensity) - these use target years only
+        target_ds = tile_ds
+        if self.target_start_year and self.target_end_year:
+            target_ds = tile_ds.sel(
+                time=slice(f'{self.target_start_year}-01-01', f'{self.target_end_year}-12-31')
+            )
+        dry_spell_indices = self.calculate_dry_spell_indices(target_ds)
+        intensity_indices = self.calculate_precip_intensity_indices(target_ds, tile_baselines)
 
+        all_indices = {**spi_indices, **dry_spell_indices, **intensity_indices}
         return all_indices
 
-    def _calculate_all_indices(self, datasets: Dict[str, xr.Dataset]) -> Dict[str, xr.DataArray]:
+    def _data_start_year(self, start_year: int) -> int:
         """
-        Override to implement spatial tiling with SPI calibration period handling.
+        Load the SPI calibration period (1981-2010) along with the target years.
 
-        SPI requires full calibration period (1981-2010) plus target years.
-        We load the extended period, calculate indices, then filter to target years.
+        With saved SPI parameters, or once every tile's parameters were fitted
+        by an earlier temporal chunk that spanned the calibration period, only
+        the months preceding the target years that the longest SPI window
+        needs are loaded.
 
         Args:
-            datasets: Dictionary with 'precipitation' dataset
+            start_year: Start year of the temporal chunk
 
         Returns:
-            Dictionary mapping index name to calculated DataArray
+            Start year of the data to load
         """
-        ds = datasets['precipitation']
+        if self.spi_params is not None or len(self._fitted_spi_params) >= self.n_tiles:
+            return start_year - math.ceil((max(self.SPI_WINDOWS) - 1) / 12)
+        return min(start_year, int(self.spi_cal_start[:4]))
 
-        # Extract target years from the dataset
-        time_vals = ds.time.values
-        target_start_year = int(str(time_vals[0])[:4])
-        target_end_year = int(str(time_vals[-1])[:4])
+    def process_time_chunk(self, start_year: int, end_year: int, output_dir: Path):
+        """
+        Process a temporal chunk, recording its target years for tile processing.
 
-        # Store target years for filtering in _process_single_tile
-        self.target_start_year = target_start_year
-        self.target_end_year = target_end_year
+        The loaded data also covers the SPI calibration period (see
+        _data_start_year); every index is filtered back to these years.
 
-        # For SPI, need to load full calibration period (1981-2010) plus target years
-        spi_start_year = min(target_start_year, 1981)
+        Args:
+            start_year: Start year for this chunk
+            end_year: End year for this chunk
+            output_dir: Output directory
 
-        # Reload with extended period for SPI calibration
-        logger.info(f"Loading {spi_start_year}-{target_end_year} for SPI calibration...")
-        full_zarr = xr.open_zarr(
-            PipelineConfig.PRECIP_ZARR,
-            chunks=PipelineConfig.DEFAULT_CHUNKS
-        )
-        ds_extended = full_zarr.sel(time=slice(f'{spi_start_year}-01-01', f'{target_end_year}-12-31'))
+        Returns:
+            Path to output file, or None if no indices calculated
+        """
+        self.target_start_year = start_year
+        self.target_end_year = end_year
+        return super().process_time_chunk(start_year, end_year, output_dir)
+
+    def _calculate_all_indices(self, datasets: Dict[str, xr.Dataset]) -> Dict[str, xr.DataArray]:
+        """
+        Override to implement spatial tiling with SPI calibration period handling.
 
-        # Preprocess extended dataset
-        datasets_extended = {'precipitation': ds_extended}
-        datasets_extended = self._preprocess_datasets(datasets_extended)
-        ds_extended = datasets_extended['precipitation']
+        SPI requires full calibration period (1981-2010) plus target years, so
+        the dataset is loaded and preprocessed once over that extended period;
+        annual indices use a .sel of the target years from it.
+
+        Args:
+            datasets: Dictionary with 'precipitation' dataset (extended period)
+
+        Returns:
+            Dictionary mapping index name to calculated DataArray
+        """
+        ds_extended = datasets['precipitation']
 
         # Define expected dimensions for validation
         # Note: SPI indices have monthly frequency, others have annual
         # We'll validate based on annual indices
-        num_years = target_end_year - target_start_year + 1
+        num_years = self.target_end_year - self.target_start_year + 1
         expected_dims = {
             'time': num_years,  # Annual indices
             'lat': 621,
@@ -560,12 +829,19 @@ class DroughtPipeline(BasePipeline, SpatialTilingMixin):
         output_dir = Path('./outputs')
         output_dir.mkdir(parents=True, exist_ok=True)
 
-        # Use the mixin's spatial tiling functionality with extended dataset
-        all_indices = self.process_with_spatial_tiling(
-            ds=ds_extended,
-            output_dir=output_dir,
-            expected_dims=expected_dims
-        )
+        # Tiles select their SPI input from one open of the store (one metadata
+        # read, time selection and preprocessing per chunk instead of per tile)
+        self._spi_precip = self._open_spi_precip(ds_extended)
+        try:
+            # Use the mixin's spatial tiling functionality with extended dataset
+            all_indices = self.process_with_spatial_tiling(
+                ds=ds_extended,
+                output_dir=output_dir,
+                expected_dims=expected_dims,
+                defer_cleanup=True
+            )
+        finally:
+            self._spi_precip = None
 
         return all_indices
 
@@ -619,12 +895,15 @@ def main():
 """
 
     examples = """
-  # Process with 1 tile (no parallelism, recommended for drought to avoid threading deadlock)
+  # Process with 1 tile (no tile parallelism; SPI runs on Dask threads)
   python drought_pipeline.py --n-tiles 1
 
   # Process with 2 tiles (east/west split)
   python drought_pipeline.py --n-tiles 2
 
+  # Process 4 tiles as one Dask graph (tiles share the threaded scheduler)
+  python drought_pipeline.py --n-tiles 4 --tile-executor dask
+
   # Process single year
   python drought_pipeline.py --start-year 2023 --end-year 2023
 """
@@ -640,8 +919,15 @@ def main():
         '--n-tiles',
         type=int,
         default=4,
-        choices=[1, 2, 4, 8],
-        help='Number of spatial tiles: 1 (no tiling), 2 (east/west), 4 (quadrants), or 8 (octants) (default: 4)'
+        choices=[1, 2, 4, 8, 16, 32],
+        help='Number of spatial tiles: 1 (no tiling), 2 (east/west), 4 (quadrants), 8 (octants), or 16/32 (4x4/4x8 grids) (default: 4)'
+    )
+
+    parser.add_argument(
+        '--refit-spi-params',
+        action='store_true',
+        help=f'Fit the SPI gamma parameters over the calibration period and save them to '
+             f'{PipelineConfig.SPI_PARAMS_FILE} before processing (reused by later runs)'
     )
 
     args = parser.parse_args()
@@ -655,16 +941,26 @@ def main():
     # Create and run pipeline
     pipeline = DroughtPipeline(
         n_tiles=args.n_tiles,
+        tile_executor=args.tile_executor,
+        in_memory_tiles=args.in_memory_tiles,
+        tile_format=args.tile_format,
+        compress_tiles=args.compress_tiles,
         chunk_years=args.chunk_years,
-        enable_dashboard=args.dashboard
+        enable_dashboard=args.dashboard,
+        output_format=args.output_format,
+        parallel_chunks=args.parallel_chunks
     )
 
     try:
-        output_files = pipeline.run(
-            start_year=args.start_year,
-            end_year=args.end_year,
-            output_dir=args.output_dir
-        )
+        if args.refit_spi_params:
+            pipeline.save_spi_params()
+
+        with PipelineCLI.profiling(args):
+            output_files = pipeline.run(
+                start_year=args.start_year,
+                end_year=args.end_year,
+                output_dir=args.output_dir
+            )
 
         if output_files:
             print(f"\n✓ Successfully generated {len(output_files)} output files:")
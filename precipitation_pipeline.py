@@ -15,6 +15,7 @@ import xarray as xr
 import xclim.indicators.atmos as atmos
 
 from core import BasePipeline, PipelineConfig, BaselineLoader, PipelineCLI, SpatialTilingMixin
+from core.precip_stats import annual_dry_wet_indices
 
 logger = logging.getLogger(__name__)
 
@@ -29,15 +30,49 @@ class PrecipitationPipeline(BasePipeline, SpatialTilingMixin):
     - Extreme (2): r95p, r99p (percentile-based using 1981-2000 baseline)
     - Threshold (2): r10mm, r20mm (fixed thresholds)
     - Enhanced Phase 6 (3): dry_days, wetdays, wetdays_prop
+
+    cdd, sdii and dry_days share one pass over the daily values (see
+    core.precip_stats) and are returned with the basic indices.
     """
 
-    def __init__(self, n_tiles: int = 4, **kwargs):
+    # Packed output encodings (halves the written volume versus float32).
+    # Quantization: annual totals 0.2 mm (up to 13106 mm), 1- and 5-day
+    # maxima 0.1 mm (up to 6553 mm), daily intensity 0.01 mm/day,
+    # proportions 1e-4; day counts are exact integers.
+    # scale_factor=1 keeps day counts (units 'days') decoding to floats with NaN
+    # instead of timedelta-style integers
+    _DAY_COUNT_PACKING = {'dtype': 'uint16', 'scale_factor': 1.0, 'add_offset': 0.0, '_FillValue': 65535}
+    _MAX_AMOUNT_PACKING = {'dtype': 'uint16', 'scale_factor': 0.1, 'add_offset': 0.0, '_FillValue': 65535}
+    OUTPUT_PACKING = {
+        'prcptot': {'dtype': 'uint16', 'scale_factor': 0.2, 'add_offset': 0.0, '_FillValue': 65535},
+        'rx1day': _MAX_AMOUNT_PACKING,
+        'rx5day': _MAX_AMOUNT_PACKING,
+        'sdii': {'dtype': 'int16', 'scale_factor': 0.01, 'add_offset': 0.0, '_FillValue': -32768},
+        **dict.fromkeys(
+            ['cdd', 'cwd', 'dry_days', 'r95p', 'r99p', 'r10mm', 'r20mm', 'wetdays'], _DAY_COUNT_PACKING
+        ),
+        'wetdays_prop': {'dtype': 'int16', 'scale_factor': 1e-4, 'add_offset': 0.0, '_FillValue': -32768},
+    }
+
+    def __init__(
+        self,
+        n_tiles: int = 4,
+        tile_executor: str = 'threads',
+        in_memory_tiles: bool = False,
+        tile_format: str = 'netcdf',
+        compress_tiles: bool = False,
+        **kwargs
+    ):
         """
         Initialize the pipeline with parallel spatial tiling.
 
         Args:
-            n_tiles: Number of spatial tiles (2, 4, or 8, default: 4 for quadrants)
-            **kwargs: Additional arguments passed to BasePipeline (chunk_years, enable_dashboard)
+            n_tiles: Number of spatial tiles (2, 4, 8, 16, or 32, default: 4 for quadrants)
+            tile_executor: Run tiles on 'threads' (default), 'processes', or 'dask'
+            in_memory_tiles: Merge tiles in memory instead of via tile files
+            tile_format: Intermediate tile file format, 'netcdf' (default) or 'zarr'
+            compress_tiles: Compress intermediate tile files (default: False)
+            **kwargs: Additional arguments passed to BasePipeline (chunk_years, enable_dashboard, output_format, parallel_chunks)
         """
         # Initialize BasePipeline
         BasePipeline.__init__(
@@ -48,7 +83,14 @@ class PrecipitationPipeline(BasePipeline, SpatialTilingMixin):
         )
 
         # Initialize SpatialTilingMixin
-        SpatialTilingMixin.__init__(self, n_tiles=n_tiles)
+        SpatialTilingMixin.__init__(
+            self,
+            n_tiles=n_tiles,
+            tile_executor=tile_executor,
+            in_memory_merge=in_memory_tiles,
+            tile_format=tile_format,
+            compress_tiles=compress_tiles
+        )
 
         # Load baseline percentiles for extreme indices
         self.baseline_loader = BaselineLoader()
@@ -89,10 +131,10 @@ class PrecipitationPipeline(BasePipeline, SpatialTilingMixin):
         Calculate all precipitation indices for a single spatial region.
 
         Combines four calculation methods:
-        - Basic precipitation indices (6 indices)
+        - Basic precipitation indices (6 indices, plus dry_days)
         - Extreme percentile-based indices (2 indices)
         - Threshold indices (2 indices)
-        - Enhanced precipitation indices (3 indices)
+        - Enhanced precipitation indices (wetdays, wetdays_prop)
 
         Args:
             datasets: Dictionary with 'precipitation' dataset
@@ -116,11 +158,16 @@ class PrecipitationPipeline(BasePipeline, SpatialTilingMixin):
         """
         Calculate precipitation-based climate indices.
 
+        cdd, sdii and dry_days classify the same daily values against the
+        same 1 mm/day threshold, so they come from one fused pass
+        (core.precip_stats.annual_dry_wet_indices) instead of three xclim
+        indicators that each traverse the data.
+
         Args:
             ds: Dataset with precipitation variable (pr)
 
         Returns:
-            Dictionary of calculated indices
+            Dictionary of calculated indices (including dry_days)
         """
         indices = {}
 
@@ -135,18 +182,15 @@ class PrecipitationPipeline(BasePipeline, SpatialTilingMixin):
             indices['rx5day'] = atmos.max_n_day_precipitation_amount(
                 ds.pr, window=5, freq='YS'
             )
-            logger.info("  - Calculating consecutive dry days...")
-            indices['cdd'] = atmos.maximum_consecutive_dry_days(
-                ds.pr, thresh='1 mm/day', freq='YS'
-            )
+            logger.info("  - Calculating consecutive dry days, dry days and daily intensity (one pass)...")
+            dry_wet = annual_dry_wet_indices(ds.pr, thresh='1 mm/day')
+            indices['cdd'] = dry_wet['cdd']
+            indices['sdii'] = dry_wet['sdii']
+            indices['dry_days'] = dry_wet['dry_days']
             logger.info("  - Calculating consecutive wet days...")
             indices['cwd'] = atmos.maximum_consecutive_wet_days(
                 ds.pr, thresh='1 mm/day', freq='YS'
             )
-            logger.info("  - Calculating daily precipitation intensity...")
-            indices['sdii'] = atmos.daily_pr_intensity(
-                ds.pr, thresh='1 mm/day', freq='YS'
-            )
 
         return indices
 
@@ -234,7 +278,8 @@ class PrecipitationPipeline(BasePipeline, SpatialTilingMixin):
         Calculate enhanced precipitation analysis indices (Phase 6).
 
         Adds 3 new distinct indices complementing the existing 10:
-        - dry_days: Total number of dry days (< 1mm)
+        - dry_days: Total number of dry days (< 1mm), computed with cdd and
+          sdii in calculate_precipitation_indices()
         - wetdays: Total number of wet days (>= 1mm)
         - wetdays_prop: Proportion of days that are wet
 
@@ -253,14 +298,6 @@ class PrecipitationPipeline(BasePipeline, SpatialTilingMixin):
             logger.warning("No precipitation variable found for enhanced precipitation indices")
             return indices
 
-        # dry_days: Total number of dry days (pr < 1mm)
-        logger.info("  - Calculating dry_days (total dry days < 1mm)...")
-        indices['dry_days'] = atmos.dry_days(
-            pr=ds.pr,
-            thresh='1 mm/day',
-            freq='YS'
-        )
-
         # wetdays: Total number of wet days (pr >= 1mm)
         logger.info("  - Calculating wetdays (total wet days >= 1mm)...")
         indices['wetdays'] = atmos.wetdays(
@@ -304,27 +341,16 @@ class PrecipitationPipeline(BasePipeline, SpatialTilingMixin):
         logger.info(f"  Processing tile: {tile_name}")
 
         # Select spatial subset
-        tile_ds = ds.isel(lat=lat_slice, lon=lon_slice)
+        tile_ds = self._select_tile(ds, lat_slice, lon_slice)
 
         # Subset baseline percentiles to match tile
         # Use lock to prevent concurrent access to shared baseline data
         with self.baseline_lock:
-            tile_baselines = {}
-            for key, baseline in self.baselines.items():
-                # Slice spatial dimensions first
-                tile_baseline = baseline.isel(lat=lat_slice, lon=lon_slice)
-
-                # Rechunk to match tile data structure (prevents implicit dask rechunk operations)
-                # This eliminates 2-3x hidden memory overhead during percentile-based index calculations
-                if hasattr(tile_ds, 'chunks') and hasattr(tile_baseline, 'chunk'):
-                    chunk_dict = {
-                        'lat': tile_ds.chunks.get('lat', (-1,))[0] if 'lat' in tile_ds.chunks else -1,
-                        'lon': tile_ds.chunks.get('lon', (-1,))[0] if 'lon' in tile_ds.chunks else -1,
-                        'dayofyear': -1  # Keep temporal dimension together for efficiency
-                    }
-                    tile_baseline = tile_baseline.chunk(chunk_dict)
-
-                tile_baselines[key] = tile_baseline
+            # Rechunked to match the tile (prevents implicit dask rechunk operations);
+            # subsets are cached by the loader and reused across temporal chunks
+            tile_baselines = self.baseline_loader.get_tile_baselines(
+                self.baselines, lat_slice, lon_slice, tile_ds=tile_ds
+            )
 
         # Calculate indices for this tile
         basic_indices = self.calculate_precipitation_indices(tile_ds)
@@ -370,7 +396,8 @@ class PrecipitationPipeline(BasePipeline, SpatialTilingMixin):
         all_indices = self.process_with_spatial_tiling(
             ds=ds,
             output_dir=output_dir,
-            expected_dims=expected_dims
+            expected_dims=expected_dims,
+            defer_cleanup=True
         )
 
         return all_indices
@@ -443,8 +470,8 @@ def main():
         '--n-tiles',
         type=int,
         default=4,
-        choices=[2, 4, 8],
-        help='Number of spatial tiles: 2 (east/west), 4 (quadrants), or 8 (octants) (default: 4)'
+        choices=[2, 4, 8, 16, 32],
+        help='Number of spatial tiles: 2 (east/west), 4 (quadrants), 8 (octants), or 16/32 (4x4/4x8 grids) (default: 4)'
     )
 
     args = parser.parse_args()
@@ -458,16 +485,23 @@ def main():
     # Create and run pipeline
     pipeline = PrecipitationPipeline(
         n_tiles=args.n_tiles,
+        tile_executor=args.tile_executor,
+        in_memory_tiles=args.in_memory_tiles,
+        tile_format=args.tile_format,
+        compress_tiles=args.compress_tiles,
         chunk_years=args.chunk_years,
-        enable_dashboard=args.dashboard
+        enable_dashboard=args.dashboard,
+        output_format=args.output_format,
+        parallel_chunks=args.parallel_chunks
     )
 
     try:
-        output_files = pipeline.run(
-            start_year=args.start_year,
-            end_year=args.end_year,
-            output_dir=args.output_dir
-        )
+        with PipelineCLI.profiling(args):
+            output_files = pipeline.run(
+                start_year=args.start_year,
+                end_year=args.end_year,
+                output_dir=args.output_dir
+            )
 
         if output_files:
             print(f"\n✓ Successfully generated {len(output_files)} output files:")
@@ -44,13 +44,25 @@ class TemperaturePipeline(BasePipeline, SpatialTilingMixin):
         'heat_wave_index'
     ]
 
-    def __init__(self, n_tiles: int = 4, **kwargs):
+    def __init__(
+        self,
+        n_tiles: int = 4,
+        tile_executor: str = 'threads',
+        in_memory_tiles: bool = False,
+        tile_format: str = 'netcdf',
+        compress_tiles: bool = False,
+        **kwargs
+    ):
         """
         Initialize the pipeline with parallel spatial tiling.
 
         Args:
             n_tiles: Number of spatial tiles (2 or 4, default: 4 for quadrants)
-            **kwargs: Additional arguments passed to BasePipeline (chunk_years, enable_dashboard)
+            tile_executor: Run tiles on 'threads' (default), 'processes', or 'dask'
+            in_memory_tiles: Merge tiles in memory instead of via tile files
+            tile_format: Intermediate tile file format, 'netcdf' (default) or 'zarr'
+            compress_tiles: Compress intermediate tile files (default: False)
+            **kwargs: Additional arguments passed to BasePipeline (chunk_years, enable_dashboard, output_format, parallel_chunks)
         """
         # Initialize BasePipeline
         BasePipeline.__init__(
@@ -61,7 +73,14 @@ class TemperaturePipeline(BasePipeline, SpatialTilingMixin):
         )
 
         # Initialize SpatialTilingMixin
-        SpatialTilingMixin.__init__(self, n_tiles=n_tiles)
+        SpatialTilingMixin.__init__(
+            self,
+            n_tiles=n_tiles,
+            tile_executor=tile_executor,
+            in_memory_merge=in_memory_tiles,
+            tile_format=tile_format,
+            compress_tiles=compress_tiles
+        )
 
         # Load baseline percentiles for extreme indices
         self.baseline_loader = BaselineLoader()
@@ -448,16 +467,28 @@ class TemperaturePipeline(BasePipeline, SpatialTilingMixin):
             Exception: If fix fails for any index (re-raised with context)
         """
         try:
+            # Metadata-only: edit the underlying Variable attrs in place so no
+            # DataArray wrappers are built and lazy data is never touched.
+            # Runs on every tile and on the merged dataset, so per-index
+            # messages are logged at debug level with a single info summary.
+            fixed = []
             for idx_name in self.COUNT_INDICES:
-                if idx_name in ds.data_vars:
-                    original_units = ds[idx_name].attrs.get('units', 'days')
+                variable = ds.variables.get(idx_name)
+                if variable is None:
+                    continue
+
+                original_units = variable.attrs.get('units', 'days')
 
-                    # Only fix if units='days' or 'day' (the problematic cases)
-                    if original_units in ['days', 'day']:
-                        ds[idx_name].attrs['units'] = '1'
-                        ds[idx_name].attrs['comment'] = f'Count of days (dimensionless to avoid CF timedelta encoding). Original units: {original_units}'
+                # Only fix if units='days' or 'day' (the problematic cases)
+                if original_units in ('days', 'day'):
+                    variable.attrs['units'] = '1'
+                    variable.attrs['comment'] = f'Count of days (dimensionless to avoid CF timedelta encoding). Original units: {original_units}'
+                    fixed.append(idx_name)
 
-                        logger.info(f"Fixed {idx_name}: units='{original_units}' → units='1' (dimensionless)")
+                    logger.debug(f"Fixed {idx_name}: units='{original_units}' → units='1' (dimensionless)")
+
+            if fixed:
+                logger.info(f"Fixed units of {len(fixed)} count indices → units='1' (dimensionless)")
 
             return ds
 
@@ -490,27 +521,16 @@ class TemperaturePipeline(BasePipeline, SpatialTilingMixin):
         logger.info(f"  Processing tile: {tile_name}")
 
         # Select spatial subset
-        tile_ds = ds.isel(lat=lat_slice, lon=lon_slice)
+        tile_ds = self._select_tile(ds, lat_slice, lon_slice)
 
         # Subset baseline percentiles to match tile
         # Use lock to prevent concurrent access to shared baseline data
         with self.baseline_lock:
-            tile_baselines = {}
-            for key, baseline in self.baselines.items():
-                # Slice spatial dimensions first
-                tile_baseline = baseline.isel(lat=lat_slice, lon=lon_slice)
-
-                # Rechunk to match tile data structure (prevents implicit dask rechunk operations)
-                # This eliminates 2-3x hidden memory overhead during percentile-based index calculations
-                if hasattr(tile_ds, 'chunks') and hasattr(tile_baseline, 'chunk'):
-                    chunk_dict = {
-                        'lat': tile_ds.chunks.get('lat', (-1,))[0] if 'lat' in tile_ds.chunks else -1,
-                        'lon': tile_ds.chunks.get('lon', (-1,))[0] if 'lon' in tile_ds.chunks else -1,
-                        'dayofyear': -1  # Keep temporal dimension together for efficiency
-                    }
-                    tile_baseline = tile_baseline.chunk(chunk_dict)
-
-                tile_baselines[key] = tile_baseline
+            # Rechunked to match the tile (prevents implicit dask rechunk operations);
+            # subsets are cached by the loader and reused across temporal chunks
+            tile_baselines = self.baseline_loader.get_tile_baselines(
+                self.baselines, lat_slice, lon_slice, tile_ds=tile_ds
+            )
 
         # Calculate indices for this tile
         basic_indices = self.calculate_temperature_indices(tile_ds)
@@ -555,7 +575,8 @@ class TemperaturePipeline(BasePipeline, SpatialTilingMixin):
         all_indices = self.process_with_spatial_tiling(
             ds=ds,
             output_dir=output_dir,
-            expected_dims=expected_dims
+            expected_dims=expected_dims,
+            defer_cleanup=True
         )
 
         return all_indices
@@ -640,16 +661,23 @@ def main():
     # Create and run pipeline
     pipeline = TemperaturePipeline(
         n_tiles=args.n_tiles,
+        tile_executor=args.tile_executor,
+        in_memory_tiles=args.in_memory_tiles,
+        tile_format=args.tile_format,
+        compress_tiles=args.compress_tiles,
         chunk_years=args.chunk_years,
-        enable_dashboard=args.dashboard
+        enable_dashboard=args.dashboard,
+        output_format=args.output_format,
+        parallel_chunks=args.parallel_chunks
     )
 
     try:
-        output_files = pipeline.run(
-            start_year=args.start_year,
-            end_year=args.end_year,
-            output_dir=args.output_dir
-        )
+        with PipelineCLI.profiling(args):
+            output_files = pipeline.run(
+                start_year=args.start_year,
+                end_year=args.end_year,
+                output_dir=args.output_dir
+            )
 
         if output_files:
             print(f"\n✓ Successfully generated {len(output_files)} output files:")
@@ -0,0 +1,417 @@
+#!/usr/bin/env python3
+"""
+Integration tests for Drought Pipeline helpers.
+
+Tests drought-specific processing steps:
+- Time-contiguous reads of precipitation for SPI
+- Vectorized multi-window SPI, computed once with its quality checks
+- Preloading a tile's precipitation for SPI (and the annual indices) when it fits in memory
+- Threaded SPI computation outside of parallel tile threads
+- Fused annual dry spell / intensity indices and the heavy precipitation fraction
+- Saved SPI gamma parameters
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+import xarray as xr
+import xclim.indicators.atmos as atmos
+
+from core.config import PipelineConfig
+from core.spi import spi_gamma
+from drought_pipeline import DroughtPipeline
+
+
+class TestDroughtSpiInput:
+    """Test the precipitation read used for SPI fitting."""
+
+    def test_spi_chunks_are_time_contiguous_store_multiples(self, mock_pipeline_config):
+        """Test that SPI chunks span full time in whole multiples of the store chunks."""
+        pipeline = DroughtPipeline(n_tiles=2)
+
+        chunks = pipeline._spi_chunks(n_time=365 * 30)
+
+        assert chunks['time'] == -1
+        assert chunks['lat'] % pipeline.chunk_config['lat'] == 0
+        assert chunks['lon'] % pipeline.chunk_config['lon'] == 0
+
+    def test_load_spi_precip_matches_tile(self, mock_pipeline_config):
+        """Test that the SPI read holds the tile's values in one time chunk."""
+        pipeline = DroughtPipeline(n_tiles=2)
+        ds = pipeline._preprocess_datasets({
+            'precipitation': pipeline._load_zarr_data(PipelineConfig.PRECIP_ZARR, 2022, 2023)
+        })['precipitation']
+        lat_slice, lon_slice = slice(0, 5), slice(2, 8)
+        tile_ds = pipeline._select_tile(ds, lat_slice, lon_slice)
+
+        spi_ds = pipeline._load_spi_precip(tile_ds, lat_slice, lon_slice)
+
+        assert spi_ds.pr.chunks[0] == (tile_ds.sizes['time'],)
+        xr.testing.assert_identical(spi_ds.pr.compute(), tile_ds.pr.compute())
+
+    def test_tiles_share_one_spi_store_open(self, mock_pipeline_config, monkeypatch):
+        """Test that tiles select their SPI input from the dataset opened once per chunk."""
+        pipeline = DroughtPipeline(n_tiles=2)
+        ds = pipeline._preprocess_datasets({
+            'precipitation': pipeline._load_zarr_data(PipelineConfig.PRECIP_ZARR, 2022, 2023)
+        })['precipitation']
+        pipeline._spi_precip = pipeline._open_spi_precip(ds)
+        opens = []
+        monkeypatch.setattr(pipeline, '_open_zarr_store', lambda *args: opens.append(args))
+
+        for lat_slice, lon_slice in [(slice(0, 5), slice(0, 10)), (slice(5, 10), slice(10, 20))]:
+            tile_ds = pipeline._select_tile(ds, lat_slice, lon_slice)
+            spi_ds = pipeline._load_spi_precip(tile_ds, lat_slice, lon_slice)
+            xr.testing.assert_identical(spi_ds.pr.compute(), tile_ds.pr.compute())
+
+        assert not opens
+
+    def test_calculate_spi_indices_computes_once(self, mock_pipeline_config, monkeypatch):
+        """Test that SPI and its quality checks share one gamma transform."""
+        time = pd.date_range('1981-01-01', '1982-12-31', freq='D')
+        pr = np.random.default_rng(0).gamma(0.5, 4.0, size=(len(time), 2, 3)).astype(np.float32)
+        precip_ds = xr.Dataset(
+            {'pr': (['time', 'lat', 'lon'], pr, {'units': 'mm/d'})},
+            coords={'time': time, 'lat': [40.0, 41.0], 'lon': [-100.0, -99.0, -98.0]}
+        ).chunk({'time': -1, 'lat': 1})
+
+        pipeline = DroughtPipeline(n_tiles=2)
+        pipeline.spi_cal_start, pipeline.spi_cal_end = '1981-01-01', '1982-12-31'
+        calls = []
+        monkeypatch.setattr(
+            'core.spi.spi_gamma', lambda *args, **kwargs: calls.append(args) or spi_gamma(*args, **kwargs)
+        )
+        # No memory to preload the tile: SPI runs lazily per block
+        monkeypatch.setattr('drought_pipeline.psutil.virtual_memory', lambda: SimpleNamespace(available=0))
+        indices = pipeline.calculate_spi_indices(precip_ds)
+
+        # One call per spatial block (lat is chunked by 1)
+        assert len(calls) == 2
+        assert all(spi.chunks is None for spi in indices.values())
+        assert indices['spi_1month'].notnull().all()
+
+    def test_calculate_spi_indices_preloads_tile(self, mock_pipeline_config, monkeypatch):
+        """Test that a tile fitting in memory is loaded and matches the lazy SPI."""
+        time = pd.date_range('1981-01-01', '1982-12-31', freq='D')
+        pr = np.random.default_rng(0).gamma(0.5, 4.0, size=(len(time), 2, 3)).astype(np.float32)
+        precip_ds = xr.Dataset(
+            {'pr': (['time', 'lat', 'lon'], pr, {'units': 'mm/d'})},
+            coords={'time': time, 'lat': [40.0, 41.0], 'lon': [-100.0, -99.0, -98.0]}
+        ).chunk({'time': -1, 'lat': 1})
+
+        pipeline = DroughtPipeline(n_tiles=2)
+        pipeline.spi_cal_start, pipeline.spi_cal_end = '1981-01-01', '1982-12-31'
+        calls = []
+        monkeypatch.setattr(
+            'core.spi.spi_gamma', lambda *args, **kwargs: calls.append(args) or spi_gamma(*args, **kwargs)
+        )
+        preloaded = pipeline.calculate_spi_indices(precip_ds)
+
+        # The whole tile is transformed in one call
+        assert len(calls) == 1
+
+        monkeypatch.setattr('drought_pipeline.psutil.virtual_memory', lambda: SimpleNamespace(available=0))
+        lazy = pipeline.calculate_spi_indices(precip_ds)
+        for var_name, spi in preloaded.items():
+            xr.testing.assert_allclose(spi, lazy[var_name])
+
+    def test_calculate_spi_indices_from_start(self, mock_pipeline_config):
+        """Test that SPI is returned from start only, matching the full series there."""
+        time = pd.date_range('1981-01-01', '1984-12-31', freq='D')
+        pr = np.random.default_rng(0).gamma(0.5, 4.0, size=(len(time), 2, 3)).astype(np.float32)
+        precip_ds = xr.Dataset(
+            {'pr': (['time', 'lat', 'lon'], pr, {'units': 'mm/d'})},
+            coords={'time': time, 'lat': [40.0, 41.0], 'lon': [-100.0, -99.0, -98.0]}
+        )
+
+        pipeline = DroughtPipeline(n_tiles=2)
+        pipeline.spi_cal_start, pipeline.spi_cal_end = '1981-01-01', '1983-12-31'
+        full = pipeline.calculate_spi_indices(precip_ds, fit_key='tile')
+        from_start = pipeline.calculate_spi_indices(
+            precip_ds, pipeline._fitted_spi_params['tile'], start='1984-01-01'
+        )
+
+        for var_name, spi in from_start.items():
+            assert spi.sizes['time'] == 12
+            xr.testing.assert_equal(spi, full[var_name].sel(time=slice('1984-01-01', None)))
+
+    def test_calculate_spi_indices_all_windows(self, mock_pipeline_config):
+        """Test that all five SPI windows are computed in one pass with SPI metadata."""
+        time = pd.date_range('1981-01-01', '1985-12-31', freq='D')
+        rng = np.random.default_rng(0)
+        pr = rng.gamma(0.5, 4.0, size=(len(time), 2, 3)).astype(np.float32)
+        precip_ds = xr.Dataset(
+            {'pr': (['time', 'lat', 'lon'], pr, {'units': 'mm/d'})},
+            coords={'time': time, 'lat': [40.0, 41.0], 'lon': [-100.0, -99.0, -98.0]}
+        )
+
+        pipeline = DroughtPipeline(n_tiles=2)
+        pipeline.spi_cal_start, pipeline.spi_cal_end = '1981-01-01', '1985-12-31'
+        indices = pipeline.calculate_spi_indices(precip_ds)
+
+        assert list(indices) == ['spi_1month', 'spi_3month', 'spi_6month', 'spi_12month', 'spi_24month']
+        for var_name, spi in indices.items():
+            assert spi.dims == ('time', 'lat', 'lon')
+            assert spi.sizes['time'] == 60
+            assert spi.attrs['units'] == '1'
+        assert indices['spi_24month'].isel(time=slice(0, 23)).isnull().all()
+
+    def test_spi_scheduler_follows_tile_threads(self):
+        """Test that SPI uses Dask threads unless the tile already runs in a tile thread."""
+        assert DroughtPipeline._spi_scheduler() == 'threads'
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            assert executor.submit(DroughtPipeline._spi_scheduler).result() == 'synchronous'
+
+
+class TestDroughtInputValidation:
+    """Test the shared precipitation check of the index calculations."""
+
+    @pytest.mark.parametrize('method', [
+        'calculate_spi_indices', 'calculate_dry_spell_indices', 'calculate_precip_intensity_indices'
+    ])
+    def test_missing_pr_raises(self, mock_pipeline_config, method):
+        """Test that every index group rejects a dataset without 'pr'."""
+        pipeline = DroughtPipeline(n_tiles=2)
+        ds = xr.Dataset({'tas': (['time'], np.zeros(3))}, coords={'time': pd.date_range('2023-01-01', periods=3)})
+
+        with pytest.raises(ValueError, match="'pr' not found.*tas"):
+            getattr(pipeline, method)(ds)
+
+
+class TestDroughtDrySpellIndices:
+    """Test the fused annual dry/wet-day indices."""
+
+    def test_dry_spell_indices_include_sdii(self, mock_pipeline_config, sample_precipitation_dataset):
+        """Test that cdd, dry_days, dry spells and sdii come from the single fused pass."""
+        pipeline = DroughtPipeline(n_tiles=2)
+        precip_ds = pipeline._preprocess_datasets({'precipitation': sample_precipitation_dataset})['precipitation']
+
+        indices = pipeline.calculate_dry_spell_indices(precip_ds)
+
+        assert set(indices) == {'cdd', 'dry_days', 'sdii', 'dry_spell_frequency', 'dry_spell_total_length'}
+        assert indices['cdd'].attrs['units'] == 'days'
+        assert (indices['dry_days'] >= indices['cdd']).all()
+        assert (indices['dry_days'] >= indices['dry_spell_total_length']).all()
+        assert (indices['dry_spell_total_length'] >= 3 * indices['dry_spell_frequency']).all()
+
+
+class TestDroughtIntensityIndices:
+    """Test the precipitation intensity indices."""
+
+    def test_fraction_heavy_precip_matches_xclim(self, mock_pipeline_config):
+        """Test that the one-pass heavy precipitation fraction matches the xclim indicator."""
+        time = pd.date_range('2021-01-01', '2022-12-31', freq='D')
+        rng = np.random.default_rng(0)
+        coords = {'lat': [40.0, 41.0], 'lon': [-100.0, -99.0, -98.0]}
+        precip_ds = xr.Dataset(
+            {'pr': (['time', 'lat', 'lon'], rng.gamma(0.5, 4.0, size=(len(time), 2, 3)).astype(np.float32),
+                    {'units': 'mm d-1', 'standard_name': 'precipitation_flux'})},
+            coords={'time': time, **coords}
+        ).chunk({'time': 365})
+        pr_75p = xr.DataArray(
+            rng.gamma(2.0, 3.0, size=(366, 2, 3)), dims=['dayofyear', 'lat', 'lon'],
+            coords={'dayofyear': np.arange(1, 367), **coords}, attrs={'units': 'mm d-1'}
+        )
+
+        pipeline = DroughtPipeline(n_tiles=2)
+        pipeline.baselines = {'pr_75p_threshold': pr_75p}
+        indices = pipeline.calculate_precip_intensity_indices(precip_ds)
+
+        expected = atmos.fraction_over_precip_thresh(pr=precip_ds.pr, pr_per=pr_75p, freq='YS')
+        fraction = indices['fraction_heavy_precip']
+        assert fraction.attrs['units'] == '1'
+        np.testing.assert_allclose(fraction.values, expected.values, rtol=1e-6)
+
+
+class TestDroughtCalibrationPeriod:
+    """Test loading the SPI calibration period with the target years."""
+
+    def test_data_start_year_covers_calibration(self, mock_pipeline_config):
+        """Test that chunks load data from the start of the SPI calibration period."""
+        pipeline = DroughtPipeline(n_tiles=2)
+
+        assert pipeline._data_start_year(2023) == 1981
+        assert pipeline._data_start_year(1975) == 1975
+
+    def test_annual_indices_use_target_years(self, mock_pipeline_config, monkeypatch):
+        """Test that annual indices are a .sel of the target years from the extended data."""
+        pipeline = DroughtPipeline(n_tiles=2)
+        pipeline.spi_cal_start, pipeline.spi_cal_end = '2022-01-01', '2022-12-31'
+        pipeline.target_start_year = pipeline.target_end_year = 2023
+        monkeypatch.setattr(pipeline, 'calculate_precip_intensity_indices', lambda ds, baselines=None: {})
+
+        ds = pipeline._preprocess_datasets({
+            'precipitation': pipeline._load_zarr_data(PipelineConfig.PRECIP_ZARR, 2022, 2023)
+        })['precipitation']
+        indices = pipeline._process_single_tile(ds, slice(0, 10), slice(0, 10), 'west')
+
+        np.testing.assert_array_equal(indices['cdd'].time.dt.year, [2023])
+        assert (indices['spi_1month'].time.dt.year == 2023).all()
+
+    def test_loaded_tile_shared_with_annual_indices(self, mock_pipeline_config, monkeypatch):
+        """Test that a tile loaded for SPI feeds the annual indices, matching the lazy reads."""
+        pipeline = DroughtPipeline(n_tiles=2)
+        pipeline.spi_cal_start, pipeline.spi_cal_end = '2022-01-01', '2022-12-31'
+        pipeline.target_start_year = pipeline.target_end_year = 2023
+        inputs = []
+        monkeypatch.setattr(
+            pipeline, 'calculate_precip_intensity_indices', lambda ds, baselines=None: inputs.append(ds) or {}
+        )
+        ds = pipeline._preprocess_datasets({
+            'precipitation': pipeline._load_zarr_data(PipelineConfig.PRECIP_ZARR, 2022, 2023)
+        })['precipitation']
+
+        shared = pipeline._process_single_tile(ds, slice(0, 10), slice(0, 10), 'west')
+        monkeypatch.setattr('drought_pipeline.psutil.virtual_memory', lambda: SimpleNamespace(available=0))
+        lazy = pipeline._process_single_tile(ds, slice(0, 10), slice(0, 10), 'west')
+
+        assert inputs[0].pr.chunks is None and inputs[1].pr.chunks is not None
+        for name in ('cdd', 'dry_days', 'sdii', 'spi_3month'):
+            xr.testing.assert_allclose(shared[name].compute(), lazy[name].compute())
+
+    def test_tile_baselines_are_passed_explicitly(self, mock_pipeline_config, monkeypatch):
+        """Test that tiles get their baseline subset as an argument, leaving self.baselines untouched."""
+        pipeline = DroughtPipeline(n_tiles=2)
+        pipeline.spi_cal_start, pipeline.spi_cal_end = '2022-01-01', '2022-12-31'
+        pipeline.target_start_year = pipeline.target_end_year = 2023
+        received = []
+        monkeypatch.setattr(
+            pipeline, 'calculate_precip_intensity_indices',
+            lambda ds, baselines=None: received.append((ds, baselines, pipeline.baselines)) or {}
+        )
+        ds = pipeline._preprocess_datasets({
+            'precipitation': pipeline._load_zarr_data(PipelineConfig.PRECIP_ZARR, 2022, 2023)
+        })['precipitation']
+        shared_baselines = {'pr_75p_threshold': ds.pr.isel(time=0, drop=True).expand_dims(dayofyear=[1])}
+        pipeline.baselines = shared_baselines
+        pipeline._process_single_tile(ds, slice(0, 10), slice(0, 10), 'west')
+
+        (tile_ds, tile_baselines, during), = received
+        assert during is shared_baselines and pipeline.baselines is shared_baselines
+        assert tile_baselines['pr_75p_threshold'].sizes['lat'] == tile_ds.sizes['lat']
+        assert tile_baselines['pr_75p_threshold'].sizes['lon'] == tile_ds.sizes['lon']
+
+
+class TestDroughtSpiParams:
+    """Test reusing SPI gamma parameters saved for the calibration period."""
+
+    def test_save_and_reuse_spi_params(self, mock_pipeline_config, monkeypatch, tmp_path):
+        """Test that saved parameters are reloaded and give the same SPI as fitting."""
+        monkeypatch.setattr(PipelineConfig, 'SPI_PARAMS_FILE', str(tmp_path / 'spi_params.nc'))
+        pipeline = DroughtPipeline(n_tiles=2)
+        assert pipeline.spi_params is None
+        assert pipeline._data_start_year(2023) == 1981
+
+        pipeline.spi_cal_start, pipeline.spi_cal_end = '2022-01-01', '2023-12-31'
+        pipeline.save_spi_params()
+
+        assert pipeline.spi_params is not None
+        assert set(pipeline.spi_params.data_vars) == {'shape', 'scale', 'prob_zero'}
+        assert pipeline._data_start_year(2023) == 2021
+
+        ds = pipeline._preprocess_datasets({
+            'precipitation': pipeline._load_zarr_data(PipelineConfig.PRECIP_ZARR, 2022, 2023)
+        })['precipitation']
+        lat_slice, lon_slice = slice(0, 5), slice(2, 8)
+        tile_ds = pipeline._select_tile(ds, lat_slice, lon_slice)
+
+        fitted = pipeline.calculate_spi_indices(tile_ds)
+        reused = pipeline.calculate_spi_indices(tile_ds, pipeline.spi_params.isel(lat=lat_slice, lon=lon_slice))
+
+        for var_name in DroughtPipeline.SPI_WINDOWS.values():
+            xr.testing.assert_allclose(reused[var_name].compute(), fitted[var_name].compute())
+
+    def test_fitted_spi_params_reused_across_chunks(self, mock_pipeline_config, monkeypatch):
+        """Test that without saved parameters each tile is fitted once and reused by later chunks."""
+        pipeline = DroughtPipeline(n_tiles=2)
+        pipeline.spi_cal_start, pipeline.spi_cal_end = '2022-01-01', '2022-12-31'
+        pipeline.target_start_year = pipeline.target_end_year = 2023
+        monkeypatch.setattr(pipeline, 'calculate_precip_intensity_indices', lambda ds, baselines=None: {})
+        ds = pipeline._preprocess_datasets({
+            'precipitation': pipeline._load_zarr_data(PipelineConfig.PRECIP_ZARR, 2022, 2023)
+        })['precipitation']
+        tiles = [(slice(0, 10), slice(0, 10), 'west'), (slice(0, 10), slice(10, 20), 'east')]
+
+        first = pipeline._process_single_tile(ds, *tiles[0])
+        assert pipeline._data_start_year(2030) == 2022
+        pipeline._process_single_tile(ds, *tiles[1])
+        # Every tile fitted: only the 23 months the 24-month window needs
+        assert pipeline._data_start_year(2030) == 2028
+
+        fits = []
+        monkeypatch.setattr('drought_pipeline.fit_spi_params', lambda *args, **kwargs: fits.append(args))
+        again = pipeline._process_single_tile(ds, *tiles[0])
+
+        assert not fits
+        xr.testing.assert_identical(again['spi_3month'].compute(), first['spi_3month'].compute())
+
+    def test_spi_fit_not_cached_before_calibration_end(self, mock_pipeline_config, monkeypatch):
+        """Test that a chunk ending before the calibration period ends is fitted but not cached."""
+        pipeline = DroughtPipeline(n_tiles=1)
+        pipeline.spi_cal_start, pipeline.spi_cal_end = '2022-01-01', '2023-12-31'
+        pipeline.target_start_year = pipeline.target_end_year = 2022
+        monkeypatch.setattr(pipeline, 'calculate_precip_intensity_indices', lambda ds, baselines=None: {})
+        tile = (slice(0, 10), slice(0, 10), 'west')
+
+        first_chunk = pipeline._preprocess_datasets({
+            'precipitation': pipeline._load_zarr_data(PipelineConfig.PRECIP_ZARR, 2022, 2022)
+        })['precipitation']
+        pipeline._process_single_tile(first_chunk, *tile)
+
+        # Parameters fitted on part of the calibration period are not reused
+        assert not pipeline._fitted_spi_params
+        assert pipeline._data_start_year(2023) == 2022
+
+        pipeline.target_start_year = pipeline.target_end_year = 2023
+        second_chunk = pipeline._preprocess_datasets({
+            'precipitation': pipeline._load_zarr_data(PipelineConfig.PRECIP_ZARR, 2022, 2023)
+        })['precipitation']
+        pipeline._process_single_tile(second_chunk, *tile)
+
+        assert len(pipeline._fitted_spi_params) == 1
+        assert pipeline._data_start_year(2030) == 2028
+
+    def test_mismatched_spi_params_are_ignored(self, mock_pipeline_config, monkeypatch, tmp_path):
+        """Test that parameters fitted for another calibration period are not used."""
+        monkeypatch.setattr(PipelineConfig, 'SPI_PARAMS_FILE', str(tmp_path / 'spi_params.nc'))
+        pipeline = DroughtPipeline(n_tiles=2)
+        pipeline.spi_cal_start, pipeline.spi_cal_end = '2022-01-01', '2023-12-31'
+        pipeline.save_spi_params()
+
+        assert DroughtPipeline(n_tiles=2).spi_params is None
+
+
+class TestDroughtOutputPacking:
+    """Test packed integer storage of drought indices in the final output."""
+
+    def test_packed_output_roundtrip(self, mock_pipeline_config, tmp_path):
+        """Test that packed indices are stored as integers and decode within quantization."""
+        spi = np.array([[-8.21, -1.2345], [np.nan, 8.21]], dtype=np.float32)
+        cdd = np.array([[0, 366], [np.nan, 12]], dtype=np.float32)
+        fraction = np.array([[0.0, 0.12345], [1.0, np.nan]], dtype=np.float32)
+        max_7day = np.array([[0.0, 512.34], [1500.0, np.nan]], dtype=np.float32)  # 7-day totals exceed int16 at 0.01
+        result_ds = xr.Dataset({
+            'spi_3month': (['time', 'lat', 'lon'], spi[None]),
+            'cdd': (['time', 'lat', 'lon'], cdd[None], {'units': 'days'}),
+            'fraction_heavy_precip': (['time', 'lat', 'lon'], fraction[None]),
+            'max_7day_pr_intensity': (['time', 'lat', 'lon'], max_7day[None]),
+        })
+
+        pipeline = DroughtPipeline(n_tiles=2)
+        output_file = tmp_path / 'drought_packed.nc'
+        pipeline._save_result(result_ds, output_file)
+
+        with xr.open_dataset(output_file, mask_and_scale=False) as raw:
+            assert raw['spi_3month'].dtype == np.int16
+            assert raw['cdd'].dtype == np.uint16
+            assert raw['fraction_heavy_precip'].dtype == np.int16
+
+        with xr.open_dataset(output_file) as ds:
+            np.testing.assert_allclose(ds['spi_3month'].values[0], spi, atol=5e-4)
+            np.testing.assert_array_equal(ds['cdd'].values[0], cdd)
+            np.testing.assert_allclose(ds['fraction_heavy_precip'].values[0], fraction, atol=5e-5)
+            np.testing.assert_allclose(ds['max_7day_pr_intensity'].values[0], max_7day, atol=0.05)
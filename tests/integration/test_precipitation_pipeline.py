@@ -5,6 +5,7 @@ Full integration tests for Precipitation Pipeline with spatial tiling.
 Tests the complete precipitation pipeline end-to-end including:
 - Full pipeline execution with test data
 - All 13 precipitation indices calculation
+- Fused cdd / sdii / dry_days pass against xclim
 - Spatial tiling integration
 - Output file validation
 - Data quality checks
@@ -12,7 +13,9 @@ Tests the complete precipitation pipeline end-to-end including:
 
 import pytest
 import numpy as np
+import pandas as pd
 import xarray as xr
+import xclim.indicators.atmos as atmos
 from pathlib import Path
 
 from precipitation_pipeline import PrecipitationPipeline
@@ -226,6 +229,29 @@ class TestPrecipitationIndicesQuality:
         ds.close()
 
 
+class TestPrecipitationDryWetIndices:
+    """Test the fused cdd / sdii / dry_days pass."""
+
+    def test_fused_indices_match_xclim(self, mock_pipeline_config, sample_precipitation_dataset):
+        """Test that cdd, sdii and dry_days from the single pass match the xclim indicators."""
+        pipeline = PrecipitationPipeline(n_tiles=2)
+        # One complete year (xclim masks partial years; the pipeline always processes whole years)
+        full_year = sample_precipitation_dataset.assign_coords(time=pd.date_range('2021-01-01', periods=365))
+        ds = pipeline._preprocess_datasets({'precipitation': full_year})['precipitation']
+
+        indices = pipeline.calculate_precipitation_indices(ds)
+
+        expected = {
+            'cdd': atmos.maximum_consecutive_dry_days(ds.pr, thresh='1 mm/day', freq='YS'),
+            'sdii': atmos.daily_pr_intensity(ds.pr, thresh='1 mm/day', freq='YS'),
+            'dry_days': atmos.dry_days(pr=ds.pr, thresh='1 mm/day', freq='YS'),
+        }
+        for name, reference in expected.items():
+            np.testing.assert_allclose(indices[name].values, reference.values, rtol=1e-6)
+            assert indices[name].attrs['units'] == reference.attrs['units']
+        assert 'dry_days' not in pipeline.calculate_enhanced_precipitation_indices(ds)
+
+
 class TestPrecipitationSpatialTiling:
     """Test spatial tiling integration in precipitation pipeline."""
 
@@ -476,6 +502,38 @@ class TestPrecipitationOutputFileFormat:
             f"Output file too large: {file_size_mb:.2f} MB (compression may not be working)"
 
 
+class TestPrecipitationOutputPacking:
+    """Test packed integer storage of precipitation indices in the final output."""
+
+    def test_packed_output_roundtrip(self, mock_pipeline_config, tmp_path):
+        """Test that packed indices are stored as integers and decode within quantization."""
+        prcptot = np.array([[0.0, 1234.56], [9000.0, np.nan]], dtype=np.float32)
+        rx1day = np.array([[0.0, 512.34], [1500.0, np.nan]], dtype=np.float32)
+        cdd = np.array([[0, 366], [np.nan, 12]], dtype=np.float32)
+        wetdays_prop = np.array([[0.0, 0.12345], [1.0, np.nan]], dtype=np.float32)
+        result_ds = xr.Dataset({
+            'prcptot': (['time', 'lat', 'lon'], prcptot[None]),
+            'rx1day': (['time', 'lat', 'lon'], rx1day[None]),
+            'cdd': (['time', 'lat', 'lon'], cdd[None], {'units': 'days'}),
+            'wetdays_prop': (['time', 'lat', 'lon'], wetdays_prop[None]),
+        })
+
+        pipeline = PrecipitationPipeline(n_tiles=2)
+        output_file = tmp_path / 'precipitation_packed.nc'
+        pipeline._save_result(result_ds, output_file)
+
+        with xr.open_dataset(output_file, mask_and_scale=False) as raw:
+            assert raw['prcptot'].dtype == np.uint16
+            assert raw['cdd'].dtype == np.uint16
+            assert raw['wetdays_prop'].dtype == np.int16
+
+        with xr.open_dataset(output_file) as ds:
+            np.testing.assert_allclose(ds['prcptot'].values[0], prcptot, atol=0.1)
+            np.testing.assert_allclose(ds['rx1day'].values[0], rx1day, atol=0.05)
+            np.testing.assert_array_equal(ds['cdd'].values[0], cdd)
+            np.testing.assert_allclose(ds['wetdays_prop'].values[0], wetdays_prop, atol=5e-5)
+
+
 class TestPrecipitationDataConsistency:
     """Test data consistency across different processing methods."""
 
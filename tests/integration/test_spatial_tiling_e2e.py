@@ -275,11 +275,11 @@ class TestTileConfigurationValidation:
 
     def test_invalid_n_tiles_raises_error(self):
         """Test that invalid n_tiles values raise ValueError."""
-        with pytest.raises(ValueError, match="n_tiles must be 2, 4, or 8"):
+        with pytest.raises(ValueError, match="n_tiles must be a power of two"):
             SpatialTilingMixin(n_tiles=3)
 
-        with pytest.raises(ValueError, match="n_tiles must be 2, 4, or 8"):
-            SpatialTilingMixin(n_tiles=16)
+        with pytest.raises(ValueError, match="n_tiles must be a power of two"):
+            SpatialTilingMixin(n_tiles=12)
 
     def test_empty_dataset_raises_error(self):
         """Test that empty datasets raise ValueError."""
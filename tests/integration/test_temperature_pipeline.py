@@ -338,6 +338,22 @@ class TestTemperatureCountIndicesFix:
 
         ds.close()
 
+    def test_fix_count_indices_keeps_data_lazy(self, mock_pipeline_config):
+        """Test that the units fix only edits metadata and leaves lazy data unloaded."""
+        pipeline = TemperaturePipeline(n_tiles=4)
+        ds = xr.Dataset({
+            'frost_days': (['time', 'lat', 'lon'], np.ones((1, 4, 4)), {'units': 'days'}),
+            'tg_mean': (['time', 'lat', 'lon'], np.ones((1, 4, 4)), {'units': 'K'})
+        }).chunk()
+
+        fixed = pipeline.fix_count_indices(ds)
+
+        assert fixed['frost_days'].attrs['units'] == '1'
+        assert fixed['tg_mean'].attrs['units'] == 'K'
+        assert fixed['frost_days'].chunks is not None
+        # Idempotent: the merged dataset is fixed again after its tiles
+        assert pipeline.fix_count_indices(fixed)['frost_days'].attrs['units'] == '1'
+
 
 class TestTemperatureMemoryEfficiency:
     """Test memory efficiency of tiling."""
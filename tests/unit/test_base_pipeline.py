@@ -4,13 +4,18 @@ Unit tests for core.base_pipeline module.
 Tests BasePipeline abstract class and common pipeline functionality.
 """
 
+import threading
+import warnings
+import dask
 import pytest
 import xarray as xr
 import numpy as np
+import pandas as pd
 from pathlib import Path
 from datetime import datetime
 
-from core.base_pipeline import BasePipeline
+from core.base_pipeline import BasePipeline, physical_cpu_count
+from core.config import PipelineConfig
 
 
 class MockPipeline(BasePipeline):
@@ -69,6 +74,11 @@ class TestBasePipeline:
 
         assert pipeline.chunk_years == 5
 
+    def test_init_with_invalid_output_format(self, temp_zarr_store):
+        """Test that an unknown output format is rejected."""
+        with pytest.raises(ValueError, match="output_format"):
+            MockPipeline(zarr_paths={'temperature': temp_zarr_store}, output_format='grib')
+
     def test_default_chunk_config(self):
         """Test default chunk configuration."""
         chunks = BasePipeline._default_chunk_config()
@@ -76,6 +86,44 @@ class TestBasePipeline:
         assert chunks['time'] == 365
         assert chunks['lat'] == 103
         assert chunks['lon'] == 201
+        assert BasePipeline._default_chunk_config() is chunks, "Default chunks should be shared, not rebuilt"
+
+    def test_mask_and_scale_after_subset(self, tmp_path):
+        """Test that CF masking is applied only where the fill value is not NaN."""
+        time = pd.date_range('2020-01-01', periods=4, freq='D')
+        data = np.ones((4, 2, 2), dtype='float32')
+        data[1, 0, 0] = -9999
+        ds = xr.Dataset(
+            {'nan_filled': (['time', 'lat', 'lon'], data.copy()), 'sentinel': (['time', 'lat', 'lon'], data)},
+            coords={'time': time, 'lat': [40.0, 41.0], 'lon': [-100.0, -99.0]}
+        )
+        store = tmp_path / 'cf.zarr'
+        ds.to_zarr(store, encoding={'sentinel': {'_FillValue': -9999.0}})
+
+        opened = BasePipeline._open_zarr_store(str(store), {'time': 2})
+        decoded = BasePipeline._mask_and_scale(opened.sel(time=slice('2020-01-02', '2020-01-03')))
+
+        assert decoded['sentinel'].dtype == np.float32
+        assert np.isnan(decoded['sentinel'].values[0, 0, 0])
+        assert decoded['nan_filled'].values[0, 0, 0] == -9999
+        assert '_FillValue' not in decoded['nan_filled'].attrs
+        assert '_FillValue' in opened['nan_filled'].attrs
+
+    def test_open_zarr_store_aligns_chunks_to_storage(self, tmp_path):
+        """Test that requested chunks are rounded to whole storage chunks without a split warning."""
+        time = pd.date_range('2020-01-01', periods=12, freq='D')
+        ds = xr.Dataset(
+            {'tas': (['time', 'lat', 'lon'], np.ones((12, 6, 6), dtype='float32'))},
+            coords={'time': time, 'lat': np.arange(6.0), 'lon': np.arange(6.0)}
+        )
+        store = tmp_path / 'aligned.zarr'
+        ds.chunk({'time': 4, 'lat': 2, 'lon': 3}).to_zarr(store)
+
+        with warnings.catch_warnings():
+            warnings.filterwarnings('error', message='.*specified chunks.*')
+            opened = BasePipeline._open_zarr_store(str(store), {'time': 5, 'lat': 1, 'lon': -1})
+
+        assert opened['tas'].chunks == ((4, 4, 4), (2, 2, 2), (6,))
 
     def test_setup_dask_client(self, temp_zarr_store):
         """Test Dask client setup (threaded scheduler)."""
@@ -86,6 +134,34 @@ class TestBasePipeline:
         # Should not raise exceptions
         pipeline.setup_dask_client()
 
+    def test_setup_dask_client_uses_physical_cores(self, temp_zarr_store):
+        """Test that the threaded scheduler gets one thread per physical core unless configured."""
+        pipeline = MockPipeline(
+            zarr_paths={'temperature': temp_zarr_store}
+        )
+
+        with dask.config.set(num_workers=None):
+            with pipeline.setup_dask_client():
+                assert dask.config.get('num_workers') == physical_cpu_count()
+            assert dask.config.get('num_workers') is None
+
+        with dask.config.set(num_workers=3):
+            with pipeline.setup_dask_client():
+                assert dask.config.get('num_workers') == 3
+            assert dask.config.get('num_workers') == 3
+
+    def test_setup_dask_client_warns_about_dashboard(self, temp_zarr_store, caplog):
+        """Test that requesting the dashboard warns instead of being silently ignored."""
+        pipeline = MockPipeline(
+            zarr_paths={'temperature': temp_zarr_store},
+            enable_dashboard=True
+        )
+
+        with dask.config.set(num_workers=2):
+            pipeline.setup_dask_client()
+
+        assert 'no dashboard' in caplog.text
+
     def test_load_zarr_data(self, temp_zarr_store):
         """Test loading data from Zarr store."""
         pipeline = MockPipeline(
@@ -114,6 +190,17 @@ class TestBasePipeline:
         assert isinstance(ds, xr.Dataset)
         assert len(ds.time) == 365
 
+    def test_load_zarr_data_unconsolidated_store(self, tmp_path, sample_temperature_dataset):
+        """Test that stores without consolidated metadata still load."""
+        zarr_path = tmp_path / 'unconsolidated.zarr'
+        sample_temperature_dataset.to_zarr(zarr_path, mode='w', consolidated=False)
+
+        pipeline = MockPipeline(zarr_paths={'temperature': str(zarr_path)})
+        ds = pipeline._load_zarr_data(str(zarr_path), 2020, 2020)
+
+        assert 'tas' in ds.data_vars
+        assert len(ds.time) > 0
+
     def test_rename_variables(self, sample_temperature_dataset):
         """Test variable renaming."""
         pipeline = MockPipeline(zarr_paths={'temperature': 'dummy'})
@@ -201,6 +288,34 @@ class TestBasePipeline:
 
         assert result_ds.attrs['custom_attr'] == 'custom_value'
 
+    def test_combine_indices_shared_coords(self):
+        """Test combining indices that share identical coordinates."""
+        coords = {'time': [0, 1], 'lat': np.arange(3), 'lon': np.arange(4)}
+        a = xr.DataArray(np.ones((2, 3, 4)), dims=('time', 'lat', 'lon'),
+                         coords=coords, attrs={'units': 'K'})
+        b = xr.DataArray(np.zeros((2, 3, 4)), dims=('time', 'lat', 'lon'),
+                         coords=coords, attrs={'units': '1'})
+
+        result = BasePipeline._combine_indices({'a': a, 'b': b})
+
+        assert set(result.data_vars) == {'a', 'b'}
+        assert result['a'].attrs['units'] == 'K'
+        assert result['b'].attrs['units'] == '1'
+        assert result.sizes == {'time': 2, 'lat': 3, 'lon': 4}
+
+    def test_combine_indices_differing_coords_aligns(self):
+        """Test that indices with different time axes are still aligned."""
+        spatial = {'lat': np.arange(3), 'lon': np.arange(4)}
+        annual = xr.DataArray(np.ones((1, 3, 4)), dims=('time', 'lat', 'lon'),
+                              coords={'time': [0], **spatial})
+        monthly = xr.DataArray(np.ones((12, 3, 4)), dims=('time', 'lat', 'lon'),
+                               coords={'time': np.arange(12), **spatial})
+
+        result = BasePipeline._combine_indices({'annual': annual, 'monthly': monthly})
+
+        assert result.sizes['time'] == 12
+        assert set(result.data_vars) == {'annual', 'monthly'}
+
     def test_save_result(self, sample_temperature_dataset, tmp_path, temp_zarr_store):
         """Test saving result to NetCDF."""
         pipeline = MockPipeline(zarr_paths={'temperature': temp_zarr_store})
@@ -220,6 +335,93 @@ class TestBasePipeline:
         assert 'mock_index' in ds.data_vars
         ds.close()
 
+    def test_encoding_chunksizes_clamped_and_sized(self):
+        """Test encoding chunks reach the target size without exceeding dims."""
+        # Small grid: every dimension fits entirely in one chunk
+        small = BasePipeline._encoding_chunksizes({'time': 3, 'lat': 10, 'lon': 10})
+        assert small == {'time': 3, 'lat': 10, 'lon': 10}
+
+        # PRISM grid: one time step, full rows, enough rows for ~1 MiB
+        prism = BasePipeline._encoding_chunksizes({'time': 1, 'lat': 621, 'lon': 1405})
+        assert prism['time'] == 1
+        assert prism['lon'] == 1405
+        assert prism['lat'] <= 621
+        assert prism['time'] * prism['lat'] * prism['lon'] * 4 >= 1024 * 1024
+
+    def test_save_result_uses_clamped_chunksizes(self, tmp_path, temp_zarr_store):
+        """Test default encoding writes chunks no larger than the array."""
+        pipeline = MockPipeline(zarr_paths={'temperature': temp_zarr_store})
+
+        result_ds = xr.Dataset({
+            'index_a': (['time', 'lat', 'lon'], np.ones((2, 10, 12), dtype='float32')),
+            'index_b': (['time', 'lat', 'lon'], np.zeros((2, 10, 12), dtype='float32')),
+        })
+
+        output_file = tmp_path / 'test_output_chunks.nc'
+        pipeline._save_result(result_ds, output_file)
+
+        with xr.open_dataset(output_file) as ds:
+            for var_name in ('index_a', 'index_b'):
+                assert ds[var_name].encoding['chunksizes'] == (2, 10, 12)
+
+    def test_save_result_uses_configured_compression(self, tmp_path, temp_zarr_store):
+        """Test that NetCDF output is compressed with PipelineConfig.NETCDF_COMPRESSION."""
+        pipeline = MockPipeline(zarr_paths={'temperature': temp_zarr_store})
+        result_ds = xr.Dataset({'index_a': (['time', 'lat', 'lon'], np.ones((2, 10, 12), dtype='float32'))})
+
+        output_file = tmp_path / 'test_output_compression.nc'
+        pipeline._save_result(result_ds, output_file)
+
+        codec = PipelineConfig.NETCDF_COMPRESSION.get('compression', 'zlib')
+        with xr.open_dataset(output_file) as ds:
+            assert ds['index_a'].encoding[codec] is True
+            np.testing.assert_array_equal(ds['index_a'].values, 1.0)
+
+    def test_save_result_lazy_dataset(self, tmp_path, temp_zarr_store):
+        """Test that lazy (dask-backed) results are computed and written."""
+        pipeline = MockPipeline(zarr_paths={'temperature': temp_zarr_store})
+
+        data = np.arange(2 * 10 * 10, dtype='float32').reshape(2, 10, 10)
+        result_ds = xr.Dataset({
+            'lazy_index': (['time', 'lat', 'lon'], data)
+        }).chunk({'lat': 5, 'lon': 5})
+
+        output_file = tmp_path / 'test_output_lazy.nc'
+        pipeline._save_result(result_ds, output_file, num_workers=2)
+
+        with xr.open_dataset(output_file) as ds:
+            np.testing.assert_array_equal(ds['lazy_index'].values, data)
+
+    def test_save_result_zarr(self, tmp_path, temp_zarr_store):
+        """Test that a .zarr output is written as a Blosc/Zstd compressed Zarr store."""
+        pipeline = MockPipeline(zarr_paths={'temperature': temp_zarr_store})
+
+        data = np.arange(2 * 10 * 10, dtype='float32').reshape(2, 10, 10)
+        result_ds = xr.Dataset({
+            'lazy_index': (['time', 'lat', 'lon'], data)
+        }).chunk({'lat': 3, 'lon': 7})
+
+        output_store = tmp_path / 'test_output.zarr'
+        pipeline._save_result(result_ds, output_store, num_workers=2)
+
+        with xr.open_zarr(output_store) as ds:
+            np.testing.assert_array_equal(ds['lazy_index'].values, data)
+            compressor = ds['lazy_index'].encoding['compressors'][0]
+            assert compressor.cname.value == 'zstd'
+
+    def test_process_time_chunk_zarr_output(self, temp_zarr_store, tmp_path):
+        """Test that output_format='zarr' writes a Zarr store per chunk."""
+        pipeline = MockPipeline(
+            zarr_paths={'temperature': temp_zarr_store},
+            output_format='zarr'
+        )
+
+        output_file = pipeline.process_time_chunk(2020, 2020, tmp_path)
+
+        assert output_file.name == 'mock_indices_2020_2020.zarr'
+        assert output_file.is_dir()
+        assert pipeline._output_size_mb(output_file) > 0
+
     def test_save_result_with_custom_encoding(self, tmp_path, temp_zarr_store):
         """Test saving result with custom encoding."""
         pipeline = MockPipeline(zarr_paths={'temperature': temp_zarr_store})
@@ -280,6 +482,26 @@ class TestBasePipeline:
         assert len(output_files) == 1
         assert output_files[0].exists()
 
+    def test_run_restores_dask_thread_count(self, temp_zarr_store, tmp_path, monkeypatch):
+        """Test that the thread count set for a run does not outlive it."""
+        pipeline = MockPipeline(
+            zarr_paths={'temperature': temp_zarr_store}
+        )
+        during = []
+        calculate_indices = pipeline.calculate_indices
+        monkeypatch.setattr(
+            pipeline, 'calculate_indices',
+            lambda datasets: during.append(dask.config.get('num_workers', None)) or calculate_indices(datasets)
+        )
+        previous = dask.config.get('num_workers', None)
+
+        with dask.config.set(num_workers=None):
+            pipeline.run(2020, 2020, str(tmp_path))
+            assert during == [physical_cpu_count()]
+            assert dask.config.get('num_workers', None) is None
+
+        assert dask.config.get('num_workers', None) == previous
+
     def test_run_multi_year_chunked(self, temp_zarr_store, tmp_path):
         """Test running pipeline with year chunking."""
         pipeline = MockPipeline(
@@ -292,6 +514,82 @@ class TestBasePipeline:
 
         assert len(output_files) >= 1
 
+    def test_run_opens_store_once(self, temp_zarr_store, tmp_path, monkeypatch):
+        """Test that temporal chunks of one run share a single open of each store."""
+        pipeline = MockPipeline(
+            zarr_paths={'temperature': temp_zarr_store},
+            chunk_years=1
+        )
+        opens = []
+        open_store = BasePipeline._open_zarr_store
+        monkeypatch.setattr(
+            pipeline, '_open_zarr_store', lambda *args: opens.append(args) or open_store(*args)
+        )
+
+        output_files = pipeline.run(2019, 2020, str(tmp_path))
+
+        assert len(output_files) == 2
+        assert len(opens) == 1
+        assert pipeline._run_zarr_stores is None
+
+    def test_run_writes_chunks_in_background(self, temp_zarr_store, tmp_path, monkeypatch):
+        """Test that chunk outputs are written in order by the background writer."""
+        pipeline = MockPipeline(
+            zarr_paths={'temperature': temp_zarr_store},
+            chunk_years=1
+        )
+        writes = []
+        save_result = pipeline._save_result
+        monkeypatch.setattr(
+            pipeline, '_save_result',
+            lambda result_ds, output_file: writes.append(
+                (output_file.name, threading.current_thread().name)
+            ) or save_result(result_ds, output_file)
+        )
+
+        output_files = pipeline.run(2019, 2020, str(tmp_path))
+
+        assert [name for name, _ in writes] == ['mock_indices_2019_2019.nc', 'mock_indices_2020_2020.nc']
+        assert all(thread.startswith('chunk-writer') for _, thread in writes)
+        assert all(f.exists() for f in output_files)
+        assert pipeline._write_executor is None
+
+    def test_run_parallel_chunks(self, temp_zarr_store, tmp_path):
+        """Test that temporal chunks run in worker processes and keep their order."""
+        pipeline = MockPipeline(
+            zarr_paths={'temperature': temp_zarr_store},
+            parallel_chunks=2
+        )
+
+        output_files = pipeline.run(2019, 2020, str(tmp_path))
+
+        assert [f.name for f in output_files] == ['mock_indices_2019_2019.nc', 'mock_indices_2020_2020.nc']
+        assert all(f.exists() for f in output_files)
+
+    def test_run_zarr_store_appends_chunks(self, temp_zarr_store, tmp_path):
+        """Test that zarr-store output appends every temporal chunk to one sharded store."""
+        pipeline = MockPipeline(zarr_paths={'temperature': temp_zarr_store}, output_format='zarr-store')
+
+        pipeline.run(2019, 2020, str(tmp_path))
+        output_files = pipeline.run(2019, 2020, str(tmp_path))  # Replaces the first run's store
+
+        assert [f.name for f in output_files] == ['mock_indices_2019_2020.zarr']
+        with xr.open_zarr(output_files[0]) as ds:
+            assert ds.sizes['time'] == 2
+            assert ds['mock_index'].encoding['shards'][0] == 1
+            assert ds['mock_index'].encoding['shards'][1:] >= (ds.sizes['lat'], ds.sizes['lon'])
+            np.testing.assert_array_equal(ds['mock_index'].values, 1.0)
+
+    def test_zarr_store_rejects_parallel_chunks(self, temp_zarr_store):
+        """Test that the single appended store requires sequential temporal chunks."""
+        with pytest.raises(ValueError, match="zarr-store"):
+            MockPipeline(zarr_paths={'temperature': temp_zarr_store}, output_format='zarr-store', parallel_chunks=2)
+
+    def test_init_with_invalid_parallel_chunks(self, temp_zarr_store):
+        """Test that parallel_chunks must be at least 1."""
+        with pytest.raises(ValueError, match="parallel_chunks"):
+            MockPipeline(zarr_paths={'temperature': temp_zarr_store}, parallel_chunks=0)
+
     def test_run_creates_output_directory(self, temp_zarr_store, tmp_path):
         """Test that run creates output directory if it doesn't exist."""
         pipeline = MockPipeline(
@@ -408,6 +706,20 @@ class TestBasePipelineErrorHandling:
 
         assert "Mock processing error" in str(exc_info.value)
 
+    def test_run_propagates_background_write_error(self, temp_zarr_store, tmp_path, monkeypatch):
+        """Test that a failed background write fails the run."""
+        pipeline = MockPipeline(
+            zarr_paths={'temperature': temp_zarr_store}
+        )
+
+        def mock_save_error(result_ds, output_file):
+            raise OSError("Mock write error")
+
+        monkeypatch.setattr(pipeline, '_save_result', mock_save_error)
+
+        with pytest.raises(OSError, match="Mock write error"):
+            pipeline.run(2020, 2020, str(tmp_path))
+
 
 class TestBasePipelineIntegration:
     """Integration tests for complete pipeline workflows."""
@@ -4,6 +4,7 @@ Unit tests for core.baseline_loader module.
 Tests baseline percentile loading, caching, and validation.
 """
 
+import os
 import pytest
 from pathlib import Path
 import xarray as xr
@@ -59,6 +60,21 @@ class TestBaselineLoader:
         ds2 = loader._load_baseline_file()
         assert ds2 is ds1
 
+    def test_load_baseline_file_shared_across_loaders(self, baseline_file, sample_baseline_percentiles):
+        """Test that loaders of the same file share one opened dataset until it is rewritten."""
+        first = BaselineLoader(baseline_file=baseline_file)._load_baseline_file()
+        second = BaselineLoader(baseline_file=baseline_file)._load_baseline_file()
+        assert second is first
+
+        first.close()
+        sample_baseline_percentiles.attrs['baseline_period'] = '1991-2010'
+        sample_baseline_percentiles.to_netcdf(baseline_file)
+        os.utime(baseline_file, ns=(0, baseline_file.stat().st_mtime_ns + 1))
+
+        rewritten = BaselineLoader(baseline_file=baseline_file)._load_baseline_file()
+        assert rewritten is not first
+        assert rewritten.attrs['baseline_period'] == '1991-2010'
+
     def test_load_baseline_file_not_found(self, tmp_path):
         """Test loading non-existent baseline file raises FileNotFoundError."""
         missing_file = tmp_path / 'missing_baseline.nc'
@@ -190,6 +206,40 @@ class TestBaselineLoader:
         # Should return same cached data
         assert loader._baseline_cache is not None
 
+    def test_get_tile_baselines_subsets_and_caches(self, baseline_file):
+        """Test that tile baselines are subset once and reused."""
+        loader = BaselineLoader(baseline_file=baseline_file)
+        baselines = loader.get_temperature_baselines()
+
+        lat_slice, lon_slice = slice(0, 5), slice(None)
+        first = loader.get_tile_baselines(baselines, lat_slice, lon_slice)
+        second = loader.get_tile_baselines(baselines, slice(0, 5), slice(None))
+
+        for var in baselines:
+            assert first[var].sizes['lat'] == 5
+            assert first[var].sizes['lon'] == baselines[var].sizes['lon']
+            assert first[var] is second[var], f"{var} tile subset should be cached"
+
+        loader.clear_cache()
+        third = loader.get_tile_baselines(baselines, lat_slice, lon_slice)
+        assert all(third[var] is not first[var] for var in baselines)
+
+    def test_get_tile_baselines_matches_tile_chunks(self, baseline_file, sample_temperature_dataset):
+        """Test that tile baselines are rechunked to the tile's lat/lon chunks."""
+        loader = BaselineLoader(baseline_file=baseline_file)
+        baselines = loader.get_temperature_baselines()
+
+        tile_ds = sample_temperature_dataset.chunk({'lat': 4, 'lon': 4})
+        tile_baselines = loader.get_tile_baselines(
+            baselines, slice(None), slice(None), tile_ds=tile_ds
+        )
+
+        for var, baseline in tile_baselines.items():
+            chunks = dict(zip(baseline.dims, baseline.chunks))
+            assert chunks['lat'][0] == 4
+            assert chunks['lon'][0] == 4
+            assert len(chunks['dayofyear']) == 1
+
 
 @pytest.mark.regression
 class TestBaselineLoaderRegressions:
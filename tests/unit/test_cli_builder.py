@@ -0,0 +1,59 @@
+"""
+Unit tests for core.cli_builder module.
+
+Tests common CLI arguments and the Dask profiling context manager.
+"""
+
+import dask.array as da
+
+from core.cli_builder import PipelineCLI
+
+
+def _make_parser():
+    return PipelineCLI.create_parser("Test Indices", "Test pipeline", "  test_index")
+
+
+class TestPipelineCLI:
+    """Tests for PipelineCLI class."""
+
+    def test_profile_arguments_default_off(self):
+        """Test that profiling is disabled unless requested."""
+        args = _make_parser().parse_args([])
+
+        assert args.profile_report is None
+        assert args.profile_task_stream is False
+
+    def test_profiling_noop_without_flags(self, tmp_path):
+        """Test that profiling writes nothing when not requested."""
+        args = _make_parser().parse_args(['--output-dir', str(tmp_path)])
+
+        with PipelineCLI.profiling(args):
+            da.ones((10, 10), chunks=5).sum().compute()
+
+        assert not list(tmp_path.iterdir())
+
+    def test_profiling_writes_report(self, tmp_path):
+        """Test that --profile-report writes an HTML report."""
+        report = tmp_path / 'profile' / 'report.html'
+        args = _make_parser().parse_args([
+            '--profile-report', str(report),
+            '--profile-task-stream',
+        ])
+
+        with PipelineCLI.profiling(args):
+            da.ones((10, 10), chunks=5).sum().compute(scheduler='threads')
+
+        assert report.exists()
+        assert report.stat().st_size > 0
+
+    def test_profiling_task_stream_default_path(self, tmp_path):
+        """Test that --profile-task-stream alone writes to the output directory."""
+        args = _make_parser().parse_args([
+            '--output-dir', str(tmp_path),
+            '--profile-task-stream',
+        ])
+
+        with PipelineCLI.profiling(args):
+            da.ones((10, 10), chunks=5).sum().compute(scheduler='threads')
+
+        assert (tmp_path / 'dask_profile.html').exists()
@@ -23,6 +23,11 @@ class TestPipelineConfig:
         assert chunks['lat'] == 103, "Lat chunks should be 103"
         assert chunks['lon'] == 201, "Lon chunks should be 201"
 
+    def test_default_chunks_read_only(self):
+        """Test that the shared default chunk configuration can't be mutated."""
+        with pytest.raises(TypeError):
+            PipelineConfig.DEFAULT_CHUNKS['time'] = 1
+
     def test_temp_rename_map(self):
         """Test temperature variable rename mappings."""
         rename_map = PipelineConfig.TEMP_RENAME_MAP
@@ -111,8 +116,8 @@ class TestPipelineConfig:
         """Test default NetCDF encoding configuration."""
         encoding = PipelineConfig.default_encoding()
 
-        assert encoding['zlib'] is True
         assert encoding['complevel'] == 4
+        assert encoding.get('compression') == 'zstd' or encoding.get('zlib') is True
         assert 'chunksizes' in encoding
         assert len(encoding['chunksizes']) == 3  # (time, lat, lon)
 
@@ -128,6 +133,14 @@ class TestPipelineConfig:
         # Should not raise any exceptions
         PipelineConfig.setup_warning_filters()
 
+    def test_setup_jit_caching(self):
+        """Test that xclim's run-length kernels are switched to on-disk caching."""
+        import xclim.indices.run_length as run_length
+
+        PipelineConfig.setup_jit_caching()
+
+        assert run_length._cumsum_reset_np._cache.__class__.__name__ == 'FunctionCache'
+
     def test_zarr_paths_exist(self):
         """Test that Zarr path constants are defined."""
         assert hasattr(PipelineConfig, 'TEMP_ZARR')
@@ -0,0 +1,54 @@
+"""
+Unit tests for core.memory_monitor module.
+
+Tests background RSS sampling and peak memory reporting.
+"""
+
+import time
+
+from core.memory_monitor import MemorySampler
+
+
+class TestMemorySampler:
+    """Tests for MemorySampler class."""
+
+    def test_sample_returns_positive_rss(self):
+        """Test that a manual sample reports a positive RSS in MB."""
+        sampler = MemorySampler()
+        assert sampler.sample() > 0
+
+    def test_peak_after_reset_is_not_empty(self):
+        """Test that peak_mb() works even with no prior samples."""
+        sampler = MemorySampler()
+        sampler.reset()
+        assert sampler.peak_mb() > 0
+
+    def test_peak_is_max_of_samples(self):
+        """Test that peak_mb() reports the largest recorded sample."""
+        sampler = MemorySampler()
+        sampler.reset()
+        sampler._samples.extend([10.0, 1e9, 20.0])
+        assert sampler.peak_mb() == 1e9
+
+    def test_bounded_sample_history(self):
+        """Test that sample history never exceeds max_samples."""
+        sampler = MemorySampler(max_samples=3)
+        for _ in range(10):
+            sampler.sample()
+        assert len(sampler._samples) == 3
+
+    def test_background_thread_start_stop(self):
+        """Test that the sampler thread starts, collects samples, and stops."""
+        sampler = MemorySampler(interval=0.01)
+
+        with sampler:
+            assert sampler.is_running
+            time.sleep(0.05)
+
+        assert not sampler.is_running
+        assert len(sampler._samples) >= 1
+
+    def test_lifetime_peak(self):
+        """Test that the kernel-reported peak RSS is positive when available."""
+        peak = MemorySampler.lifetime_peak_mb()
+        assert peak is None or peak > 0
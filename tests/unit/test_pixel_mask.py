@@ -0,0 +1,52 @@
+"""
+Unit tests for core.pixel_mask module.
+
+Tests that per-pixel kernels only run on pixels with data.
+"""
+
+import numpy as np
+
+from core.pixel_mask import map_valid_pixels
+from core.precip_stats import DRY_WET_STATS, dry_wet_stats
+
+
+class TestMapValidPixels:
+    """Tests for valid-pixel compression."""
+
+    def test_kernel_sees_only_valid_pixels(self):
+        """Test that all-NaN pixels are skipped and filled with NaN."""
+        values = np.arange(2 * 3 * 4, dtype=np.float64).reshape(2, 3, 4)
+        values[0, 1] = np.nan
+        values[1, 2, :2] = np.nan  # Partly missing pixels are still passed on
+        seen = []
+
+        def kernel(pixels, scale):
+            seen.append(pixels.shape[0])
+            return np.stack([pixels[:, 0] * scale, pixels[:, -1]], axis=-1)
+
+        result = map_valid_pixels(kernel, values, scale=2.0)
+
+        assert seen == [5]
+        assert result.shape == (2, 3, 2)
+        assert np.isnan(result[0, 1]).all()
+        np.testing.assert_array_equal(result[1, 0], [values[1, 0, 0] * 2, values[1, 0, -1]])
+
+    def test_matches_unmasked_kernel(self):
+        """Test that compression does not change kernel results."""
+        rng = np.random.default_rng(0)
+        values = rng.gamma(0.5, 4.0, size=(3, 4, 365))
+        values[:, 0] = np.nan
+
+        np.testing.assert_array_equal(
+            map_valid_pixels(dry_wet_stats, values, thresh=1.0),
+            dry_wet_stats(values, thresh=1.0)
+        )
+
+    def test_no_valid_pixels(self):
+        """Test a block that is missing throughout."""
+        values = np.full((2, 2, 10), np.nan)
+
+        result = map_valid_pixels(dry_wet_stats, values, thresh=1.0)
+
+        assert result.shape == (2, 2, len(DRY_WET_STATS))
+        assert np.isnan(result).all()
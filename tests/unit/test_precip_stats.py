@@ -0,0 +1,275 @@
+"""
+Unit tests for core.precip_stats module.
+
+Tests the fused cdd / dry_days / sdii / dry spell pass against xclim.
+"""
+
+import dask
+import numpy as np
+import pandas as pd
+import pytest
+import xarray as xr
+import xclim.indicators.atmos as atmos
+
+from core.precip_stats import (
+    _dry_wet_stats_compiled,
+    _dry_wet_stats_numpy,
+    _fraction_over_compiled,
+    _fraction_over_kernel,
+    _max_window_sum_compiled,
+    _max_window_sum_kernel,
+    annual_dry_wet_indices,
+    annual_fraction_over_thresh,
+    annual_max_window_sum,
+    dry_wet_stats,
+    trailing_sums,
+)
+
+
+@pytest.fixture
+def daily_precip():
+    """Three years of daily precipitation with dry, missing and always-wet pixels."""
+    rng = np.random.default_rng(0)
+    time = pd.date_range('2000-01-01', '2002-12-31', freq='D')
+    data = rng.gamma(0.5, 4.0, size=(len(time), 3, 4)).astype(np.float32)
+    data[rng.random(data.shape) < 0.5] = 0
+    data[:, 0, 0] = 0        # Never wet
+    data[5, 1, 1] = np.nan   # One missing day in 2000
+    data[400:, 2, 3] = 5.0   # Wet from 2001 on
+    return xr.DataArray(
+        data,
+        dims=['time', 'lat', 'lon'],
+        coords={'time': time, 'lat': [40.0, 41.0, 42.0], 'lon': [-100.0, -99.0, -98.0, -97.0]},
+        attrs={'units': 'mm d-1', 'standard_name': 'precipitation_flux'}
+    )
+
+
+class TestDryWetStats:
+    """Tests for the fused NumPy kernel."""
+
+    def test_known_series(self):
+        """Test dry runs, dry day count, wet-day mean and dry spells on a hand-made series."""
+        values = np.array([[0.0, 0.5, 2.0, 0.0, 0.0, 0.0, 4.0, 0.0, 0.0, 0.0, 0.0]])
+
+        cdd, dry_days, sdii, spells, spell_days = dry_wet_stats(values, thresh=1.0)[0]
+
+        assert cdd == 4
+        assert dry_days == 9
+        assert sdii == pytest.approx(3.0)
+        # Spells of 3 and 4 days (the last one runs to the end); the leading 2-day run is too short
+        assert spells == 2
+        assert spell_days == 7
+
+    def test_full_year_dry_run(self):
+        """Test that run counters do not overflow over a whole dry leap year."""
+        values = np.zeros((2, 2, 366))
+        values[1, 1, 100] = 5.0
+
+        stats = dry_wet_stats(values, thresh=1.0)
+
+        np.testing.assert_array_equal(stats[..., 0], [[366, 366], [366, 265]])
+        np.testing.assert_array_equal(stats[..., 4], [[366, 366], [366, 365]])
+
+    def test_missing_value_masks_all_stats(self):
+        """Test that any missing day makes all statistics NaN."""
+        values = np.array([[0.0, np.nan, 2.0]])
+        assert np.isnan(dry_wet_stats(values, thresh=1.0)).all()
+
+    @pytest.mark.skipif(_dry_wet_stats_compiled is None, reason="Numba not installed")
+    def test_compiled_kernel_matches_numpy(self, daily_precip):
+        """Test that the Numba kernel and the NumPy version give the same statistics."""
+        values = np.moveaxis(daily_precip.values, 0, -1)
+        values[1, 2, :40] = 0  # A dry spell at the start of the series
+
+        np.testing.assert_allclose(
+            dry_wet_stats(values, thresh=1.0, min_spell=3),
+            _dry_wet_stats_numpy(values, thresh=1.0, min_spell=3),
+            rtol=1e-12
+        )
+
+
+class TestAnnualDryWetIndices:
+    """Tests for the annual indices."""
+
+    @pytest.mark.parametrize('chunks', [None, {'time': 365, 'lat': 2}])
+    def test_matches_xclim(self, daily_precip, chunks):
+        """Test that cdd, dry_days and sdii match the xclim indicators."""
+        pr = daily_precip.chunk(chunks) if chunks else daily_precip
+
+        indices = annual_dry_wet_indices(pr, thresh='1.0 mm/day')
+
+        expected = {
+            'cdd': atmos.maximum_consecutive_dry_days(pr=daily_precip, thresh='1.0 mm/day', freq='YS'),
+            'dry_days': atmos.dry_days(pr=daily_precip, thresh='1.0 mm/day', freq='YS'),
+            'sdii': atmos.daily_pr_intensity(pr=daily_precip, thresh='1.0 mm/day', freq='YS'),
+        }
+        for name, reference in expected.items():
+            actual = indices[name].compute()
+            assert actual.dims == ('time', 'lat', 'lon')
+            np.testing.assert_array_equal(actual.time.values, reference.time.values)
+            np.testing.assert_allclose(actual.values, reference.values, rtol=1e-6)
+            assert actual.attrs['units'] == reference.attrs['units']
+
+    def test_dry_spells_match_xclim(self, daily_precip):
+        """Test dry spell frequency and total length against xclim (op='max', 3-day window)."""
+        # Spells here end at year boundaries, while xclim's rolling window looks
+        # across them; wet days around each boundary make both conventions agree
+        time = daily_precip.time
+        near_boundary = (time.dt.dayofyear <= 2) | (time.dt.dayofyear >= time.dt.days_in_year - 1)
+        pr = daily_precip.where(~near_boundary, 5.0)
+        pr.attrs = daily_precip.attrs
+
+        indices = annual_dry_wet_indices(pr.chunk({'time': 365, 'lat': 2}), thresh='1.0 mm/day', min_spell=3)
+
+        expected = {
+            'dry_spell_frequency': atmos.dry_spell_frequency(pr=pr, thresh='1.0 mm', window=3, op='max', freq='YS'),
+            'dry_spell_total_length': atmos.dry_spell_total_length(pr=pr, thresh='1.0 mm', window=3, op='max', freq='YS'),
+        }
+        for name, reference in expected.items():
+            np.testing.assert_array_equal(indices[name].values, reference.values)
+            assert indices[name].attrs['units'] == reference.attrs['units']
+
+    def test_stays_lazy(self, daily_precip):
+        """Test that dask input is never computed while the indices are built."""
+        def no_compute(*args, **kwargs):
+            raise AssertionError("annual_dry_wet_indices computed dask data eagerly")
+
+        with dask.config.set(scheduler=no_compute):
+            indices = annual_dry_wet_indices(daily_precip.chunk({'time': 365, 'lat': 2}))
+
+        for name, index in indices.items():
+            # One block per year and spatial chunk
+            assert index.chunks == ((1, 1, 1), (2, 1), (4,)), name
+
+    def test_threshold_converted_to_data_units(self, daily_precip):
+        """Test that the threshold is converted to the units of pr."""
+        pr_si = daily_precip / 86400
+        pr_si.attrs = {'units': 'kg m-2 s-1', 'standard_name': 'precipitation_flux'}
+
+        in_mm = annual_dry_wet_indices(daily_precip)
+        in_si = annual_dry_wet_indices(pr_si)
+
+        xr.testing.assert_equal(in_mm['dry_days'], in_si['dry_days'])
+
+
+class TestWindowSums:
+    """Tests for the multi-day precipitation sums."""
+
+    def test_trailing_sums(self):
+        """Test trailing sums, including NaN until the window fills and around missing values."""
+        values = np.array([[1.0, 2.0, 3.0, np.nan, 4.0, 5.0, 6.0]])
+
+        sums = trailing_sums(values, window=2)
+
+        np.testing.assert_array_equal(sums, [[np.nan, 3.0, 5.0, np.nan, np.nan, 9.0, 11.0]])
+
+    @pytest.mark.parametrize('chunks', [None, {'time': 365, 'lat': 2}])
+    def test_annual_max_matches_rolling(self, daily_precip, chunks):
+        """Test that the annual maximum 7-day sum matches xarray's rolling sum and resample."""
+        pr = daily_precip.chunk(chunks) if chunks else daily_precip
+
+        actual = annual_max_window_sum(pr, window=7).compute()
+
+        expected = daily_precip.rolling(time=7, min_periods=7).sum().resample(time='YS').max()
+        assert actual.dims == ('time', 'lat', 'lon')
+        np.testing.assert_array_equal(actual.time.values, expected.time.values)
+        np.testing.assert_allclose(actual.values, expected.values, rtol=1e-5)
+
+    @pytest.mark.parametrize(
+        'kernel',
+        [
+            _max_window_sum_kernel,
+            pytest.param(
+                _max_window_sum_compiled,
+                marks=pytest.mark.skipif(_max_window_sum_compiled is None, reason="Numba not installed")
+            ),
+        ]
+    )
+    def test_max_window_sum_kernel(self, kernel):
+        """Test the one-pass maximum against trailing sums, incl. missing values and short series."""
+        values = np.array([
+            [1.0, 2.0, 3.0, np.nan, 4.0, 5.0, 6.0],
+            [np.nan, 1.0, np.nan, 1.0, np.nan, 1.0, np.nan],
+            [0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0],
+        ])
+
+        maxima = kernel(np.ascontiguousarray(values.T), 2)
+
+        np.testing.assert_array_equal(maxima, np.fmax.reduce(trailing_sums(values, window=2), axis=-1))
+        np.testing.assert_array_equal(maxima, [11.0, np.nan, 0.0])
+        assert np.isnan(kernel(np.ascontiguousarray(values.T), 8)).all()
+
+    @pytest.mark.parametrize('chunks', [None, {'time': 365, 'lat': 2}])
+    def test_annual_max_across_short_year(self, daily_precip, chunks):
+        """Test windows spanning into a year shorter than the window (read as one block)."""
+        pr = daily_precip.isel(time=slice(None, -362))  # Ends on 2002-01-03
+        pr = pr.chunk(chunks) if chunks else pr
+
+        actual = annual_max_window_sum(pr, window=7).compute()
+
+        expected = pr.rolling(time=7, min_periods=7).sum().resample(time='YS').max()
+        np.testing.assert_array_equal(actual.time.values, expected.time.values)
+        np.testing.assert_allclose(actual.values, expected.values, rtol=1e-5)
+
+    def test_annual_max_keeps_year_chunks(self, daily_precip):
+        """Test that year blocks are read with an overlap rather than merged into one chunk."""
+        pr = daily_precip.chunk({'time': 365})
+
+        actual = annual_max_window_sum(pr, window=7)
+
+        assert actual.chunks[0] == (1, 1, 1)
+
+
+class TestFractionOverThresh:
+    """Tests for the fraction of precipitation from days above a percentile."""
+
+    @pytest.mark.parametrize(
+        'kernel',
+        [
+            _fraction_over_kernel,
+            pytest.param(
+                _fraction_over_compiled,
+                marks=pytest.mark.skipif(_fraction_over_compiled is None, reason="Numba not installed")
+            ),
+        ]
+    )
+    def test_fraction_kernel(self, kernel):
+        """Test the one-pass fraction, incl. a missing day and a series without wet days."""
+        values = np.array([
+            [0.5, 2.0, 6.0, 4.0],
+            [2.0, np.nan, 8.0, 1.0],
+            [0.5, 0.0, 0.9, 0.0],
+        ])
+        over_thresh = np.array([
+            [3.0, 3.0, 5.0, 5.0],
+            [3.0, 3.0, 3.0, 3.0],
+            [1.0, 1.0, 1.0, 1.0],
+        ])
+
+        fraction = kernel(np.ascontiguousarray(values.T), np.ascontiguousarray(over_thresh.T), 1.0)
+
+        np.testing.assert_allclose(fraction, [6.0 / 12.0, np.nan, np.nan])
+
+    @pytest.mark.parametrize('chunks', [None, {'time': 365, 'lat': 2}])
+    @pytest.mark.parametrize('per_doy', [False, True])
+    def test_matches_xclim(self, daily_precip, chunks, per_doy):
+        """Test against the xclim indicator (incl. its missing year) for fixed and day-of-year percentiles."""
+        rng = np.random.default_rng(1)
+        if per_doy:
+            per = xr.DataArray(
+                rng.gamma(2.0, 3.0, size=(366, 3, 4)), dims=['dayofyear', 'lat', 'lon'],
+                coords={'dayofyear': np.arange(1, 367), 'lat': daily_precip.lat, 'lon': daily_precip.lon}
+            )
+        else:
+            per = xr.DataArray(rng.gamma(2.0, 3.0, size=(3, 4)), dims=['lat', 'lon'],
+                               coords={'lat': daily_precip.lat, 'lon': daily_precip.lon})
+        per[0, 1] = np.nan  # Missing percentile falls back to the wet-day threshold, as in xclim
+        per.attrs['units'] = 'mm/d'
+        pr = daily_precip.chunk(chunks) if chunks else daily_precip
+
+        fraction = annual_fraction_over_thresh(pr, per)
+
+        expected = atmos.fraction_over_precip_thresh(pr=daily_precip, pr_per=per, freq='YS')
+        assert fraction.dims == ('time', 'lat', 'lon')
+        np.testing.assert_array_equal(fraction.time.values, expected.time.values)
+        np.testing.assert_allclose(fraction.values, expected.values, rtol=1e-6)
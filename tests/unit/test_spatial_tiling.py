@@ -4,21 +4,41 @@ Unit tests for core.spatial_tiling module.
 Tests spatial tiling logic, tile processing, and merge operations.
 """
 
+import pickle
+import threading
+from unittest.mock import MagicMock, patch
+
 import pytest
 import xarray as xr
 import numpy as np
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor
 
-from core.spatial_tiling import SpatialTilingMixin
+from core.spatial_tiling import SpatialTilingMixin, TILE_NETCDF_ENGINE, netcdf_write_lock
+from core.config import PipelineConfig
 
 
 class MockPipelineWithTiling(SpatialTilingMixin):
     """Mock pipeline class for testing SpatialTilingMixin."""
 
-    def __init__(self, n_tiles: int = 4):
-        SpatialTilingMixin.__init__(self, n_tiles=n_tiles)
+    def __init__(
+        self,
+        n_tiles: int = 4,
+        tile_executor: str = 'threads',
+        in_memory_merge: bool = False,
+        tile_format: str = 'netcdf',
+        compress_tiles: bool = False
+    ):
+        SpatialTilingMixin.__init__(
+            self,
+            n_tiles=n_tiles,
+            tile_executor=tile_executor,
+            in_memory_merge=in_memory_merge,
+            tile_format=tile_format,
+            compress_tiles=compress_tiles
+        )
         self.indices_calculated = []
+        self.baseline_lock = threading.Lock()
 
     def calculate_indices(self, datasets: dict) -> dict:
         """Mock index calculation."""
@@ -62,7 +82,24 @@ class TestSpatialTilingMixin:
         with pytest.raises(ValueError) as exc_info:
             MockPipelineWithTiling(n_tiles=3)
 
-        assert 'n_tiles must be 2, 4, or 8' in str(exc_info.value)
+        assert 'n_tiles must be a power of two' in str(exc_info.value)
+
+    def test_init_with_invalid_tile_executor(self):
+        """Test that an unknown tile executor raises ValueError."""
+        with pytest.raises(ValueError, match="tile_executor must be one of"):
+            MockPipelineWithTiling(n_tiles=2, tile_executor='gpu')
+
+    def test_pickle_recreates_locks(self):
+        """Test that pipelines survive pickling for process-based tiling."""
+        mixin = MockPipelineWithTiling(n_tiles=2, tile_executor='processes')
+
+        restored = pickle.loads(pickle.dumps(mixin))
+
+        assert restored.n_tiles == 2
+        assert restored.tile_executor == 'processes'
+        assert restored._tile_order == mixin._tile_order
+        assert isinstance(restored.baseline_lock, type(threading.Lock()))
+        assert restored.baseline_lock is not mixin.baseline_lock
 
     def test_get_spatial_tiles_2_tiles(self, sample_temperature_dataset):
         """Test spatial tile calculation for 2 tiles (east/west)."""
@@ -108,6 +145,53 @@ class TestSpatialTilingMixin:
         assert 'se1' in tile_names
         assert 'se2' in tile_names
 
+    def test_get_spatial_tiles_snap_to_chunk_edges(self):
+        """Test that tile boundaries are aligned with Dask chunk edges."""
+        mixin = MockPipelineWithTiling(n_tiles=4)
+        ds = xr.Dataset({
+            'temp': (['lat', 'lon'], np.zeros((10, 12)))
+        }).chunk({'lat': (3, 3, 4), 'lon': (4, 4, 4)})
+
+        tiles = mixin._get_spatial_tiles(ds)
+
+        assert [tile[2] for tile in tiles] == ['northwest', 'northeast', 'southwest', 'southeast']
+        assert tiles[0][:2] == (slice(0, 6), slice(0, 4))
+        assert tiles[3][:2] == (slice(6, None), slice(4, None))
+
+    def test_get_spatial_tiles_keeps_splits_when_snapping_collapses(self):
+        """Test that snapping is skipped when it would merge two tiles."""
+        mixin = MockPipelineWithTiling(n_tiles=8)
+        ds = xr.Dataset({
+            'temp': (['lat', 'lon'], np.zeros((10, 12)))
+        }).chunk({'lon': 4})
+
+        lon_slices = [tile[1] for tile in mixin._get_spatial_tiles(ds)[:4]]
+
+        assert lon_slices == [slice(0, 3), slice(3, 6), slice(6, 9), slice(9, None)]
+
+    @pytest.mark.parametrize('n_tiles,shape', [(16, (4, 4)), (32, (4, 8))])
+    def test_power_of_two_tiles_merge(self, n_tiles, shape, sample_temperature_dataset, tmp_path):
+        """Test that tile counts beyond 8 use a generic grid and merge correctly."""
+        small_ds = sample_temperature_dataset.isel(time=slice(0, 10))
+        expected_dims = {'time': 1, 'lat': small_ds.sizes['lat'], 'lon': small_ds.sizes['lon']}
+        mixin = MockPipelineWithTiling(n_tiles=n_tiles)
+
+        tiles = mixin._get_spatial_tiles(small_ds)
+        all_indices = mixin.process_with_spatial_tiling(small_ds, tmp_path, expected_dims)
+
+        assert mixin._split_shape == shape
+        assert [tile[2] for tile in tiles][:2] == ['r0c0', 'r0c1']
+        np.testing.assert_array_equal(all_indices['mock_index'].lat.values, small_ds.lat.values)
+        np.testing.assert_array_equal(all_indices['mock_index'].lon.values, small_ds.lon.values)
+
+    def test_get_spatial_tiles_more_splits_than_cells(self):
+        """Test error when the grid is too small for the requested tiles."""
+        mixin = MockPipelineWithTiling(n_tiles=8)
+        ds = xr.Dataset({'temp': (['lat', 'lon'], np.zeros((1, 10)))})
+
+        with pytest.raises(ValueError, match="Cannot split"):
+            mixin._get_spatial_tiles(ds)
+
     def test_get_spatial_tiles_missing_lat_dimension(self):
         """Test error when dataset missing lat dimension."""
         mixin = MockPipelineWithTiling(n_tiles=2)
@@ -192,6 +276,65 @@ class TestSpatialTilingMixin:
         assert 'mock_index' in ds.data_vars
         ds.close()
 
+    @pytest.mark.parametrize('compress_tiles', [False, True])
+    def test_tile_compression_opt_in(self, compress_tiles, tmp_path):
+        """Test that tile files are uncompressed unless compress_tiles is set."""
+        mixin = MockPipelineWithTiling(n_tiles=2, compress_tiles=compress_tiles)
+        tile_indices = {
+            'mock_index': xr.DataArray(np.ones((1, 5, 5)), dims=['time', 'lat', 'lon'])
+        }
+
+        encoding = mixin._tile_encoding(xr.Dataset(tile_indices))
+        tile_file = mixin._save_tile(tile_indices, 'west', tmp_path)
+
+        assert ('complevel' in encoding['mock_index']) is compress_tiles
+        with xr.open_dataset(tile_file) as ds:
+            np.testing.assert_array_equal(ds['mock_index'].values, np.ones((1, 5, 5)))
+
+    @pytest.mark.skipif(TILE_NETCDF_ENGINE != 'h5netcdf', reason="netCDF4 tiles are written under the lock")
+    def test_save_tile_streams_lazy_data(self, tmp_path):
+        """Test that lazy tiles are written without materializing the whole dataset."""
+        mixin = MockPipelineWithTiling(n_tiles=2)
+        tile_indices = {
+            'mock_index': xr.DataArray(
+                np.arange(50.0).reshape(2, 5, 5),
+                dims=['time', 'lat', 'lon'],
+                attrs={'units': '1'}
+            ).chunk({'time': 1})
+        }
+
+        with patch.object(xr.Dataset, 'compute', side_effect=AssertionError('tile materialized')):
+            tile_file = mixin._save_tile(tile_indices, 'lazy_tile', tmp_path)
+
+        with xr.open_dataset(tile_file) as ds:
+            np.testing.assert_array_equal(ds['mock_index'].values, np.arange(50.0).reshape(2, 5, 5))
+
+    @pytest.mark.skipif(TILE_NETCDF_ENGINE != 'netcdf4', reason="only netCDF4 tiles are written under the lock")
+    def test_save_tile_netcdf4_writes_under_lock(self, tmp_path):
+        """Test that netCDF4 tiles are computed first and written holding netcdf_write_lock."""
+        mixin = MockPipelineWithTiling(n_tiles=2)
+        tile_indices = {
+            'mock_index': xr.DataArray(
+                np.arange(50.0).reshape(2, 5, 5),
+                dims=['time', 'lat', 'lon'],
+                attrs={'units': '1'}
+            ).chunk({'time': 1})
+        }
+        lock_held = []
+        to_netcdf = xr.Dataset.to_netcdf
+
+        def checked_to_netcdf(ds, *args, **kwargs):
+            lock_held.append(netcdf_write_lock.locked())
+            assert ds['mock_index'].chunks is None
+            return to_netcdf(ds, *args, **kwargs)
+
+        with patch.object(xr.Dataset, 'to_netcdf', checked_to_netcdf):
+            tile_file = mixin._save_tile(tile_indices, 'locked_tile', tmp_path)
+
+        assert lock_held == [True]
+        with xr.open_dataset(tile_file) as ds:
+            np.testing.assert_array_equal(ds['mock_index'].values, np.arange(50.0).reshape(2, 5, 5))
+
     def test_merge_tiles_2_tiles(self, tmp_path):
         """Test merging 2 tiles back into single dataset."""
         mixin = MockPipelineWithTiling(n_tiles=2)
@@ -249,6 +392,70 @@ class TestSpatialTilingMixin:
         assert merged.sizes['lat'] == 10
         assert merged.sizes['lon'] == 10
 
+    def test_merge_tiles_opens_files_in_parallel(self, tmp_path):
+        """Test that NetCDF tile files are opened with one parallel open_mfdataset call."""
+        mixin = MockPipelineWithTiling(n_tiles=2)
+
+        tile_files = []
+        for name, lon_start in [('west', 0), ('east', 5)]:
+            ds = xr.Dataset({
+                'mock_index': (['time', 'lat', 'lon'], np.full((1, 10, 5), lon_start))
+            }, coords={'time': [2020], 'lat': range(10), 'lon': range(lon_start, lon_start + 5)})
+            tile_file = tmp_path / f'tile_{name}.nc'
+            ds.to_netcdf(tile_file)
+            tile_files.append(tile_file)
+
+        expected_dims = {'time': 1, 'lat': 10, 'lon': 10}
+        with patch('core.spatial_tiling.xr.open_mfdataset', wraps=xr.open_mfdataset) as mock_open:
+            merged = mixin._merge_tiles(tile_files, expected_dims)
+
+        mock_open.assert_called_once()
+        assert mock_open.call_args.args[0] == [tile_files]
+        assert mock_open.call_args.kwargs['parallel'] is True
+        np.testing.assert_array_equal(merged['mock_index'].isel(time=0, lat=0).values, [0] * 5 + [5] * 5)
+
+    def test_merge_tiles_chunks_follow_tile_boundaries(self, sample_temperature_dataset, tmp_path):
+        """Test that merged tile chunks line up with tile boundaries (no rechunk)."""
+        small_ds = sample_temperature_dataset.isel(time=slice(0, 10))
+        expected_dims = {'time': 1, 'lat': small_ds.sizes['lat'], 'lon': small_ds.sizes['lon']}
+
+        mixin = MockPipelineWithTiling(n_tiles=4)
+        lazy = mixin.process_with_spatial_tiling(small_ds, tmp_path, expected_dims, defer_cleanup=True)
+
+        lat_slices = sorted({t[0].indices(small_ds.sizes['lat'])[:2] for t in mixin._get_spatial_tiles(small_ds)})
+        lon_slices = sorted({t[1].indices(small_ds.sizes['lon'])[:2] for t in mixin._get_spatial_tiles(small_ds)})
+        assert lazy['mock_index'].chunks == (
+            (1,),
+            tuple(stop - start for start, stop in lat_slices),
+            tuple(stop - start for start, stop in lon_slices)
+        )
+        mixin.release_tile_files()
+
+    def test_fix_count_indices_runs_once_on_merged_output(self, sample_temperature_dataset, tmp_path):
+        """Test that count-index fixes run once after the merge and tiles stay numeric."""
+
+        class CountIndexPipeline(MockPipelineWithTiling):
+            fix_calls = 0
+
+            def calculate_indices(self, datasets):
+                result = super().calculate_indices(datasets)
+                result['mock_index'].attrs['units'] = 'days'
+                return result
+
+            def fix_count_indices(self, ds):
+                CountIndexPipeline.fix_calls += 1
+                ds['mock_index'].attrs['units'] = '1'
+                return ds
+
+        small_ds = sample_temperature_dataset.isel(time=slice(0, 10))
+        expected_dims = {'time': 1, 'lat': small_ds.sizes['lat'], 'lon': small_ds.sizes['lon']}
+
+        result = CountIndexPipeline(n_tiles=4).process_with_spatial_tiling(small_ds, tmp_path, expected_dims)
+
+        assert CountIndexPipeline.fix_calls == 1
+        assert result['mock_index'].attrs['units'] == '1'
+        assert result['mock_index'].dtype == np.float32
+
     def test_merge_tiles_dimension_mismatch(self, tmp_path):
         """Test that dimension mismatch raises ValueError."""
         mixin = MockPipelineWithTiling(n_tiles=2)
@@ -331,6 +538,35 @@ class TestSpatialTilingMixin:
         assert ordered[2] == tile_files_dict['southwest']
         assert ordered[3] == tile_files_dict['southeast']
 
+    @pytest.mark.parametrize('n_tiles', [1, 2, 4, 8])
+    def test_tile_order_matches_spatial_tiles(self, n_tiles, sample_temperature_dataset):
+        """Test that the precomputed tile order matches the generated tiles."""
+        mixin = MockPipelineWithTiling(n_tiles=n_tiles)
+        tiles = mixin._get_spatial_tiles(sample_temperature_dataset)
+
+        assert tuple(tile[2] for tile in tiles) == mixin._tile_order
+        tile_files_dict = {name: Path(f'{name}.nc') for name in reversed(mixin._tile_order)}
+        assert mixin._get_ordered_tile_files(tile_files_dict) == [
+            Path(f'{name}.nc') for name in mixin._tile_order
+        ]
+
+    def test_max_inflight_tiles_bounded_by_memory(self, sample_temperature_dataset):
+        """Test that concurrent tiles are capped by available memory."""
+        mixin = MockPipelineWithTiling(n_tiles=8)
+        tile_bytes = sample_temperature_dataset.nbytes / 8 * PipelineConfig.TILE_MEMORY_INFLATION
+
+        def available(n_tiles):
+            memory = MagicMock()
+            memory.available = n_tiles * tile_bytes / PipelineConfig.TILE_MEMORY_FRACTION
+            return memory
+
+        with patch('core.spatial_tiling.psutil.virtual_memory', return_value=available(100)):
+            assert mixin._max_inflight_tiles(sample_temperature_dataset) == 8
+        with patch('core.spatial_tiling.psutil.virtual_memory', return_value=available(3)):
+            assert mixin._max_inflight_tiles(sample_temperature_dataset) == 3
+        with patch('core.spatial_tiling.psutil.virtual_memory', return_value=available(0.1)):
+            assert mixin._max_inflight_tiles(sample_temperature_dataset) == 1
+
     def test_process_with_spatial_tiling_integration(self, sample_temperature_dataset, tmp_path):
         """Integration test for complete spatial tiling workflow."""
         mixin = MockPipelineWithTiling(n_tiles=2)
@@ -385,6 +621,148 @@ class TestSpatialTilingThreadSafety:
         assert len(mixin.indices_calculated) == 4  # Should have processed 4 tiles
 
 
+    def test_process_executor_matches_threads(self, sample_temperature_dataset, tmp_path):
+        """Test that process-based tiling produces the same result as threads."""
+        small_ds = sample_temperature_dataset.isel(time=slice(0, 10))
+        expected_dims = {'time': 1, 'lat': small_ds.sizes['lat'], 'lon': small_ds.sizes['lon']}
+
+        threaded = MockPipelineWithTiling(n_tiles=4).process_with_spatial_tiling(
+            small_ds, tmp_path, expected_dims
+        )
+        processes = MockPipelineWithTiling(n_tiles=4, tile_executor='processes').process_with_spatial_tiling(
+            small_ds, tmp_path, expected_dims
+        )
+
+        xr.testing.assert_identical(threaded['mock_index'], processes['mock_index'])
+        assert not list(tmp_path.glob('tile_*.nc'))
+
+    def test_presubset_tile_for_worker_process(self, sample_temperature_dataset, tmp_path):
+        """Test that worker processes receive and process an already-selected tile."""
+        small_ds = sample_temperature_dataset.isel(time=slice(0, 10))
+        lat_slice, lon_slice = slice(0, 5), slice(5, None)
+        mixin = MockPipelineWithTiling(n_tiles=4)
+
+        tile_ds = mixin._tile_worker_input(small_ds, lat_slice, lon_slice)
+        worker_copy = pickle.loads(pickle.dumps(mixin))
+        tile_file = worker_copy._run_presubset_tile(
+            '_process_and_save_tile', tile_ds, lat_slice, lon_slice, 'northeast', tmp_path
+        )
+
+        with xr.open_dataset(tile_file) as result:
+            np.testing.assert_array_equal(result.lat.values, small_ds.lat.values[lat_slice])
+            np.testing.assert_array_equal(result.lon.values, small_ds.lon.values[lon_slice])
+        assert worker_copy._presubset_tile is True
+        assert mixin._presubset_tile is False
+
+    def test_dask_graph_executor_matches_threads(self, sample_temperature_dataset, tmp_path):
+        """Test that writing all tiles as one Dask graph matches threaded tiling."""
+        small_ds = sample_temperature_dataset.isel(time=slice(0, 10)).chunk({'lat': 5, 'lon': 5})
+        expected_dims = {'time': 1, 'lat': small_ds.sizes['lat'], 'lon': small_ds.sizes['lon']}
+
+        threaded = MockPipelineWithTiling(n_tiles=4).process_with_spatial_tiling(
+            small_ds, tmp_path, expected_dims
+        )
+        graph = MockPipelineWithTiling(n_tiles=4, tile_executor='dask')
+        graph_result = graph.process_with_spatial_tiling(small_ds, tmp_path, expected_dims)
+
+        xr.testing.assert_identical(threaded['mock_index'], graph_result['mock_index'])
+        assert len(graph.indices_calculated) == 4
+        assert not list(tmp_path.glob('tile_*.nc'))
+
+    def test_in_memory_merge_matches_spilled_tiles(self, sample_temperature_dataset, tmp_path):
+        """Test that in-memory tile merging matches the tile-file path and writes no tiles."""
+        small_ds = sample_temperature_dataset.isel(time=slice(0, 10))
+        expected_dims = {'time': 1, 'lat': small_ds.sizes['lat'], 'lon': small_ds.sizes['lon']}
+
+        spilled = MockPipelineWithTiling(n_tiles=4).process_with_spatial_tiling(
+            small_ds, tmp_path, expected_dims
+        )
+
+        in_memory = MockPipelineWithTiling(n_tiles=4, in_memory_merge=True)
+        with patch.object(xr.Dataset, 'to_netcdf') as mock_to_netcdf:
+            result = in_memory.process_with_spatial_tiling(small_ds, tmp_path, expected_dims)
+
+        mock_to_netcdf.assert_not_called()
+        xr.testing.assert_identical(spilled['mock_index'], result['mock_index'])
+
+    def test_defer_cleanup_returns_lazy_indices(self, sample_temperature_dataset, tmp_path):
+        """Test that deferred cleanup keeps merged indices lazy until tiles are released."""
+        small_ds = sample_temperature_dataset.isel(time=slice(0, 10))
+        expected_dims = {'time': 1, 'lat': small_ds.sizes['lat'], 'lon': small_ds.sizes['lon']}
+
+        computed = MockPipelineWithTiling(n_tiles=4).process_with_spatial_tiling(
+            small_ds, tmp_path, expected_dims
+        )
+
+        mixin = MockPipelineWithTiling(n_tiles=4)
+        lazy = mixin.process_with_spatial_tiling(small_ds, tmp_path, expected_dims, defer_cleanup=True)
+
+        assert lazy['mock_index'].chunks is not None
+        assert len(list(tmp_path.glob('tiles_*/tile_*.nc'))) == 4
+        xr.testing.assert_identical(computed['mock_index'], lazy['mock_index'].compute())
+
+        mixin.release_tile_files()
+        assert not list(tmp_path.iterdir())
+        mixin.release_tile_files()
+
+    def test_invalid_tile_format(self):
+        """Test that unknown tile formats are rejected."""
+        with pytest.raises(ValueError, match="tile_format must be one of"):
+            MockPipelineWithTiling(tile_format='grib')
+
+    @pytest.mark.parametrize('tile_executor', ['threads', 'dask'])
+    def test_zarr_tiles_match_netcdf_tiles(self, sample_temperature_dataset, tmp_path, tile_executor):
+        """Test that uncompressed Zarr tile stores give the same merge and are removed."""
+        small_ds = sample_temperature_dataset.isel(time=slice(0, 10))
+        expected_dims = {'time': 1, 'lat': small_ds.sizes['lat'], 'lon': small_ds.sizes['lon']}
+
+        netcdf = MockPipelineWithTiling(n_tiles=4).process_with_spatial_tiling(
+            small_ds, tmp_path, expected_dims
+        )
+        zarr_mixin = MockPipelineWithTiling(n_tiles=4, tile_executor=tile_executor, tile_format='zarr')
+        zarr_result = zarr_mixin.process_with_spatial_tiling(small_ds, tmp_path, expected_dims)
+
+        xr.testing.assert_identical(netcdf['mock_index'], zarr_result['mock_index'])
+        assert zarr_mixin._tile_file_path('full', tmp_path).suffix == '.zarr'
+        assert not list(tmp_path.glob('tile_*'))
+
+    def test_dask_zarr_tiles_write_one_shared_store(self, sample_temperature_dataset, tmp_path):
+        """Test that Dask-executed Zarr tiles are assembled in one store without a merge."""
+        small_ds = sample_temperature_dataset.isel(time=slice(0, 10)).chunk({'lat': 5, 'lon': 5})
+        expected_dims = {'time': 1, 'lat': small_ds.sizes['lat'], 'lon': small_ds.sizes['lon']}
+
+        netcdf = MockPipelineWithTiling(n_tiles=8).process_with_spatial_tiling(
+            small_ds, tmp_path, expected_dims
+        )
+
+        mixin = MockPipelineWithTiling(n_tiles=8, tile_executor='dask', tile_format='zarr')
+        with patch.object(mixin, '_merge_tiles') as mock_merge:
+            result = mixin.process_with_spatial_tiling(
+                small_ds, tmp_path, expected_dims, defer_cleanup=True
+            )
+
+        mock_merge.assert_not_called()
+        assert [path.name for path in tmp_path.glob('tiles_*/*')] == ['tile_merged.zarr']
+        xr.testing.assert_identical(netcdf['mock_index'], result['mock_index'].compute())
+
+        mixin.release_tile_files()
+        assert not list(tmp_path.glob('tile_*'))
+
+    def test_in_memory_merge_spills_under_memory_pressure(self, sample_temperature_dataset, tmp_path):
+        """Test that tiles are written to disk when memory is too low to hold them."""
+        small_ds = sample_temperature_dataset.isel(time=slice(0, 10))
+        expected_dims = {'time': 1, 'lat': small_ds.sizes['lat'], 'lon': small_ds.sizes['lon']}
+
+        mixin = MockPipelineWithTiling(n_tiles=2, in_memory_merge=True)
+        with patch.object(mixin, '_should_spill_tile', return_value=True), \
+                patch.object(mixin, '_save_tile', wraps=mixin._save_tile) as mock_save:
+            result = mixin.process_with_spatial_tiling(small_ds, tmp_path, expected_dims)
+
+        assert mock_save.call_count == 2
+        assert result['mock_index'].sizes['lon'] == small_ds.sizes['lon']
+        assert not list(tmp_path.glob('tile_*.nc'))
+
+
 @pytest.mark.regression
 class TestSpatialTilingRegressions:
     """Regression tests for previously fixed bugs."""
@@ -0,0 +1,183 @@
+"""
+Unit tests for core.spi module.
+
+Tests the vectorized gamma fit and SPI against scipy and xclim.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+import scipy.special
+import scipy.stats
+import xarray as xr
+import xclim.indicators.atmos as atmos
+
+from core.spi import (
+    SPI_BOUND, _trigamma, fit_gamma, fit_spi_params, monthly_precipitation, spi_from_monthly, spi_from_params,
+    standardized_precipitation_index
+)
+
+
+def make_daily_precip(start='1981-01-01', end='1992-12-31', seed=0):
+    """Daily zero-inflated gamma precipitation on a small 3x4 grid."""
+    rng = np.random.default_rng(seed)
+    time = pd.date_range(start, end, freq='D')
+    data = rng.gamma(0.5, 4.0, size=(len(time), 3, 4)).astype(np.float32)
+    data[rng.random(data.shape) < 0.4] = 0
+    return xr.DataArray(
+        data,
+        dims=['time', 'lat', 'lon'],
+        coords={'time': time, 'lat': [40.0, 41.0, 42.0], 'lon': [-100.0, -99.0, -98.0, -97.0]},
+        attrs={'units': 'mm/d'}
+    )
+
+
+class TestFitGamma:
+    """Tests for the vectorized gamma fit."""
+
+    @pytest.mark.parametrize('shape', [0.05, 0.5, 2.0, 50.0])
+    def test_matches_scipy_maximum_likelihood(self, shape):
+        """Test that shape and scale match scipy's gamma.fit with loc fixed at 0."""
+        samples = np.random.default_rng(1).gamma(shape, 3.0, size=(5, 30))
+
+        fitted_shape, fitted_scale, prob_zero = fit_gamma(samples)
+
+        for i, row in enumerate(samples):
+            expected_shape, _, expected_scale = scipy.stats.gamma.fit(row, floc=0)
+            assert fitted_shape[i] == pytest.approx(expected_shape, rel=1e-8)
+            assert fitted_scale[i] == pytest.approx(expected_scale, rel=1e-8)
+        np.testing.assert_array_equal(prob_zero, 0)
+
+    def test_trigamma_matches_scipy(self):
+        """Test the series trigamma against scipy's polygamma."""
+        x = np.geomspace(1e-3, 1e4, 200)
+        np.testing.assert_allclose(_trigamma(x), scipy.special.polygamma(1, x), rtol=1e-10)
+
+    def test_zeros_and_missing_values(self):
+        """Test zero probability and NaN parameters when too few wet values exist."""
+        samples = np.array([
+            [0.0, 0.0, 1.0, 2.0, np.nan],
+            [0.0, 0.0, 0.0, 3.0, np.nan],
+        ])
+
+        shape, _, prob_zero = fit_gamma(samples)
+
+        np.testing.assert_allclose(prob_zero, [0.5, 0.75])
+        assert np.isfinite(shape[0])
+        assert np.isnan(shape[1])
+
+
+class TestMonthlyPrecipitation:
+    """Tests for the monthly means SPI is fitted on."""
+
+    @pytest.mark.parametrize('chunks', [None, {'time': 100, 'lat': 2}, {'time': -1, 'lat': 2}])
+    def test_matches_resample(self, chunks):
+        """Test against resample('MS').mean() for loaded, misaligned and time-contiguous chunks."""
+        pr = make_daily_precip(end='1983-02-10')
+        pr[40:50, 1, 1] = np.nan   # Partly missing month
+        pr[:31, 2, 3] = np.nan     # Fully missing month
+        expected = pr.resample(time='MS').mean()
+        pr = pr.chunk(chunks) if chunks else pr
+
+        monthly = monthly_precipitation(pr)
+
+        if chunks:
+            assert monthly.chunks[0] == (monthly.sizes['time'],)
+        assert monthly.attrs == expected.attrs
+        xr.testing.assert_allclose(monthly.compute(), expected, rtol=1e-6)
+
+    def test_gap_month_falls_back_to_resample(self):
+        """Test that a missing month is kept as NaN, as resample does."""
+        pr = make_daily_precip(end='1981-12-31')
+        pr = pr.where(pr.time.dt.month != 3, drop=True)
+
+        monthly = monthly_precipitation(pr)
+
+        assert monthly.sizes['time'] == 12
+        assert monthly.sel(time='1981-03-01').isnull().all()
+
+
+class TestStandardizedPrecipitationIndex:
+    """Tests for the multi-window SPI."""
+
+    def test_matches_xclim_two_parameter_gamma(self):
+        """Test that SPI matches xclim's gamma ML SPI with loc fixed at 0."""
+        pr = make_daily_precip()
+
+        spi = standardized_precipitation_index(
+            pr.chunk({'lat': 2}), windows=(1, 3), cal_start='1981-01-01', cal_end='1990-12-31'
+        ).compute()
+
+        assert spi.dims[:2] == ('window', 'time')
+        for window in (1, 3):
+            expected = atmos.standardized_precipitation_index(
+                pr=pr, freq='MS', window=window, dist='gamma', method='ML',
+                fitkwargs={'floc': 0}, cal_start='1981-01-01', cal_end='1990-12-31'
+            )
+            actual = spi.sel(window=window).transpose(*expected.dims)
+            np.testing.assert_allclose(actual.values, expected.values, atol=1e-3)
+
+    def test_window_leading_months_and_bounds(self):
+        """Test that windows leave leading months empty and values stay within bounds."""
+        pr = make_daily_precip()
+        pr[:, 0, 0] = 0  # Always dry pixel: all probability mass at zero
+
+        spi = standardized_precipitation_index(
+            pr, windows=(1, 12), cal_start='1981-01-01', cal_end='1990-12-31'
+        )
+
+        assert spi.sel(window=12).isel(time=slice(0, 11)).isnull().all()
+        assert spi.sel(window=12).isel(time=11).notnull().all()
+        assert float(abs(spi).max()) <= np.float32(SPI_BOUND)
+        assert not spi.attrs
+        assert float(spi.sel(window=1).isel(lat=0, lon=0).min()) == pytest.approx(SPI_BOUND)
+
+    def test_shared_monthly_series(self):
+        """Test that SPI from a precomputed monthly series matches SPI from daily values."""
+        pr = make_daily_precip().chunk({'time': 365, 'lat': 2})
+
+        monthly = monthly_precipitation(pr)
+        assert monthly.chunks[0] == (monthly.sizes['time'],)
+
+        from_monthly = spi_from_monthly(
+            monthly.persist(), windows=(1, 6), cal_start='1981-01-01', cal_end='1990-12-31'
+        )
+        from_daily = standardized_precipitation_index(
+            pr, windows=(1, 6), cal_start='1981-01-01', cal_end='1990-12-31'
+        )
+        xr.testing.assert_equal(from_monthly.compute(), from_daily.compute())
+
+    def test_saved_params_match_fit(self, tmp_path):
+        """Test that SPI from saved parameters matches fitting the calibration period."""
+        monthly = monthly_precipitation(make_daily_precip().chunk({'lat': 2}))
+        params_file = tmp_path / 'spi_params.nc'
+        fit_spi_params(monthly, windows=(1, 3, 12), cal_start='1981-01-01', cal_end='1990-12-31').to_netcdf(params_file)
+
+        with xr.open_dataset(params_file, chunks={}) as params:
+            assert params.attrs['units'] == 'mm/d'
+            # Only the 11 months before 1991 that the 12-month window needs
+            from_params = spi_from_params(monthly.sel(time=slice('1990-02-01', None)), params, windows=(12, 3))
+            from_params = from_params.sel(time=slice('1991-01-01', None)).compute()
+
+        from_fit = spi_from_monthly(monthly, windows=(12, 3), cal_start='1981-01-01', cal_end='1990-12-31')
+        xr.testing.assert_equal(from_params, from_fit.sel(time=slice('1991-01-01', None)).compute())
+
+    def test_params_start_skips_lead_months(self):
+        """Test that start returns only later months, equal to slicing the full transform."""
+        monthly = monthly_precipitation(make_daily_precip().chunk({'lat': 2}))
+        params = fit_spi_params(monthly, windows=(1, 12), cal_start='1981-01-01', cal_end='1990-12-31')
+
+        from_start = spi_from_params(monthly, params, windows=(1, 12), start='1991-01-01')
+        full = spi_from_params(monthly, params, windows=(1, 12))
+
+        assert from_start.time.values[0] == np.datetime64('1991-01-01')
+        xr.testing.assert_equal(from_start.compute(), full.sel(time=slice('1991-01-01', None)).compute())
+
+    def test_calibration_period_outside_data(self):
+        """Test that a calibration period without data raises ValueError."""
+        pr = make_daily_precip(start='2020-01-01', end='2021-12-31')
+
+        with pytest.raises(ValueError, match="calibration period"):
+            standardized_precipitation_index(
+                pr, windows=(1,), cal_start='1981-01-01', cal_end='2010-12-31'
+            )